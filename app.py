@@ -1,39 +1,85 @@
 import streamlit as st
 import pandas as pd
 from pathlib import Path
+import time
 from wms_pipeline import (
-    load_masters, quality_checks, build_dataset,
-    train_or_load_model, predict_from_form, predict_from_dataset_row
+    load_masters, masters_signature, quality_checks, build_dataset_incremental,
+    HORIZONS, target_col, train_or_load_models, predict_from_form, predict_from_dataset_row
 )
+from wms_feature_store import ensure_feature_store
+from wms_scenarios import scenario_grid, stock_minimo
+import wms_profiling as profiling
 
 st.set_page_config(page_title="WMS – Alerta de Rotura de Stock (MDM v3)", layout="wide")
 
 DATA_DIR = Path("data")
 MODELS_DIR = Path("models")
+PAGE_SIZE = 100
 
-st.title("WMS – Alerta de Rotura de Stock (horizonte 14 días)")
+# Recursos cacheados entre reruns y sesiones. La clave es la firma de los Excel (mtime + tamaño) y la
+# cantidad de periodos, así un cambio en /data invalida todo sin reiniciar la app. Los objetos de
+# st.cache_resource se comparten sin copiar: tratarlos como solo lectura.
+@st.cache_resource(show_spinner="Cargando maestros (MDM v3) desde /data ...")
+def get_masters(signature: str) -> dict:
+    return load_masters(DATA_DIR)
 
-# Load masters from local data folder (no uploaders)
-with st.spinner("Cargando maestros (MDM v3) desde /data ..."):
-    masters = load_masters(DATA_DIR)
+@st.cache_data(show_spinner=False)
+def get_quality(signature: str) -> dict:
+    return quality_checks(get_masters(signature))
 
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "Maestros", "Diccionarios", "Calidad de datos", "Modelo", "Predicción"
-])
+@st.cache_resource(show_spinner="Generando dataset ...")
+def get_dataset(signature: str, periods: int) -> pd.DataFrame:
+    # El estado en disco sobrevive a reinicios: sin cambios en los maestros no se vuelve a construir.
+    return build_dataset_incremental(get_masters(signature), periods, DATA_DIR / ".cache" / "dataset_state")
 
-with tab1:
+@st.cache_resource(show_spinner="Cargando modelos ...")
+def get_models(signature: str, periods: int):
+    """({horizonte: pipeline}, {horizonte: métricas}) de la familia multi-horizonte."""
+    return train_or_load_models(get_dataset(signature, periods), MODELS_DIR)
+
+@st.cache_resource(show_spinner=False)
+def get_feature_store(signature: str, periods: int):
+    """Features por (ServicioID, Periodo) memory-mapped; sus filas están alineadas con get_dataset."""
+    return ensure_feature_store(DATA_DIR, periods, dataset=get_dataset(signature, periods))
+
+def show_paginated(df: pd.DataFrame, key: str, height: int = 420) -> None:
+    """Muestra df de a PAGE_SIZE filas; solo la página visible se envía al navegador."""
+    n_pages = max(1, -(-len(df) // PAGE_SIZE))
+    page = st.number_input("Página", min_value=1, max_value=n_pages, value=1, key=f"page_{key}") if n_pages > 1 else 1
+    start = (page - 1) * PAGE_SIZE
+    st.dataframe(df.iloc[start:start + PAGE_SIZE], use_container_width=True, height=height)
+    st.caption(f"Filas {start + 1:,}–{min(start + PAGE_SIZE, len(df)):,} de {len(df):,}")
+
+def _keep(key: str) -> None:
+    # Los widgets pierden su estado cuando no se renderizan; se copia a una clave persistente.
+    st.session_state[key] = st.session_state[f"_{key}"]
+
+st.title("WMS – Alerta de Rotura de Stock (horizontes 7, 14 y 30 días)")
+
+signature = masters_signature(DATA_DIR)
+masters = get_masters(signature)
+st.session_state.setdefault("periods", 12)
+periods = st.session_state["periods"]
+
+# Solo se ejecuta la vista seleccionada (st.tabs ejecutaría todas en cada interacción).
+vista = st.radio(
+    "Vista", ["Maestros", "Diccionarios", "Calidad de datos", "Modelo", "Predicción", "Escenarios", "Rendimiento"],
+    horizontal=True, label_visibility="collapsed", key="vista"
+)
+
+if vista == "Maestros":
     c1, c2, c3 = st.columns(3)
     with c1:
         st.subheader("Clientes")
-        st.dataframe(masters["clientes"], use_container_width=True, height=420)
+        show_paginated(masters["clientes"], "clientes")
     with c2:
         st.subheader("Proveedores")
-        st.dataframe(masters["proveedores"], use_container_width=True, height=420)
+        show_paginated(masters["proveedores"], "proveedores")
     with c3:
         st.subheader("Servicios")
-        st.dataframe(masters["servicios"], use_container_width=True, height=420)
+        show_paginated(masters["servicios"], "servicios")
 
-with tab2:
+elif vista == "Diccionarios":
     c1, c2, c3 = st.columns(3)
     with c1:
         st.subheader("Diccionario – Clientes")
@@ -45,9 +91,9 @@ with tab2:
         st.subheader("Diccionario – Servicios")
         st.dataframe(masters["dicc_servicios"], use_container_width=True, height=420)
 
-with tab3:
+elif vista == "Calidad de datos":
     st.subheader("Resumen de calidad")
-    dq = quality_checks(masters)
+    dq = get_quality(signature)
     st.dataframe(dq["resumen"], use_container_width=True)
 
     c1, c2, c3 = st.columns(3)
@@ -61,25 +107,36 @@ with tab3:
         st.caption("Top nulos – Servicios")
         st.dataframe(dq["top_nulos_servicios"], use_container_width=True, height=260)
 
-with tab4:
+    st.subheader("Tipo y rango de columnas numéricas")
+    st.dataframe(dq["rangos"], use_container_width=True, hide_index=True)
+
+elif vista == "Modelo":
     st.subheader("Dataset del modelo")
 
-    periods = st.slider("Cantidad de periodos (snapshots) por servicio", min_value=6, max_value=24, value=12, step=1)
-    dataset = build_dataset(masters, periods=periods)
+    st.session_state["_periods"] = periods
+    periods = st.slider("Cantidad de periodos (snapshots) por servicio", min_value=6, max_value=24, step=1, key="_periods", on_change=_keep, args=("periods",))
+    dataset = get_dataset(signature, periods)
 
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        st.metric("Registros", f"{len(dataset):,}")
-    with c2:
-        st.metric("% Stockout14d = 1", f"{dataset['Stockout14d'].mean()*100:.1f}%")
-    with c3:
-        st.metric("Servicios únicos", dataset["ServicioID"].nunique())
+    cols = st.columns(2 + len(HORIZONS))
+    cols[0].metric("Registros", f"{len(dataset):,}")
+    for col, h in zip(cols[1:], HORIZONS):
+        col.metric(f"% {target_col(h)} = 1", f"{dataset[target_col(h)].mean()*100:.1f}%")
+    cols[-1].metric("Servicios únicos", dataset["ServicioID"].nunique())
 
-    st.dataframe(dataset.head(50), use_container_width=True, height=360)
+    show_paginated(dataset, "dataset", height=360)
 
     st.divider()
     st.subheader("Entrenamiento / Evaluación")
-    model, metrics = train_or_load_model(dataset, MODELS_DIR)
+    _, metrics_by_h = get_models(signature, periods)
+    st.dataframe(
+        pd.DataFrame([
+            {"Horizonte (días)": h, "Accuracy": m["accuracy"], "ROC-AUC": m["roc_auc"], "Precision": m["precision_pos"], "Recall": m["recall_pos"], "F1": m["f1_pos"]}
+            for h, m in metrics_by_h.items()
+        ]).round(3),
+        use_container_width=True, hide_index=True,
+    )
+    h_sel = st.selectbox("Detalle del horizonte", HORIZONS, index=HORIZONS.index(14), format_func=lambda h: f"{h} días")
+    metrics = metrics_by_h[h_sel]
 
     m1, m2, m3 = st.columns(3)
     with m1:
@@ -97,37 +154,43 @@ with tab4:
         st.caption("Reporte (resumen)")
         st.dataframe(metrics["report_df"], use_container_width=True)
 
-    st.info("El modelo se guarda en /models como archivo .joblib después del entrenamiento.")
+    if metrics["cached"]:
+        st.info(f"Modelos cargados del registro en /models (huella {metrics['fingerprint'][:12]}); no fue necesario reentrenar.")
+    else:
+        st.info("Se entrena un modelo por horizonte sobre la misma matriz de diseño; se guardan en /models como .joblib y como artefacto manifest.json + .npy.")
 
-with tab5:
+elif vista == "Predicción":
     st.subheader("Predicción")
-    # Ensure dataset and model are available
-    periods = 12
-    dataset = build_dataset(masters, periods=periods)
-    model, _ = train_or_load_model(dataset, MODELS_DIR)
+    st.caption(f"Modelo entrenado con {periods} periodos por servicio (ajustable en la vista Modelo).")
+    dataset = get_dataset(signature, periods)
+    models, _ = get_models(signature, periods)
+    store = get_feature_store(signature, periods)
+    servicios, periodos = store.servicios, store.periodos
 
     mode = st.radio("Modo", ["Usar un caso del dataset", "Ingresar valores (formulario)"], horizontal=True)
 
     if mode == "Usar un caso del dataset":
-        colA, colB = st.columns([2, 1])
+        colA, colB, colC = st.columns([2, 1, 1])
         with colA:
-            servicio_id = st.selectbox("ServicioID", sorted(dataset["ServicioID"].unique()))
+            servicio_id = st.selectbox("ServicioID", servicios)
         with colB:
-            periodo = st.selectbox("Periodo", sorted(dataset["Periodo"].unique()))
+            periodo = st.selectbox("Periodo", periodos)
+        with colC:
+            horizonte = st.selectbox("Horizonte (días)", HORIZONS, index=HORIZONS.index(14))
 
-        row = dataset[(dataset["ServicioID"] == servicio_id) & (dataset["Periodo"] == periodo)].iloc[0]
+        row = dataset.iloc[store.row_position(servicio_id, periodo)]
         st.caption("Caso seleccionado (snapshot)")
         st.dataframe(pd.DataFrame([row]), use_container_width=True)
 
-        result = predict_from_dataset_row(model, row)
+        result = predict_from_dataset_row(models, row, horizonte)
         st.subheader("Resultado")
-        st.metric("Probabilidad de rotura en 14 días", f"{result['prob']*100:.1f}%")
+        st.metric(f"Probabilidad de rotura en {horizonte} días", f"{result['prob']*100:.1f}%")
         st.write(result["mensaje"])
 
     else:
-        servicio_id = st.selectbox("ServicioID (para sugerencias)", sorted(dataset["ServicioID"].unique()))
-        periodo = st.selectbox("Periodo (para sugerencias)", sorted(dataset["Periodo"].unique()))
-        base_row = dataset[(dataset["ServicioID"] == servicio_id) & (dataset["Periodo"] == periodo)].iloc[0]
+        servicio_id = st.selectbox("ServicioID (para sugerencias)", servicios)
+        periodo = st.selectbox("Periodo (para sugerencias)", periodos)
+        base_row = store.get(servicio_id, periodo)
 
         with st.form("form_prediccion"):
             st.caption("Valores sugeridos (puedes editarlos)")
@@ -139,12 +202,83 @@ with tab5:
                 dias_rec = st.number_input("DiasHastaRecepcion", min_value=0, value=int(base_row["DiasHastaRecepcion"]))
                 rec_pend = st.number_input("RecepcionPendiente", min_value=0, value=int(base_row["RecepcionPendiente"]))
             with c3:
-                horizonte = st.selectbox("Horizonte (días)", [7, 14, 30], index=1)
+                horizonte = st.selectbox("Horizonte (días)", HORIZONS, index=HORIZONS.index(14))
 
             submitted = st.form_submit_button("Predecir", type="primary")
             
         if submitted:
-            result = predict_from_form(model, base_row, stock, demanda, dias_rec, rec_pend, horizonte)
+            result = predict_from_form(models, base_row, stock, demanda, dias_rec, rec_pend, horizonte)
             st.subheader("Resultado")
             st.metric("Probabilidad de rotura", f"{result['prob']*100:.1f}%")
             st.write(result["mensaje"])
+
+elif vista == "Escenarios":
+    st.subheader("Escenarios (what-if)")
+    st.caption("Evalúa de una vez una grilla de StockActual × DiasHastaRecepcion; demanda y recepción pendiente quedan en los valores del periodo.")
+    dataset = get_dataset(signature, periods)
+    models, _ = get_models(signature, periods)
+    store = get_feature_store(signature, periods)
+
+    with st.form("form_escenarios"):
+        c1, c2, c3 = st.columns([2, 1, 1])
+        with c1:
+            ids = st.multiselect("ServicioID", store.servicios, default=store.servicios[:1], max_selections=20)
+        with c2:
+            periodo = st.selectbox("Periodo", store.periodos)
+        with c3:
+            horizonte = st.selectbox("Horizonte (días)", HORIZONS, index=HORIZONS.index(14))
+        c4, c5, c6 = st.columns(3)
+        with c4:
+            factor = st.slider("Stock máximo (× CantidadPedidoEstandar)", 0.5, 5.0, 2.0, step=0.5)
+            puntos = st.slider("Pasos de stock", 5, 51, 21)
+        with c5:
+            dias = st.slider("DiasHastaRecepcion", 0, 90, (0, 45))
+        with c6:
+            simulacion = st.checkbox("Comparar con simulación Monte Carlo")
+        submitted = st.form_submit_button("Evaluar escenarios", type="primary")
+
+    if submitted and ids:
+        base = dataset.iloc[[store.row_position(s, periodo) for s in ids]]
+        t0 = time.perf_counter()
+        surface = scenario_grid(
+            models, base, horizonte, dias_rec=range(dias[0], dias[1] + 1),
+            stock_points=puntos, stock_factor=factor, simulacion=simulacion,
+        )
+        st.session_state["escenarios"] = (surface, stock_minimo(surface), (time.perf_counter() - t0) * 1000)
+
+    if "escenarios" in st.session_state:
+        surface, minimos, ms = st.session_state["escenarios"]
+        h = surface.attrs["horizonte"]
+        st.metric("Escenarios evaluados", f"{len(surface):,}", f"{ms:.0f} ms", delta_color="off")
+        servicio_id = st.selectbox("Servicio a mostrar", surface["ServicioID"].unique().tolist())
+        sel = minimos[minimos["ServicioID"] == servicio_id].set_index("DiasHastaRecepcion")
+        st.markdown(f"**Stock mínimo para salir de ALTO / quedar en BAJO (rotura en {h} días)**")
+        st.line_chart(sel[["StockMin_sin_ALTO", "StockMin_BAJO"]])
+        superficie = surface[surface["ServicioID"] == servicio_id].pivot_table(
+            index="StockActual", columns="DiasHastaRecepcion", values="prob", observed=True
+        )
+        st.markdown("**Probabilidad de rotura** (filas: StockActual, columnas: DiasHastaRecepcion)")
+        st.dataframe(superficie.style.format("{:.0%}"), use_container_width=True)
+        if "ProbSim" in surface:
+            st.caption("Probabilidad simulada (Monte Carlo) para la misma grilla")
+            sim = surface[surface["ServicioID"] == servicio_id].pivot_table(
+                index="StockActual", columns="DiasHastaRecepcion", values="ProbSim", observed=True
+            )
+            st.dataframe(sim.style.format("{:.0%}"), use_container_width=True)
+
+elif vista == "Rendimiento":
+    st.subheader("Tiempos por etapa del pipeline")
+    if not profiling.is_enabled():
+        st.info(
+            "La instrumentación está desactivada (sin costo). Para activarla, inicia la app con "
+            "`WMS_PROFILE=profiling.jsonl streamlit run app.py`; agrega `WMS_PROFILE_MEMORY=0` para medir solo tiempos y filas."
+        )
+    else:
+        log = profiling.log_path()
+        fuentes = ["Este proceso"] + (["Log completo"] if log is not None and log.exists() else [])
+        fuente = st.radio("Origen", fuentes, horizontal=True)
+        data = profiling.read_log(log) if fuente == "Log completo" else profiling.records()
+        st.caption("Los recursos cacheados de la app (maestros, dataset, modelos) solo se miden cuando se recalculan.")
+        st.dataframe(profiling.summary(data), use_container_width=True, hide_index=True)
+        if log is not None:
+            st.caption(f"Log JSON-lines: {log}")
@@ -0,0 +1 @@
+"""Benchmarks del pipeline WMS. Ejecutar desde la raíz del repo: python -m benchmarks.<modulo>"""
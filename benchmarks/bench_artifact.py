@@ -0,0 +1,99 @@
+"""
+Benchmark del formato de artefacto (manifest.json + .npy, wms_artifact) vs el Pipeline en .joblib.
+Valida paridad de probabilidades y compara tamaño en disco, tiempo de carga en el mismo proceso
+(mediana de --repeats cargas) y arranque en un proceso nuevo (import + carga + 1 predicción).
+Uso: python -m benchmarks.bench_artifact [--models-dir models] [--horizonte 14] [--repeats 50]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from wms_pipeline import FEATURE_COLS, load_masters, build_dataset, model_filename
+from wms_artifact import artifact_dirname, load_artifact, save_artifact
+from wms_scorer import StockoutScorer
+
+
+def _load_ms(fn, repeats: int) -> float:
+    """Mediana en ms de fn() (tras una llamada de calentamiento)."""
+    fn()
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+def _startup_ms(code: str, repeats: int) -> float:
+    """Mediana del tiempo de pared (ms) de un proceso Python que ejecuta code."""
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=Path.cwd())
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+def _size_kb(path: Path) -> float:
+    files = [path] if path.is_file() else [p for p in path.rglob("*") if p.is_file()]
+    return sum(p.stat().st_size for p in files) / 1024
+
+
+def main():
+    """Guarda el modelo .joblib como artefacto, valida paridad y mide tiempos de carga."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models-dir", type=Path, default=Path("models"))
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--horizonte", type=int, default=14)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--startup-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    joblib_path = args.models_dir / model_filename(args.horizonte)
+    model = joblib.load(joblib_path)
+    dataset = build_dataset(load_masters(args.data_dir), periods=12)
+    X = dataset[FEATURE_COLS].astype({c: object for c in dataset[FEATURE_COLS].select_dtypes("category")})
+    # Nulos y categorías no vistas para cubrir imputación y handle_unknown.
+    X.loc[X.index[::7], "StockActual"] = np.nan
+    X.loc[X.index[::11], "Categoria"] = "CATEGORIA-NUEVA"
+    X.loc[X.index[::13], "Segmento"] = np.nan
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = save_artifact(model, Path(tmp) / artifact_dirname(args.horizonte), target=f"Stockout{args.horizonte}d")
+        ref = model.predict_proba(X)[:, 1]
+        pipe_diff = float(np.abs(load_artifact(artifact).predict_proba(X)[:, 1] - ref).max())
+        scorer_diff = float(np.abs(StockoutScorer.from_artifact(artifact).predict_proba(X.to_dict("records")) - ref).max())
+        print(f"Paridad vs .joblib ({len(X):,} filas): máx |Δ| Pipeline {pipe_diff:.2e}, StockoutScorer {scorer_diff:.2e}")
+        assert max(pipe_diff, scorer_diff) < 1e-9
+
+        print(f"Tamaño en disco: .joblib {_size_kb(joblib_path):.1f} KB, artefacto {_size_kb(artifact):.1f} KB")
+        print(f"\nCarga en el mismo proceso (mediana de {args.repeats}):")
+        rows = [
+            ("joblib.load", lambda: joblib.load(joblib_path)),
+            ("load_artifact", lambda: load_artifact(artifact)),
+            ("StockoutScorer.from_artifact", lambda: StockoutScorer.from_artifact(artifact)),
+        ]
+        for name, fn in rows:
+            print(f"  {name:<30} {_load_ms(fn, args.repeats):8.2f} ms")
+
+        record = dataset[FEATURE_COLS].iloc[[1]].to_dict("records")[0]
+        print(f"\nArranque en un proceso nuevo (import + carga + 1 predicción, mediana de {args.startup_repeats}):")
+        codes = [
+            ("joblib.load", f"import joblib, pandas as pd; m = joblib.load({str(joblib_path)!r}); "
+                            f"m.predict_proba(pd.DataFrame([{record!r}]))"),
+            ("load_artifact", f"import pandas as pd; from pathlib import Path; from wms_artifact import load_artifact; "
+                              f"m = load_artifact(Path({str(artifact)!r})); m.predict_proba(pd.DataFrame([{record!r}]))"),
+            ("StockoutScorer.from_artifact", f"from wms_scorer import StockoutScorer; "
+                                             f"StockoutScorer.from_artifact({str(artifact)!r}).predict_one({record!r})"),
+        ]
+        for name, code in codes:
+            print(f"  {name:<30} {_startup_ms(code, args.startup_repeats):8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
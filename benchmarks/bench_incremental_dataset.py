@@ -0,0 +1,69 @@
+"""
+Benchmark de build_dataset_incremental vs build_dataset completo.
+En cada escenario (sin cambios, periodo nuevo, servicios/proveedores modificados, altas y bajas,
+menos periodos) verifica que el resultado incremental sea idéntico al rebuild completo.
+Uso: python -m benchmarks.bench_incremental_dataset [--services 20000] [--periods 12]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from wms_pipeline import build_dataset, build_dataset_incremental
+from benchmarks.synthetic import make_masters
+
+
+def _scenarios(masters: dict[str, pd.DataFrame], periods: int):
+    """Genera (nombre, maestros, periodos) aplicando cambios acumulativos sobre los maestros."""
+    yield "build inicial (sin estado)", masters, periods
+    yield "sin cambios", masters, periods
+    yield "periodo nuevo", masters, periods + 1
+
+    srv = masters["servicios"].copy()
+    idx = srv.index[::500]
+    srv.loc[idx, "CantidadPedidoEstandar"] = srv.loc[idx, "CantidadPedidoEstandar"] * 2
+    masters = {**masters, "servicios": srv}
+    yield "servicios modificados (0.2%)", masters, periods + 1
+
+    prov = masters["proveedores"].copy()
+    prov.loc[prov.index[:3], "RatingDesempeno"] = 5.0
+    masters = {**masters, "proveedores": prov}
+    yield "proveedores modificados", masters, periods + 1
+
+    srv = masters["servicios"]
+    nuevos = srv.tail(50).copy()
+    nuevos["ServicioID"] = nuevos["ServicioID"].astype(str) + "-N"
+    masters = {**masters, "servicios": pd.concat([srv.iloc[100:], nuevos])}
+    yield "altas y bajas de servicios", masters, periods + 1
+
+    yield "menos periodos", masters, periods - 4
+
+
+def main():
+    """Compara tiempos incremental vs completo y valida igualdad en cada escenario."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=20_000)
+    parser.add_argument("--periods", type=int, default=12)
+    args = parser.parse_args()
+
+    masters = make_masters(args.services, seed=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        state_dir = Path(tmp) / "dataset_state"
+        print(f"{'escenario':<32} {'completo (s)':>13} {'incremental (s)':>16} {'filas':>10} {'idéntico':>9}")
+        for name, m, periods in _scenarios(masters, args.periods):
+            t0 = time.perf_counter()
+            full = build_dataset(m, periods=periods)
+            t_full = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            inc = build_dataset_incremental(m, periods, state_dir)
+            t_inc = time.perf_counter() - t0
+
+            pd.testing.assert_frame_equal(inc, full)
+            print(f"{name:<32} {t_full:>13.3f} {t_inc:>16.3f} {len(inc):>10,} {'sí':>9}")
+
+
+if __name__ == "__main__":
+    main()
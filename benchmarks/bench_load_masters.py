@@ -0,0 +1,46 @@
+"""
+Benchmark de carga de maestros: lectura en frío (Excel) vs cache Parquet en caliente.
+Uso: python -m benchmarks.bench_load_masters [--data-dir data] [--repeats 20]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from wms_pipeline import load_masters
+
+
+def main():
+    """Mide load_masters sin cache, con cache vacía (cold) y con cache válida (warm)."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "cache"
+
+        t0 = time.perf_counter()
+        load_masters(args.data_dir, use_cache=False)
+        no_cache = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        load_masters(args.data_dir, cache_dir=cache_dir)
+        cold = time.perf_counter() - t0
+
+        warm = []
+        for _ in range(args.repeats):
+            t0 = time.perf_counter()
+            load_masters(args.data_dir, cache_dir=cache_dir)
+            warm.append(time.perf_counter() - t0)
+
+    print(f"Sin cache (Excel):        {no_cache * 1000:8.1f} ms")
+    print(f"Cold (Excel + escritura): {cold * 1000:8.1f} ms")
+    print(f"Warm mediana ({args.repeats} runs):  {statistics.median(warm) * 1000:8.1f} ms")
+    print(f"Warm mínimo:              {min(warm) * 1000:8.1f} ms")
+    print(f"Speedup (mediana):        {no_cache / statistics.median(warm):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
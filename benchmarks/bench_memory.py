@@ -0,0 +1,82 @@
+"""
+Huella de memoria por etapa del pipeline (maestros → base → dataset → features → matriz CSR) con los
+dtypes compactos (category / int32 / float32) frente a los dtypes previos (object / int64 / float64).
+La huella previa del dataset se estima sobre una muestra convertida a los dtypes antiguos y se
+escala al total de filas, para no necesitar varios GB de RAM.
+Uso: python -m benchmarks.bench_memory [--services 100000] [--periods 24]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from wms_pipeline import FEATURE_COLS, _build_base, _build_pipeline, _expand_periods, memory_report
+from benchmarks.synthetic import make_masters
+
+
+def _legacy_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Convierte a los dtypes que usaba el pipeline antes de compactar."""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = s.astype(object)
+        elif pd.api.types.is_integer_dtype(s.dtype):
+            out[col] = s.astype(np.int64)
+        elif pd.api.types.is_float_dtype(s.dtype):
+            out[col] = s.astype(np.float64)
+        else:
+            out[col] = s
+    return pd.DataFrame(out)
+
+def _legacy_mb(df: pd.DataFrame, sample_rows: int) -> float:
+    sample = df.sample(min(sample_rows, len(df)), random_state=0)
+    per_row = _legacy_dtypes(sample).memory_usage(index=True, deep=True).sum() / len(sample)
+    return per_row * len(df) / 2**20
+
+
+def main():
+    """Imprime el reporte por etapa y la reducción frente a los dtypes previos."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=100_000)
+    parser.add_argument("--periods", type=int, default=24)
+    parser.add_argument("--sample-rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    masters = make_masters(args.services, seed=3)
+    base = _build_base(masters)
+    dataset = _expand_periods(base, range(1, args.periods + 1))
+    X = dataset[FEATURE_COLS]
+    sample = X.sample(min(args.sample_rows, len(X)), random_state=0)
+    preprocess = _build_pipeline(X).named_steps["preprocess"].fit(sample)
+    design = preprocess.transform(X)
+
+    stages = {
+        "servicios": masters["servicios"],
+        "proveedores": masters["proveedores"],
+        "clientes": masters["clientes"],
+        "base (1 fila/servicio)": base,
+        "dataset": dataset,
+        "features (X)": X,
+        "matriz diseño (CSR)": design,
+    }
+    report = memory_report(stages)
+    legacy = {
+        "servicios": _legacy_mb(masters["servicios"], args.sample_rows),
+        "proveedores": _legacy_mb(masters["proveedores"], args.sample_rows),
+        "clientes": _legacy_mb(masters["clientes"], args.sample_rows),
+        "base (1 fila/servicio)": _legacy_mb(base, args.sample_rows),
+        "dataset": _legacy_mb(dataset, args.sample_rows),
+        "features (X)": _legacy_mb(X, args.sample_rows),
+        "matriz diseño (CSR)": design.shape[0] * design.shape[1] * 8 / 2**20,
+    }
+    report["MB dtypes previos"] = report["Etapa"].map(legacy).round(2)
+    report["Reducción"] = (report["MB dtypes previos"] / report["MB"]).round(1).astype(str) + "x"
+
+    print(f"{args.services:,} servicios × {args.periods} periodos")
+    print(report.to_string(index=False))
+    print("(matriz de diseño previa: equivalente densa float64)")
+
+
+if __name__ == "__main__":
+    main()
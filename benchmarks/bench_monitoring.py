@@ -0,0 +1,94 @@
+"""
+Benchmark del monitor de drift (wms_monitoring.DriftMonitor) sobre un flujo de filas puntuadas.
+Genera --rows filas sintéticas por chunks (iter_dataset_chunks), las puntúa con predict_batch y las agrega
+al monitor. Desde --drift-at se inyecta drift (DemandaDiariaEst × 1,5 y una categoría nueva de Segmento
+en el 30% de las filas). Reporta el costo de update por fila, la memoria fija del monitor y, cada
+--report-every filas, las features en drift de la ventana.
+Uso: python -m benchmarks.bench_monitoring [--rows 10000000] [--services 2000] [--no-score]
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from wms_pipeline import build_dataset, iter_dataset_chunks, predict_batch, train_or_load_model
+from wms_monitoring import DriftMonitor, build_reference
+from benchmarks.synthetic import make_masters
+
+
+def main():
+    """Entrena con 12 periodos, arma la referencia y monitorea --rows filas puntuadas."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--services", type=int, default=2_000)
+    parser.add_argument("--chunk-periods", type=int, default=50)
+    parser.add_argument("--drift-at", type=float, default=0.5, help="Fracción del flujo desde la que se inyecta drift")
+    parser.add_argument("--report-every", type=int, default=1_000_000)
+    parser.add_argument("--window-slots", type=int, default=10)
+    parser.add_argument("--slot-rows", type=int, default=100_000)
+    parser.add_argument("--no-score", action="store_true", help="No puntuar (solo mide el monitor)")
+    parser.add_argument("--models-dir", type=Path, default=Path("/tmp/wms_bench_monitoring"))
+    args = parser.parse_args()
+
+    masters = make_masters(args.services, seed=7)
+    train = build_dataset(masters, periods=12)
+    model, _ = train_or_load_model(train, args.models_dir)
+    t0 = time.perf_counter()
+    monitor = DriftMonitor(build_reference(train), window_slots=args.window_slots, slot_rows=args.slot_rows)
+    print(f"Referencia: {len(train):,} filas de entrenamiento, {monitor.n_bins} bins en {time.perf_counter() - t0:.3f} s")
+    print(f"Estado del monitor: {monitor._ring.nbytes / 1024:.1f} KB (anillo de {args.window_slots} × {args.slot_rows:,} filas)\n")
+
+    periods = -(-args.rows // args.services)
+    drift_from = int(args.rows * args.drift_at)
+    rng = np.random.default_rng(0)
+    seen, next_report = 0, args.report_every
+    gen_s = score_s = monitor_s = 0.0
+    peak_mb = 0.0
+    print(f"{'filas':>12} {'drift':>6} {'features en drift':<40} {'PSI máx':>8}")
+
+    chunks = iter_dataset_chunks(masters, periods=periods, chunk_periods=args.chunk_periods)
+    while seen < args.rows:
+        t0 = time.perf_counter()
+        chunk = next(chunks).iloc[:args.rows - seen]
+        if seen + len(chunk) > drift_from:
+            start = max(drift_from - seen, 0)
+            idx = chunk.index[start:]
+            chunk.loc[idx, "DemandaDiariaEst"] *= 1.5
+            chunk["Segmento"] = chunk["Segmento"].astype(object)
+            nueva = idx[rng.random(len(idx)) < 0.3]
+            chunk.loc[nueva, "Segmento"] = "NUEVO"
+        gen_s += time.perf_counter() - t0
+
+        if not args.no_score:
+            t0 = time.perf_counter()
+            predict_batch(model, chunk)
+            score_s += time.perf_counter() - t0
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        monitor.update(chunk)
+        monitor_s += time.perf_counter() - t0
+        peak_mb = max(peak_mb, tracemalloc.get_traced_memory()[1] / 2**20)
+        tracemalloc.stop()
+        seen += len(chunk)
+
+        if seen >= next_report or seen >= args.rows:
+            t0 = time.perf_counter()
+            status = monitor.status()
+            monitor_s += time.perf_counter() - t0
+            drifted = status.loc[status["nivel"] == "drift", "feature"].tolist()
+            print(f"{seen:>12,} {'sí' if drifted else 'no':>6} {', '.join(drifted)[:40]:<40} {status['psi'].max():>8.3f}")
+            next_report += args.report_every
+
+    print(f"\nFilas monitoreadas: {monitor.rows_seen:,} en {monitor.batches} batches (ventana actual {monitor.window_rows:,} filas)")
+    print(f"Generación de chunks: {gen_s:.1f} s")
+    if not args.no_score:
+        print(f"Scoring (predict_batch): {score_s:.1f} s ({seen / score_s:,.0f} filas/s)")
+    print(f"Monitor (update + status): {monitor_s:.1f} s ({seen / monitor_s:,.0f} filas/s, {monitor_s / seen * 1e9:.0f} ns/fila)")
+    print(f"Pico de memoria de update por chunk (tracemalloc): {peak_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Entrenamiento de los horizontes 7/14/30 días: tres corridas separadas (_fit_and_evaluate por target,
+cada una repite split y preprocesamiento) vs una corrida multi-horizonte (_fit_and_evaluate_horizons,
+una sola matriz de diseño compartida y un LogisticRegression por horizonte en paralelo).
+Verifica además que ambas rutas producen exactamente las mismas probabilidades.
+Uso: python -m benchmarks.bench_multi_horizon [--services 20000] [--periods 12] [--repeats 3]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from wms_pipeline import FEATURE_COLS, HORIZONS, build_dataset, target_col, _fit_and_evaluate, _fit_and_evaluate_horizons
+from benchmarks.synthetic import make_masters
+
+
+def _best_of(fn, repeats: int):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def main():
+    """Mide ambas rutas sobre un dataset sintético y tabula tiempo y ROC-AUC por horizonte."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=20_000)
+    parser.add_argument("--periods", type=int, default=12)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--n-jobs", type=int, default=None, help="Hilos para la corrida multi-horizonte (por defecto, uno por horizonte hasta os.cpu_count())")
+    args = parser.parse_args()
+
+    dataset = build_dataset(make_masters(args.services, seed=7), periods=args.periods)
+    print(f"{args.services:,} servicios × {args.periods} periodos = {len(dataset):,} filas")
+
+    separate, t_separate = _best_of(lambda: {h: _fit_and_evaluate(dataset, target_col(h)) for h in HORIZONS}, args.repeats)
+    multi, t_multi = _best_of(lambda: _fit_and_evaluate_horizons(dataset, HORIZONS, n_jobs=args.n_jobs), args.repeats)
+
+    X = dataset[FEATURE_COLS]
+    print(f"{'horizonte':<10} {'% positivos':>12} {'ROC-AUC':>8} {'máx |Δ prob|':>13}")
+    for h in HORIZONS:
+        diff = np.abs(separate[h][0].predict_proba(X)[:, 1] - multi[h][0].predict_proba(X)[:, 1]).max()
+        assert diff < 1e-9, f"horizonte {h}: las rutas difieren ({diff:.2e})"
+        print(f"{h:>4} días  {dataset[target_col(h)].mean() * 100:>11.1f}% {multi[h][1]['roc_auc']:>8.4f} {diff:>13.2e}")
+
+    print(f"\n3 corridas separadas:      {t_separate:8.3f} s")
+    print(f"1 corrida multi-horizonte: {t_multi:8.3f} s  ({t_separate / t_multi:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Pico de memoria (RSS) de generar y puntuar el dataset en memoria (build_dataset + predict_batch) vs
+out-of-core (write_dataset_partitions + iter_dataset_partitions + score_chunks), para varias cantidades
+de periodos. Cada corrida usa un proceso aparte para que ru_maxrss no se contamine entre corridas.
+Uso: python -m benchmarks.bench_out_of_core [--services 2000] [--periods 365 730 1460] [--chunk-rows 100000]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+
+from wms_pipeline import FEATURE_COLS, build_dataset, predict_batch, train_or_load_model, write_dataset_partitions, iter_dataset_partitions, score_chunks
+from benchmarks.synthetic import make_masters
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def _run_mode(args) -> dict:
+    """Ejecuta un modo dentro del proceso hijo y devuelve métricas."""
+    masters = make_masters(args.services, seed=7)
+    model = joblib.load(Path(args.tmp) / "model.joblib")
+    rss_base = _rss_mb()
+    t0 = time.perf_counter()
+    if args.mode == "memoria":
+        dataset = build_dataset(masters, periods=args.periods)
+        scores = predict_batch(model, dataset)
+        out = dataset[["ServicioID", "Periodo"]].join(scores)
+        out.to_parquet(Path(args.tmp) / "scores.parquet", index=False)
+        n_rows = len(out)
+    else:
+        parts = Path(args.tmp) / f"parts_{args.periods}"
+        write_dataset_partitions(masters, parts, args.periods, chunk_rows=args.chunk_rows)
+        del masters
+        chunks = iter_dataset_partitions(parts, columns=FEATURE_COLS + ["ServicioID"], batch_rows=args.chunk_rows)
+        n_rows = sum(score_chunks(model, chunks, Path(args.tmp) / "scores.parquet").values())
+    return {
+        "modo": args.mode,
+        "periodos": args.periods,
+        "filas": n_rows,
+        "segundos": round(time.perf_counter() - t0, 2),
+        "rss_base_mb": round(rss_base, 1),
+        "rss_pico_mb": round(_rss_mb(), 1),
+    }
+
+
+def main():
+    """Entrena un modelo de referencia y lanza cada (modo, periodos) en un subproceso."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=2_000)
+    parser.add_argument("--periods", type=int, nargs="+", default=[365, 730, 1460])
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    parser.add_argument("--tmp", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        args.periods = args.periods[0]
+        print(json.dumps(_run_mode(args)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model, _ = train_or_load_model(build_dataset(make_masters(args.services, seed=7), periods=12), Path(tmp) / "models")
+        joblib.dump(model, Path(tmp) / "model.joblib")
+
+        print(f"{args.services:,} servicios, chunk de {args.chunk_rows:,} filas")
+        print(f"{'modo':<12} {'periodos':>9} {'filas':>11} {'segundos':>9} {'RSS base (MB)':>14} {'RSS pico (MB)':>14}")
+        for periods in args.periods:
+            for mode in ["memoria", "particiones"]:
+                cmd = [sys.executable, "-m", "benchmarks.bench_out_of_core", "--mode", mode, "--tmp", tmp,
+                       "--services", str(args.services), "--periods", str(periods), "--chunk-rows", str(args.chunk_rows)]
+                out = json.loads(subprocess.run(cmd, check=True, capture_output=True, text=True).stdout.strip().splitlines()[-1])
+                print(f"{out['modo']:<12} {out['periodos']:>9} {out['filas']:>11,} {out['segundos']:>9} {out['rss_base_mb']:>14} {out['rss_pico_mb']:>14}")
+
+
+if __name__ == "__main__":
+    main()
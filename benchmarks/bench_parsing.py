@@ -0,0 +1,66 @@
+"""
+Micro-benchmark del parseo de SLA (horas / %) y del número de ServicioID: versión previa con
+Series.apply + re.search por fila frente a _extract_number (str.extract una vez por valor distinto).
+Los casos conocidos de cada patrón están en tests/test_parsing.py; aquí solo se verifica paridad con la versión previa.
+Uso: python -m benchmarks.bench_parsing [--rows 1000000]
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from wms_pipeline import SLA_HOURS_PATTERN, SLA_PCT_PATTERN, FIRST_NUMBER_PATTERN, _extract_number
+from benchmarks.synthetic import make_raw_masters
+
+
+def legacy_sla_hours(s):
+    """Implementación previa (con el patrón ya corregido) evaluada fila a fila."""
+    if pd.isna(s): return np.nan
+    m = re.search(SLA_HOURS_PATTERN, str(s).lower())
+    return float(m.group(1)) if m else np.nan
+
+def legacy_sla_pct(s):
+    if pd.isna(s): return np.nan
+    m = re.search(SLA_PCT_PATTERN, str(s))
+    return float(m.group(1)) if m else np.nan
+
+def legacy_num(x):
+    m = re.search(FIRST_NUMBER_PATTERN, str(x))
+    return int(m.group(1)) if m else 0
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    """Compara apply vs _extract_number sobre SLA y ServicioID a N filas."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--services", type=int, default=20_000, help="Valores distintos de ServicioID/SLA")
+    args = parser.parse_args()
+
+    srv = make_raw_masters(args.services, seed=1)["servicios"]["Servicios_data"]
+    idx = np.random.default_rng(0).integers(0, len(srv), args.rows)
+    sla = srv["SLA"].take(idx).astype("category").reset_index(drop=True)
+    ids = srv["ServicioID"].take(idx).astype("category").reset_index(drop=True)
+
+    cases = [
+        ("SLA_horas", lambda: sla.astype(object).apply(legacy_sla_hours), lambda: _extract_number(sla, SLA_HOURS_PATTERN, lower=True)),
+        ("SLA_pct", lambda: sla.astype(object).apply(legacy_sla_pct), lambda: _extract_number(sla, SLA_PCT_PATTERN)),
+        ("ServicioNum", lambda: ids.astype(object).apply(legacy_num), lambda: _extract_number(ids, FIRST_NUMBER_PATTERN).fillna(0).astype(np.int64)),
+    ]
+    print(f"\n{args.rows:,} filas, {sla.nunique():,} SLA distintos, {ids.nunique():,} IDs distintos")
+    print(f"{'columna':<12} {'apply (s)':>10} {'extract (s)':>12} {'speedup':>8}")
+    for name, legacy, vectorized in cases:
+        old, t_old = _timed(legacy)
+        new, t_new = _timed(vectorized)
+        np.testing.assert_array_equal(np.asarray(old, dtype=float), np.asarray(new, dtype=float))
+        print(f"{name:<12} {t_old:>10.3f} {t_new:>12.3f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark del motor de calidad (wms_quality): un solo chunk en proceso frente a chunks en un pool de
+procesos, desde DataFrames en memoria y desde Parquet leído por row group. Verifica que resumen y
+top_nulos coincidan entre modos.
+Uso: python -m benchmarks.bench_quality [--services 400000] [--chunk-rows 100000] [--workers N]
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from wms_quality import quality_report
+from benchmarks.synthetic import make_masters
+
+
+def main():
+    """Mide quality_report por modo e imprime el resumen y el reporte de rangos."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=400_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    masters = make_masters(args.services, seed=2)
+    sources = {k: masters[k] for k in ("clientes", "proveedores", "servicios")}
+    results = {}
+    timings = {}
+
+    t0 = time.perf_counter()
+    results["memoria, 1 chunk"] = quality_report(sources, chunk_rows=10**12, workers=1)
+    timings["memoria, 1 chunk"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results[f"memoria, pool x{args.workers}"] = quality_report(sources, chunk_rows=args.chunk_rows, workers=args.workers)
+    timings[f"memoria, pool x{args.workers}"] = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for name, df in sources.items():
+            paths[name] = Path(tmp) / f"{name}.parquet"
+            df.astype({c: object for c in df.select_dtypes("category").columns}).to_parquet(paths[name], row_group_size=args.chunk_rows)
+        t0 = time.perf_counter()
+        results[f"parquet, pool x{args.workers}"] = quality_report(paths, workers=args.workers)
+        timings[f"parquet, pool x{args.workers}"] = time.perf_counter() - t0
+
+    reference = results["memoria, 1 chunk"]
+    for mode, res in results.items():
+        for key in ("resumen", "top_nulos_clientes", "top_nulos_proveedores", "top_nulos_servicios"):
+            pd.testing.assert_frame_equal(reference[key], res[key])
+
+    n_rows = sum(len(df) for df in sources.values())
+    print(f"{n_rows:,} filas en 3 maestros ({os.cpu_count()} CPU)")
+    for mode, seconds in timings.items():
+        print(f"  {mode:<24} {seconds:7.2f} s  {n_rows / seconds:12,.0f} filas/s")
+    print("✓ resumen y top_nulos idénticos entre modos\n")
+    print(reference["resumen"].to_string(index=False))
+    print()
+    print(reference["rangos"].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
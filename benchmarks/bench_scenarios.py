@@ -0,0 +1,57 @@
+"""
+Benchmark de la grilla de escenarios (wms_scenarios.scenario_grid) vs repetir predict_from_form.
+Valida paridad en la grilla del primer servicio y mide el tiempo de la grilla por defecto
+(21 stocks × 46 días) para distintas cantidades de servicios.
+Uso: python -m benchmarks.bench_scenarios [--services 1 5 20 100] [--horizonte 14]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from wms_pipeline import HORIZONS, load_masters, build_dataset, predict_from_form
+from wms_artifact import load_model
+from wms_scenarios import scenario_grid, stock_minimo
+
+
+def main():
+    """Compara el bucle de formulario con la grilla vectorizada sobre los datos reales."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models-dir", type=Path, default=Path("models"))
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--services", type=int, nargs="+", default=[1, 5, 20, 100])
+    parser.add_argument("--horizonte", type=int, choices=HORIZONS, default=14)
+    args = parser.parse_args()
+
+    models = {h: load_model(args.models_dir, h) for h in HORIZONS}
+    dataset = build_dataset(load_masters(args.data_dir), periods=12)
+    base = dataset[dataset["Periodo"] == 1]
+    scenario_grid(models, base.head(1), args.horizonte)
+
+    surface = scenario_grid(models, base.head(1), args.horizonte)
+    row = base.iloc[0]
+    t0 = time.perf_counter()
+    loop = np.array([
+        predict_from_form(models, row, r.StockActual, r.DemandaDiariaEst, r.DiasHastaRecepcion, r.RecepcionPendiente, args.horizonte)["prob"]
+        for r in surface.itertuples()
+    ])
+    loop_s = time.perf_counter() - t0
+    diff = float(np.abs(loop - surface["prob"].to_numpy()).max())
+    print(f"Paridad vs predict_from_form ({len(surface):,} escenarios): máx |Δ| {diff:.2e}")
+    assert diff < 1e-12
+    print(f"predict_from_form en bucle: {loop_s:.3f} s ({len(surface) / loop_s:,.0f} escenarios/s)\n")
+
+    print(f"{'servicios':>9} {'escenarios':>11} {'grilla (s)':>11} {'stock_minimo (s)':>17} {'escenarios/s':>13}")
+    for n in args.services:
+        t0 = time.perf_counter()
+        surface = scenario_grid(models, base.head(n), args.horizonte)
+        grid_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        stock_minimo(surface)
+        min_s = time.perf_counter() - t0
+        print(f"{n:>9} {len(surface):>11,} {grid_s:>11.3f} {min_s:>17.4f} {len(surface) / grid_s:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
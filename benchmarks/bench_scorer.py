@@ -0,0 +1,85 @@
+"""
+Benchmark del runtime NumPy (wms_scorer) vs el Pipeline de scikit-learn.
+Mide paridad de probabilidades, tiempo de arranque en un proceso nuevo (import + carga del modelo)
+y latencia por predicción individual (p50/p99).
+Uso: python -m benchmarks.bench_scorer [--model models/stockout14d_logreg.joblib] [--calls 2000]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from wms_pipeline import FEATURE_COLS, load_masters, build_dataset, export_scorer, predict_from_dataset_row
+from wms_scorer import StockoutScorer
+
+
+def _startup_seconds(code: str, repeats: int) -> float:
+    """Mediana del tiempo de pared de un proceso Python que ejecuta code."""
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=Path.cwd())
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+def _percentiles(samples: list[float]) -> str:
+    arr = np.asarray(samples) * 1e6
+    return f"p50 {np.percentile(arr, 50):8.1f} µs   p99 {np.percentile(arr, 99):8.1f} µs"
+
+
+def main():
+    """Exporta el modelo, valida paridad a 1e-9 y compara arranque y latencia."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=Path("models/stockout14d_logreg.joblib"))
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--startup-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    dataset = build_dataset(load_masters(args.data_dir), periods=12)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scorer_path = export_scorer(model, Path(tmp) / "scorer.json")
+        scorer = StockoutScorer.load(scorer_path)
+
+        ref = model.predict_proba(dataset[FEATURE_COLS])[:, 1]
+        records = dataset[FEATURE_COLS].to_dict("records")
+        batch_diff = float(np.abs(scorer.predict_proba(records) - ref).max())
+        single_diff = max(abs(scorer.predict_one(r) - p) for r, p in zip(records, ref))
+        print(f"Paridad vs predict_proba: máx |Δ| batch {batch_diff:.2e}, individual {single_diff:.2e}")
+        assert max(batch_diff, single_diff) < 1e-9
+
+        sk_start = _startup_seconds(
+            f"import joblib, pandas as pd; m = joblib.load({str(args.model)!r}); "
+            f"m.predict_proba(pd.DataFrame([{records[0]!r}]))",
+            args.startup_repeats,
+        )
+        np_start = _startup_seconds(
+            f"from wms_scorer import StockoutScorer; s = StockoutScorer.load({str(scorer_path)!r}); "
+            f"s.predict_one({records[0]!r})",
+            args.startup_repeats,
+        )
+    print(f"Arranque (proceso nuevo, import + carga + 1 predicción): sklearn {sk_start * 1000:.0f} ms, numpy {np_start * 1000:.0f} ms")
+
+    rows = [dataset.iloc[i % len(dataset)] for i in range(args.calls)]
+    sk_lat, np_lat = [], []
+    for row, rec in zip(rows, (records[i % len(records)] for i in range(args.calls))):
+        t0 = time.perf_counter()
+        predict_from_dataset_row(model, row)
+        sk_lat.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        scorer.predict_one(rec)
+        np_lat.append(time.perf_counter() - t0)
+    print(f"Latencia sklearn (predict_from_dataset_row): {_percentiles(sk_lat)}")
+    print(f"Latencia numpy   (StockoutScorer.predict_one): {_percentiles(np_lat)}")
+
+
+if __name__ == "__main__":
+    main()
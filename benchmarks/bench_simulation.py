@@ -0,0 +1,76 @@
+"""
+Simulador Monte Carlo (wms_simulation): exactitud, tiempo a escala y contraste con el modelo logístico.
+1) simulate_stockout coincide con la proyección día a día de project_stock (mismos caminos de demanda).
+2) Tiempo para --services × --draws × horizonte máximo (por defecto 100k × 1.000 × 30 días).
+3) Sobre el dataset real: con demand_cv=0 vs la regla cerrada Stockout{h}d, y con ruido vs el modelo.
+Uso: python -m benchmarks.bench_simulation [--services 100000] [--draws 1000] [--demand-cv 0.25]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from wms_pipeline import FEATURE_COLS, HORIZONS, load_masters, build_dataset, model_filename, target_col
+from wms_simulation import demand_paths, project_stock, simulate_dataset, simulate_stockout
+
+
+def _random_inputs(n: int, seed: int) -> tuple[np.ndarray, ...]:
+    rng = np.random.default_rng(seed)
+    stock = rng.integers(0, 300, n)
+    demanda = rng.uniform(0, 25, n)
+    dias_rec = rng.integers(0, 45, n)
+    rec_pend = rng.integers(0, 2, n) * rng.integers(0, 400, n)
+    return stock, demanda, dias_rec, rec_pend
+
+def check_daily_projection(n: int = 500, draws: int = 400, demand_cv: float = 0.3) -> float:
+    """Máxima diferencia entre simulate_stockout y recorrer project_stock día por día."""
+    inputs = _random_inputs(n, seed=3)
+    traj = project_stock(*inputs, demand_paths(draws, max(HORIZONS), demand_cv, seed=11))
+    daily = np.stack([(traj[:, :, :h] < 0).any(axis=2).mean(axis=1) for h in HORIZONS], axis=1)
+    fast = simulate_stockout(*inputs, draws=draws, demand_cv=demand_cv, seed=11)
+    diff = float(np.abs(fast - daily).max())
+    assert diff == 0.0, f"simulate_stockout difiere de la proyección diaria ({diff})"
+    return diff
+
+
+def main():
+    """Valida, mide y compara con el modelo por horizonte."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=100_000)
+    parser.add_argument("--draws", type=int, default=1_000)
+    parser.add_argument("--demand-cv", type=float, default=0.25)
+    parser.add_argument("--models-dir", type=Path, default=Path("models"))
+    args = parser.parse_args()
+
+    print(f"Proyección diaria vs simulate_stockout: máx |Δ| = {check_daily_projection():.1f}")
+
+    inputs = _random_inputs(args.services, seed=7)
+    t0 = time.perf_counter()
+    prob = simulate_stockout(*inputs, draws=args.draws, demand_cv=args.demand_cv)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.services:,} servicios × {args.draws:,} draws × {max(HORIZONS)} días: {elapsed:.2f} s "
+          f"(P media por horizonte {', '.join(f'{h}d {p:.3f}' for h, p in zip(HORIZONS, prob.mean(axis=0)))})")
+
+    dataset = build_dataset(load_masters(Path("data")), periods=12)
+    exact = simulate_dataset(dataset, draws=1, demand_cv=0.0)
+    noisy = simulate_dataset(dataset, draws=args.draws, demand_cv=args.demand_cv)
+    print(f"\nDataset real ({len(dataset):,} filas)")
+    print(f"{'horizonte':<10} {'acuerdo cv=0':>13} {'AUC sim':>8} {'AUC modelo':>11} {'corr sim-modelo':>16}")
+    for h in HORIZONS:
+        y = dataset[target_col(h)].to_numpy()
+        acuerdo = float(((exact[f"ProbSim{h}d"].to_numpy() >= 0.5) == y).mean())
+        sim = noisy[f"ProbSim{h}d"].to_numpy()
+        model_path = args.models_dir / model_filename(h)
+        if model_path.exists():
+            model_prob = joblib.load(model_path).predict_proba(dataset[FEATURE_COLS])[:, 1]
+            auc_model, corr = roc_auc_score(y, model_prob), np.corrcoef(sim, model_prob)[0, 1]
+        else:
+            auc_model, corr = float("nan"), float("nan")
+        print(f"{h:>4} días  {acuerdo:>12.1%} {roc_auc_score(y, sim):>8.3f} {auc_model:>11.3f} {corr:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Pico de memoria (RSS) del entrenamiento en memoria vs streaming (train_streaming).
+Cada modo corre en un proceso aparte para que ru_maxrss no se contamine entre modos.
+Uso: python -m benchmarks.bench_streaming_train [--services 20000] [--periods 24] [--chunk-services 2000]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from wms_pipeline import _fit_and_evaluate, build_dataset, iter_dataset_chunks, iter_parquet_chunks, train_streaming
+from benchmarks.synthetic import make_masters
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def _run_mode(args) -> dict:
+    """Ejecuta un modo dentro del proceso hijo y devuelve métricas."""
+    masters = make_masters(args.services, seed=7)
+    rss_masters = _rss_mb()
+    t0 = time.perf_counter()
+    if args.mode == "memoria":
+        _, metrics = _fit_and_evaluate(build_dataset(masters, periods=args.periods))
+    elif args.mode == "stream-build":
+        _, metrics = train_streaming(
+            lambda: iter_dataset_chunks(masters, args.periods, chunk_services=args.chunk_services),
+            Path(args.tmp), epochs=args.epochs,
+        )
+    else:
+        del masters
+        _, metrics = train_streaming(lambda: iter_parquet_chunks(Path(args.tmp) / "parts"), Path(args.tmp), epochs=args.epochs)
+    return {
+        "modo": args.mode,
+        "segundos": round(time.perf_counter() - t0, 2),
+        "rss_maestros_mb": round(rss_masters, 1),
+        "rss_pico_mb": round(_rss_mb(), 1),
+        "roc_auc": round(metrics["roc_auc"], 4),
+    }
+
+
+def main():
+    """Lanza cada modo en un subproceso y tabula pico de RSS, tiempo y ROC-AUC."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=20_000)
+    parser.add_argument("--periods", type=int, default=24)
+    parser.add_argument("--chunk-services", type=int, default=2_000)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    parser.add_argument("--tmp", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parts = Path(tmp) / "parts"
+        parts.mkdir()
+        masters = make_masters(args.services, seed=7)
+        for i, chunk in enumerate(iter_dataset_chunks(masters, args.periods, chunk_services=args.chunk_services)):
+            chunk.to_parquet(parts / f"part-{i:05d}.parquet", index=False)
+        del masters
+
+        print(f"{args.services:,} servicios × {args.periods} periodos = {args.services * args.periods:,} filas")
+        print(f"{'modo':<15} {'segundos':>9} {'RSS maestros (MB)':>18} {'RSS pico (MB)':>14} {'ROC-AUC':>8}")
+        for mode in ["memoria", "stream-build", "stream-parquet"]:
+            cmd = [sys.executable, "-m", "benchmarks.bench_streaming_train", "--mode", mode, "--tmp", tmp,
+                   "--services", str(args.services), "--periods", str(args.periods),
+                   "--chunk-services", str(args.chunk_services), "--epochs", str(args.epochs)]
+            out = json.loads(subprocess.run(cmd, check=True, capture_output=True, text=True).stdout.strip().splitlines()[-1])
+            print(f"{out['modo']:<15} {out['segundos']:>9} {out['rss_maestros_mb']:>18} {out['rss_pico_mb']:>14} {out['roc_auc']:>8}")
+
+
+if __name__ == "__main__":
+    main()
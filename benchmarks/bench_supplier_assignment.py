@@ -0,0 +1,74 @@
+"""
+Benchmark de asignación de proveedores: ranking vectorizado vs apply fila a fila (implementación previa).
+Verifica que ambos asignen el mismo ProveedorID.
+Uso: python -m benchmarks.bench_supplier_assignment [--sizes 1000 10000 100000] [--legacy-max 10000]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from wms_pipeline import _assign_suppliers, _map_supplier_category
+from benchmarks.synthetic import make_masters
+
+
+def _legacy_assign(base: pd.DataFrame, prov: pd.DataFrame) -> pd.Series:
+    """Implementación original: filtra y ordena candidatos por cada servicio."""
+    prov_rank = prov.copy()
+    prov_rank["RatingDesempeno_fill"] = prov_rank["RatingDesempeno"].fillna(prov_rank["RatingDesempeno"].median())
+    prov_rank["LeadTimePromedioDias_fill"] = prov_rank["LeadTimePromedioDias"].fillna(prov_rank["LeadTimePromedioDias"].median())
+
+    def pick_supplier(row) -> str:
+        cat = row["ProveedorCategoriaObjetivo"]
+        dept = row.get("Departamento", None)
+        candidates = prov_rank[prov_rank["Categoria"].str.upper() == cat] if "Categoria" in prov_rank.columns else prov_rank
+        if candidates.empty:
+            candidates = prov_rank
+        candidates = candidates.copy()
+        candidates["dept_match"] = (candidates["Departamento"] == dept).astype(int) if "Departamento" in candidates.columns else 0
+        candidates = candidates.sort_values(
+            ["dept_match", "RatingDesempeno_fill", "LeadTimePromedioDias_fill", "ProveedorID"],
+            ascending=[False, False, True, True],
+        )
+        return str(candidates.iloc[0]["ProveedorID"])
+
+    return base.apply(pick_supplier, axis=1)
+
+def _base(masters: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    base = masters["servicios"].merge(
+        masters["clientes"][["ClienteID", "Segmento", "CanalPreferido", "ZonaDespacho", "Departamento"]],
+        how="left", left_on="ClientePropietario", right_on="ClienteID", suffixes=("", "_cli"),
+    )
+    base["ProveedorCategoriaObjetivo"] = base["Categoria"].apply(_map_supplier_category)
+    return base
+
+
+def main():
+    """Mide ambas implementaciones por tamaño y valida igualdad de resultados."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--suppliers", type=int, default=2_000)
+    parser.add_argument("--legacy-max", type=int, default=10_000, help="Tamaño máximo en que se corre la versión fila a fila")
+    args = parser.parse_args()
+
+    print(f"{'servicios':>10} {'vectorizado (s)':>16} {'fila a fila (s)':>16} {'speedup':>8} {'iguales':>8}")
+    for n in args.sizes:
+        masters = make_masters(n, n_suppliers=args.suppliers, seed=n)
+        base, prov = _base(masters), masters["proveedores"]
+
+        t0 = time.perf_counter()
+        fast = _assign_suppliers(base, prov)
+        t_fast = time.perf_counter() - t0
+
+        if n <= args.legacy_max:
+            t0 = time.perf_counter()
+            slow = _legacy_assign(base, prov)
+            t_slow = time.perf_counter() - t0
+            same = bool((fast == slow).all())
+            print(f"{n:>10,} {t_fast:>16.4f} {t_slow:>16.2f} {t_slow / t_fast:>7.0f}x {str(same):>8}")
+        else:
+            print(f"{n:>10,} {t_fast:>16.4f} {'-':>16} {'-':>8} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
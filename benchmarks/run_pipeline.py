@@ -0,0 +1,126 @@
+"""
+Suite end-to-end del pipeline: load_masters (Excel y cache) → quality_checks → build_dataset →
+train_or_load_model → predicción individual y batch, sobre maestros sintéticos escritos a Excel
+a varias escalas. Cada etapa se cronometra sin instrumentar y luego se repite bajo tracemalloc para
+registrar el pico de memoria. El resultado se guarda en JSON para comparar entre commits.
+Uso: python -m benchmarks.run_pipeline [--sizes 500 2000 10000] [--periods 12] [--output bench.json] [--baseline prev.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import sklearn
+
+from wms_pipeline import load_masters, quality_checks, build_dataset, train_or_load_model, predict_from_dataset_row, predict_batch
+from benchmarks.synthetic import write_master_workbooks
+
+# Una etapa se marca como regresión si es más lenta que el baseline en este factor.
+REGRESSION_FACTOR = 1.10
+
+
+def _measure(fn, repeats: int = 1) -> tuple[object, float, float]:
+    """Ejecuta fn `repeats` veces (mediana en segundos) y una vez más bajo tracemalloc (pico en MB)."""
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, statistics.median(times), peak / 2**20
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_size(n_services: int, periods: int, single_repeats: int, workdir: Path) -> list[dict]:
+    """Corre todas las etapas para una escala y devuelve una fila por etapa."""
+    data_dir = write_master_workbooks(workdir / f"data_{n_services}", n_services, seed=n_services)
+    cache_dir = workdir / f"cache_{n_services}"
+    models_dir = workdir / f"models_{n_services}"
+    rows = []
+
+    def record(stage: str, fn, n_rows: int | None = None, repeats: int = 1):
+        result, seconds, peak_mb = _measure(fn, repeats)
+        rows.append({"stage": stage, "services": n_services, "rows": n_rows, "seconds": seconds, "peak_mb": peak_mb})
+        print(f"  {stage:<26} {seconds * 1000:10.1f} ms {peak_mb:9.1f} MB")
+        return result
+
+    print(f"\n{n_services:,} servicios × {periods} periodos")
+    masters = record("load_masters_excel", lambda: load_masters(data_dir, use_cache=False))
+    load_masters(data_dir, cache_dir=cache_dir)
+    record("load_masters_cache", lambda: load_masters(data_dir, cache_dir=cache_dir), repeats=5)
+    record("quality_checks", lambda: quality_checks(masters))
+    dataset = record("build_dataset", lambda: build_dataset(masters, periods=periods))
+    n_rows = len(dataset)
+    rows[-1]["rows"] = n_rows
+    model, _ = record("train_model", lambda: train_or_load_model(dataset, models_dir, force_retrain=True), n_rows)
+    record("train_model_registry_hit", lambda: train_or_load_model(dataset, models_dir), n_rows)
+    row = dataset.iloc[n_rows // 2]
+    record("predict_single", lambda: predict_from_dataset_row(model, row), 1, repeats=single_repeats)
+    record("predict_batch", lambda: predict_batch(model, dataset), n_rows)
+    return rows
+
+def compare(results: list[dict], baseline: dict) -> None:
+    """Imprime la razón tiempo_actual / tiempo_baseline por etapa y escala."""
+    prev = {(r["stage"], r["services"]): r for r in baseline["results"]}
+    print(f"\nComparación contra {baseline['meta'].get('commit') or 'baseline'} (regresión si > {REGRESSION_FACTOR:.2f}x)")
+    for r in results:
+        old = prev.get((r["stage"], r["services"]))
+        if old is None or old["seconds"] <= 0:
+            continue
+        ratio = r["seconds"] / old["seconds"]
+        flag = "  ← REGRESIÓN" if ratio > REGRESSION_FACTOR else ""
+        print(f"  {r['stage']:<26} {r['services']:>8,} {ratio:6.2f}x  pico {old['peak_mb']:.1f} → {r['peak_mb']:.1f} MB{flag}")
+
+
+def main():
+    """Corre la suite en todas las escalas, guarda el JSON y compara contra un baseline opcional."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2_000, 10_000])
+    parser.add_argument("--periods", type=int, default=12)
+    parser.add_argument("--single-repeats", type=int, default=50)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON de una corrida anterior para comparar")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            results.extend(run_size(n, args.periods, args.single_repeats, Path(tmp)))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "platform": platform.platform(),
+            "sizes": args.sizes,
+            "periods": args.periods,
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\n✓ Resultados guardados en {args.output}")
+
+    if args.baseline is not None:
+        compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
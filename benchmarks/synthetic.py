@@ -0,0 +1,181 @@
+"""
+Generador de maestros sintéticos (clientes, proveedores, servicios) con las mismas hojas y columnas
+que los Excel de /data, para medir el pipeline a distintas escalas.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from wms_pipeline import MASTER_FILES, _prepare_masters
+
+DEPARTAMENTOS = [
+    "Amazonas", "Ancash", "Apurimac", "Arequipa", "Ayacucho", "Cajamarca", "Callao", "Cusco",
+    "Huancavelica", "Huánuco", "Ica", "Junín", "La Libertad", "Lambayeque", "Lima", "Loreto",
+    "Madre de Dios", "Moquegua", "Pasco", "Piura", "Puno", "San Martín", "Tacna", "Tumbes", "Ucayali",
+]
+CATEGORIAS_SERVICIO = {
+    "Almacenaje": ["Almacenaje", "Picking", "Cross-docking"],
+    "Distribución": ["Distribución", "Última milla", "E-commerce"],
+    "Transporte": ["Carga completa", "Carga consolidada"],
+    "Valor agregado": ["Etiquetado", "Kitting", "Empaque"],
+    "Comercio exterior": ["Aduanas", "Importación"],
+    "IT/Tracking": ["Tracking", "Integración EDI"],
+    "Servicios": ["Limpieza", "Seguridad"],
+    "Tecnología": ["Software WMS", "Soporte"],
+    "Consultoría": ["Procesos", "Auditoría"],
+    "Administrativo": ["Facturación", "Cobranzas"],
+    "Suministros": ["Pallets", "Film"],
+}
+SLA_PLANTILLAS = [
+    "SLA:Disponibilidad>={}%", "SLA:Tiempo de procesamiento <= {}h", "SLA:Entrega en {}h",
+    "SLA:Accuracy>=99.{}%", "SLA:Temp 2-4°C",
+]
+
+
+def _pick(rng: np.random.Generator, values, n: int) -> np.ndarray:
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+def _with_nulls(rng: np.random.Generator, values: np.ndarray, frac: float) -> np.ndarray:
+    values = values.astype(object)
+    values[rng.random(len(values)) < frac] = np.nan
+    return values
+
+def _diccionario(columns: list[str]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Campo": columns,
+        "Descripción": [f"Campo {c}" for c in columns],
+        "Tipo": "TEXTO",
+        "Obligatorio": "SI",
+        "Reglas/Notas": "",
+    })
+
+def make_raw_masters(n_services: int, n_suppliers: int | None = None, n_clients: int | None = None, seed: int = 0) -> dict[str, dict[str, pd.DataFrame]]:
+    """Devuelve las hojas crudas por archivo: {"clientes": {hoja: df}, "proveedores": ..., "servicios": ...}."""
+    rng = np.random.default_rng(seed)
+    n_suppliers = n_suppliers or max(50, n_services)
+    n_clients = n_clients or max(30, n_services // 2)
+
+    cli_ids = np.array([f"CLIE-{i:06d}" for i in range(1, n_clients + 1)], dtype=object)
+    cli = pd.DataFrame({
+        "ClienteID": cli_ids,
+        "TipoCliente": _pick(rng, ["JURIDICA", "NATURAL"], n_clients),
+        "TipoDocumento": _pick(rng, ["RUC", "DNI", "CE"], n_clients),
+        "NroDocumento": rng.integers(10**10, 10**11, n_clients),
+        "NombreCompleto": _with_nulls(rng, np.array([f"Cliente {i}" for i in range(n_clients)], dtype=object), 0.6),
+        "RazonSocial": _with_nulls(rng, np.array([f"Comercial {i} SAC" for i in range(n_clients)], dtype=object), 0.4),
+        "Email": [f"cliente{i}@correo.com" for i in range(n_clients)],
+        "TelefonoMovil": rng.integers(900_000_000, 999_999_999, n_clients),
+        "CanalPreferido": _pick(rng, ["OMNICANAL", "TIENDA", "ONLINE"], n_clients),
+        "Segmento": _pick(rng, ["PREFERENTE", "ESTANDAR", "BASICO"], n_clients),
+        "Departamento": _pick(rng, DEPARTAMENTOS, n_clients),
+        "Provincia": _with_nulls(rng, _pick(rng, ["Lima", "Cusco", "Piura", "Talara"], n_clients), 0.01),
+        "Distrito": _with_nulls(rng, _pick(rng, ["Cercado de Lima", "San Isidro", "Huancayo"], n_clients), 0.01),
+        "DireccionEntrega": [f"Calle Ficticia {i}" for i in range(n_clients)],
+        "Moneda": _with_nulls(rng, _pick(rng, ["PEN", "USD"], n_clients), 0.01),
+        "ListaPrecios": _pick(rng, ["MAYORISTA", "RETAIL", "ECOMMERCE"], n_clients),
+        "CondicionesPago": _pick(rng, ["CREDITO_7D", "CONTADO", "CREDITO_15D", "CREDITO_30D"], n_clients),
+        "LimiteCredito": np.round(rng.uniform(0, 400_000, n_clients), 2),
+        "EstadoCredito": _pick(rng, ["APROBADO", "PENDIENTE", "RECHAZADO"], n_clients),
+        "ZonaDespacho": _with_nulls(rng, _pick(rng, ["NORTE", "CENTRO", "SUR", "ESTE"], n_clients), 0.01),
+    })
+
+    prov_ids = np.array([f"PROV-{i:06d}" for i in range(1, n_suppliers + 1)], dtype=object)
+    ruc = rng.integers(10**10, 10**11, n_suppliers)
+    ruc[rng.random(n_suppliers) < 0.01] //= 10
+    prov = pd.DataFrame({
+        "ProveedorID": prov_ids,
+        "RUC": ruc,
+        "RazonSocial": [f"Proveedor {i} SAC" for i in range(n_suppliers)],
+        "NombreComercial": [f"Proveedor {i}" for i in range(n_suppliers)],
+        "TipoProveedor": _pick(rng, ["NACIONAL", "IMPORTADOR"], n_suppliers),
+        "Categoria": _pick(rng, ["LOGISTICA", "PRODUCTOS", "SERVICIOS"], n_suppliers),
+        "Segmento": _pick(rng, ["SECUNDARIO", "PRIMARIO", "EMERGENCIA"], n_suppliers),
+        "DireccionFiscal": [f"Av. 28 julio {i}" for i in range(n_suppliers)],
+        "CentroDistribucionAsignado": _pick(rng, ["CD-PRINCIPAL", "CD-SECUNDARIO"], n_suppliers),
+        "Pais": _pick(rng, ["Perú", "BRASIL", "CHINA", "EEUU"], n_suppliers),
+        "Departamento": _pick(rng, DEPARTAMENTOS, n_suppliers),
+        "Telefono": rng.integers(900_000_000, 999_999_999, n_suppliers),
+        "Email": [f"contacto{i}@proveedor.com" for i in range(n_suppliers)],
+        "ContactoLogistica": _pick(rng, ["Sofía Pérez", "María Ramírez", "Carlos Pérez"], n_suppliers),
+        "TelefonoContactoLogistica": rng.integers(900_000_000, 999_999_999, n_suppliers),
+        "RegimenFiscal": _pick(rng, ["GENERAL", "MYPE", "RER"], n_suppliers),
+        "RetencionesAplicables": _pick(rng, ["AMBAS", "NINGUNA", "IGV", "RENTA"], n_suppliers),
+        "CertificadoCalidad": _pick(rng, ["NO", "SI"], n_suppliers),
+        "Incoterm": _pick(rng, ["EXW", "DAP", "DDP", "CIF", "FOB"], n_suppliers),
+        "LeadTimePromedioDias": rng.integers(1, 120, n_suppliers),
+        "ToleranciaEntregaDias": rng.integers(0, 6, n_suppliers),
+        "RatingDesempeno": _with_nulls(rng, np.round(rng.uniform(1, 5, n_suppliers), 2), 0.01),
+        "MonedaPrincipal": _pick(rng, ["USD", "PEN"], n_suppliers),
+        "CondicionesPago": _pick(rng, ["90D", "CONTADO", "60D", "30D"], n_suppliers),
+        "DiasPago": _with_nulls(rng, _pick(rng, [15.0, 30.0], n_suppliers), 0.6),
+        "BancoPrincipal": _pick(rng, ["PICHINCHA", "BANCO DE LA NACION", "SCOTIABANK", "BBVA"], n_suppliers),
+        "NumeroCuenta": rng.integers(10**9, 10**10, n_suppliers),
+        "CCI": rng.uniform(1e19, 9e19, n_suppliers),
+        "LimiteCredito": np.round(rng.uniform(0, 100_000, n_suppliers), 2),
+        "EstadoCredito": _pick(rng, ["BLOQUEADO", "APROBADO", "OBSERVADO"], n_suppliers),
+        "FechaAlta": pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 3650, n_suppliers), unit="D"),
+        "Estado": _pick(rng, ["ACTIVO", "INACTIVO", "SUSPENDIDO"], n_suppliers),
+    })
+
+    categorias = _pick(rng, list(CATEGORIAS_SERVICIO), n_services)
+    subcategorias = np.array([CATEGORIAS_SERVICIO[c][i % len(CATEGORIAS_SERVICIO[c])] for i, c in enumerate(categorias)], dtype=object)
+    sla = np.array([
+        t.format(rng.integers(1, 100)) if "{}" in t else t
+        for t in _pick(rng, SLA_PLANTILLAS, n_services)
+    ], dtype=object)
+    lead_min = rng.integers(0, 10, n_services)
+    srv = pd.DataFrame({
+        "ServicioID": [f"SRV-{i:06d}" for i in range(1, n_services + 1)],
+        "NombreServicio": [f"Servicio {i}" for i in range(n_services)],
+        "Categoria": categorias,
+        "Subcategoria": subcategorias,
+        "Descripcion": [f"Descripción del servicio {i}" for i in range(n_services)],
+        "UnidadTarifa": _pick(rng, ["Tarifa por palet/mes", "Tarifa por m3/mes", "Tarifa por operación", "Tarifa por orden"], n_services),
+        "TipoUnidad": _pick(rng, ["PALLET_MONTH", "M3_MONTH", "OPERATION", "ORDER"], n_services),
+        "TarifaBase": _with_nulls(rng, _pick(rng, [15.0, 120.0, 200.0, 260.0, 500.0], n_services), 0.15),
+        "Moneda": _pick(rng, ["PEN", "USD"], n_services),
+        "RequiereCertificacion": _pick(rng, ["NO", "SI"], n_services),
+        "Temperatura": _pick(rng, ["AMBIENTE", "REFRIGERADO", "CONGELADO"], n_services),
+        "LeadTimeMinDias": lead_min,
+        "LeadTimeMaxDias": lead_min + rng.integers(0, 20, n_services),
+        "TiempoEjecucionHoras": _pick(rng, [0, 4, 8, 24, 48, 72], n_services),
+        "CentrosDisponibles": _with_nulls(rng, _pick(rng, ["CD-PRINCIPAL", "CD-PRINCIPAL;CD-NORTE", "CD-PRINCIPAL;CD-SUR"], n_services), 0.08),
+        "ModalidadContrato": _pick(rng, ["CONTRACT", "SPOT/CONTRACT", "SPOT"], n_services),
+        "SLA": sla,
+        "RequisitosCliente": _pick(rng, ["Documentos de ingreso", "Etiquetado y registro de lotes", "Aviso de llegada 24h antes"], n_services),
+        "Estado": "ACTIVO",
+        "FechaAlta": pd.Timestamp("2025-10-08"),
+        "UsuarioAlta": "system",
+        "CantidadPedidoEstandar": _pick(rng, [10, 20, 50, 100, 200, 500], n_services).astype(np.int64),
+        "ClientePropietario": _pick(rng, cli_ids, n_services),
+        "CostoEstandar": np.round(rng.uniform(100, 5000, n_services), 2),
+        "Moneda.1": _pick(rng, ["USD", "PEN"], n_services),
+        "TarifaImpuesto": _pick(rng, [0, 10, 18], n_services).astype(np.int64),
+        "TemperaturaControlada": _pick(rng, ["NO", "SI"], n_services),
+        "CaducidadControlada": _pick(rng, ["NO", "SI"], n_services),
+        "FechaAlta.1": _pick(rng, ["2023-09-25 00:00:00", "2022-08-16 00:00:00", "2024-06-15 00:00:00"], n_services),
+        "UsuarioAlta.1": _pick(rng, ["cgomez", "admin", "jramirez"], n_services),
+        "UltimaActualizacion": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 500, n_services), unit="D"),
+    })
+
+    return {
+        "clientes": {"Maestro de Clientes": cli, "DICCIONARIO": _diccionario(list(cli.columns))},
+        "proveedores": {"Proveedores_data": prov, "DICCIONARIO": _diccionario(list(prov.columns))},
+        "servicios": {"Servicios_data": srv, "DICCIONARIO": _diccionario(list(srv.columns))},
+    }
+
+def make_masters(n_services: int, n_suppliers: int | None = None, n_clients: int | None = None, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """Maestros sintéticos ya normalizados, con la misma forma que devuelve load_masters."""
+    raw = make_raw_masters(n_services, n_suppliers, n_clients, seed)
+    return _prepare_masters(raw["clientes"], raw["proveedores"], raw["servicios"])
+
+def write_master_workbooks(out_dir: Path, n_services: int, n_suppliers: int | None = None, n_clients: int | None = None, seed: int = 0) -> Path:
+    """Escribe maestro_clientes/proveedores/servicios.xlsx sintéticos en out_dir (mismas hojas y columnas)."""
+    out_dir.mkdir(exist_ok=True, parents=True)
+    raw = make_raw_masters(n_services, n_suppliers, n_clients, seed)
+    for key, sheets in raw.items():
+        with pd.ExcelWriter(out_dir / MASTER_FILES[key], engine="openpyxl") as writer:
+            for sheet, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet, index=False)
+    return out_dir
@@ -0,0 +1,38 @@
+"""
+Genera el dataset transaccional directamente a Parquet particionado (ver wms_pipeline.write_dataset_partitions).
+Pensado para horizontes largos (p.ej. snapshots diarios de dos años, --periods 730) que no caben en memoria:
+cada bloque de servicios × periodos se escribe y se libera antes de generar el siguiente.
+Uso: python scripts/export_dataset.py --periods 730 [--output-dir data/.cache/dataset_p730] [--chunk-rows 1000000]
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from wms_pipeline import DATASET_PARTITION_ROWS, load_masters, write_dataset_partitions
+
+DATA_DIR = Path("data")
+
+def main():
+    """Pipeline: carga maestros y escribe las particiones + manifest.json."""
+    parser = argparse.ArgumentParser(description="Exporta el dataset a Parquet particionado")
+    parser.add_argument("--periods", type=int, required=True)
+    parser.add_argument("--output-dir", type=Path, default=None, help="Por defecto data/.cache/dataset_p<periods>")
+    parser.add_argument("--chunk-rows", type=int, default=DATASET_PARTITION_ROWS, help="Filas máximas por archivo")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+    out_dir = args.output_dir or args.data_dir / ".cache" / f"dataset_p{args.periods}"
+
+    masters = load_masters(args.data_dir)
+    t0 = time.perf_counter()
+    write_dataset_partitions(masters, out_dir, args.periods, chunk_rows=args.chunk_rows)
+    elapsed = time.perf_counter() - t0
+
+    manifest = json.loads((out_dir / "manifest.json").read_text(encoding="utf-8"))
+    print(f"✓ {manifest['rows']:,} filas en {len(manifest['parts'])} archivos ({elapsed:.2f} s) → {out_dir}")
+    print(f"  Scoring:       python scripts/score_catalog.py --dataset-dir {out_dir} --output scores.parquet")
+    print(f"  Entrenamiento: rng = np.random.default_rng(0); "
+          f"train_streaming(lambda: iter_dataset_partitions(Path('{out_dir}'), shuffle=rng), Path('models'))")
+
+if __name__ == "__main__":
+    main()
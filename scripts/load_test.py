@@ -0,0 +1,121 @@
+"""
+Prueba de carga local del servicio de scoring (wms_service.py).
+Abre N conexiones keep-alive concurrentes contra /predict y reporta throughput y latencia p50/p99.
+Con --spawn levanta el servicio en un subproceso, por defecto se asume que ya está corriendo.
+Uso: python scripts/load_test.py [--url http://127.0.0.1:8080] [--concurrency 64] [--requests 5000] [--spawn]
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+
+from wms_pipeline import load_masters
+
+DATA_DIR = Path("data")
+
+def _payloads(n: int, seed: int = 0) -> list[bytes]:
+    """Formularios aleatorios sobre ServicioID reales."""
+    rng = np.random.default_rng(seed)
+    ids = load_masters(DATA_DIR)["servicios"]["ServicioID"].astype(str).to_numpy()
+    return [
+        json.dumps({
+            "ServicioID": str(rng.choice(ids)),
+            "stock": int(rng.integers(0, 2000)),
+            "demanda": float(np.round(rng.uniform(0.5, 40), 3)),
+            "dias_rec": int(rng.integers(0, 45)),
+            "rec_pend": int(rng.integers(0, 500)),
+            "horizonte": int(rng.choice([7, 14, 30])),
+        }).encode("utf-8")
+        for _ in range(n)
+    ]
+
+async def _worker(host: str, port: int, payloads: list[bytes], latencies: list[float], errors: list[int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in payloads:
+            request = (
+                f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            t0 = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, payloads: list[bytes], concurrency: int) -> tuple[list[float], list[int], float]:
+    latencies: list[float] = []
+    errors: list[int] = []
+    shards = [payloads[i::concurrency] for i in range(concurrency)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_worker(host, port, shard, latencies, errors) for shard in shards if shard))
+    return latencies, errors, time.perf_counter() - t0
+
+def _wait_ready(url: str, timeout: float = 120.0) -> dict:
+    deadline = time.time() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=2) as resp:
+                return json.loads(resp.read())
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.5)
+
+def main():
+    """Ejecuta warmup + carga y muestra throughput, p50/p99 y tamaño medio de batch."""
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de scoring")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--spawn", action="store_true", help="Levantar wms_service.py en un subproceso")
+    parser.add_argument("--max-batch", type=int, default=256, help="Solo con --spawn")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Solo con --spawn")
+    args = parser.parse_args()
+
+    target = urlparse(args.url)
+    proc = None
+    if args.spawn:
+        proc = subprocess.Popen([
+            sys.executable, "wms_service.py", "--host", target.hostname, "--port", str(target.port),
+            "--max-batch", str(args.max_batch), "--max-wait-ms", str(args.max_wait_ms),
+        ])
+    try:
+        before = _wait_ready(args.url)
+        payloads = _payloads(args.warmup + args.requests)
+        asyncio.run(run_load(target.hostname, target.port, payloads[:args.warmup], args.concurrency))
+        latencies, errors, elapsed = asyncio.run(run_load(target.hostname, target.port, payloads[args.warmup:], args.concurrency))
+        after = _wait_ready(args.url)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    lat_ms = np.array(latencies) * 1000
+    batches = after["batches"] - before["batches"]
+    items = after["solicitudes"] - before["solicitudes"]
+    print(f"Solicitudes:    {len(latencies):,} ({len(errors)} errores) con {args.concurrency} conexiones")
+    print(f"Throughput:     {len(latencies) / elapsed:,.0f} req/s")
+    print(f"Latencia p50:   {np.percentile(lat_ms, 50):.2f} ms")
+    print(f"Latencia p99:   {np.percentile(lat_ms, 99):.2f} ms")
+    print(f"Batch promedio: {items / batches if batches else 0:.1f} solicitudes/predict_proba")
+
+if __name__ == "__main__":
+    main()
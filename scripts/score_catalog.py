@@ -0,0 +1,100 @@
+"""
+Puntúa todo el catálogo (ServicioID × Periodo) con el modelo entrenado y guarda el resultado.
+El formato de salida se deduce de la extensión (.parquet o .csv).
+Con --dataset-dir lee las particiones de scripts/export_dataset.py por lotes y escribe el resultado
+en streaming, sin cargar el dataset completo en memoria.
+Uso: python scripts/score_catalog.py --output scores.parquet [--horizonte 14] [--periods 12] [--chunk-size 100000]
+     python scripts/score_catalog.py --output scores.parquet --dataset-dir data/.cache/dataset_p730
+"""
+import argparse
+import time
+from pathlib import Path
+
+import joblib
+
+from wms_pipeline import (
+    FEATURE_COLS, HORIZONS, load_masters, build_dataset, model_filename, predict_batch,
+    iter_dataset_partitions, score_chunks,
+)
+from wms_artifact import artifact_dirname, load_artifact
+from wms_monitoring import REFERENCE_FILENAME, DriftMonitor
+
+DATA_DIR = Path("data")
+MODELS_DIR = Path("models")
+
+def _report_drift(monitor: DriftMonitor | None) -> None:
+    """Imprime las features con mayor PSI respecto del entrenamiento y si conviene reentrenar."""
+    if monitor is None:
+        return
+    status = monitor.status()
+    print(f"\n=== DRIFT VS ENTRENAMIENTO (ventana de {status.attrs['filas_ventana']:,} filas) ===")
+    print(status[["feature", "tipo", "psi", "ks", "nivel"]].head(8).to_string(index=False))
+    drifted = status.loc[status["nivel"] == "drift", "feature"].tolist()
+    print(f"Reentrenar: {'sí (' + ', '.join(drifted) + ')' if drifted else 'no'}")
+
+def main():
+    """Pipeline: carga maestros, genera dataset, puntúa en batch y escribe Parquet/CSV."""
+    parser = argparse.ArgumentParser(description="Scoring batch del catálogo de servicios")
+    parser.add_argument("--output", type=Path, required=True, help="Archivo destino (.parquet o .csv)")
+    parser.add_argument("--periods", type=int, default=12)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--horizonte", type=int, choices=HORIZONS, default=14, help="Horizonte (días) del modelo a usar")
+    parser.add_argument("--model", type=Path, default=None,
+                        help="Archivo .joblib o carpeta de artefacto; por defecto models/stockout{horizonte}d_logreg.joblib (o el artefacto si no existe)")
+    parser.add_argument("--dataset-dir", type=Path, default=None, help="Particiones Parquet de export_dataset.py (ignora --periods)")
+    args = parser.parse_args()
+    if args.model is None:
+        # joblib.load es más rápido que rearmar el Pipeline desde el artefacto (bench_artifact).
+        path = MODELS_DIR / model_filename(args.horizonte)
+        args.model = path if path.exists() else MODELS_DIR / artifact_dirname(args.horizonte)
+
+    suffix = args.output.suffix.lower()
+    if suffix not in (".parquet", ".csv"):
+        parser.error("--output debe terminar en .parquet o .csv")
+    if not args.model.exists():
+        parser.error(f"No existe {args.model}. Ejecuta primero scripts/train_model.py")
+    reference = MODELS_DIR / REFERENCE_FILENAME
+    monitor = DriftMonitor.from_path(reference) if reference.exists() else None
+
+    if args.dataset_dir is not None:
+        model = load_artifact(args.model) if args.model.is_dir() else joblib.load(args.model)
+        print(f"=== PUNTUANDO PARTICIONES DE {args.dataset_dir} ===")
+        t0 = time.perf_counter()
+        chunks = iter_dataset_partitions(args.dataset_dir, columns=FEATURE_COLS + ["ServicioID"], batch_rows=args.chunk_size)
+        counts = score_chunks(model, chunks, args.output, monitor=monitor)
+        elapsed = time.perf_counter() - t0
+        n_rows = sum(counts.values())
+        print(f"Tiempo de scoring: {elapsed:.3f} s ({n_rows:,} filas, {n_rows / elapsed:,.0f} filas/s)")
+        print(f"Distribución de riesgo: {counts}")
+        _report_drift(monitor)
+        print(f"\n✓ Resultados guardados en {args.output}")
+        return
+
+    print("=== CARGANDO MAESTROS Y MODELO ===")
+    masters = load_masters(args.data_dir)
+    model = load_artifact(args.model) if args.model.is_dir() else joblib.load(args.model)
+    dataset = build_dataset(masters, periods=args.periods)
+    print(f"Registros a puntuar: {len(dataset):,}")
+
+    print("\n=== PUNTUANDO ===")
+    t0 = time.perf_counter()
+    scores = predict_batch(model, dataset, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - t0
+
+    out = dataset[["ServicioID", "Periodo"]].join(scores)
+    args.output.parent.mkdir(exist_ok=True, parents=True)
+    if suffix == ".parquet":
+        out.to_parquet(args.output, index=False)
+    else:
+        out.to_csv(args.output, index=False)
+
+    print(f"Tiempo de scoring: {elapsed:.3f} s ({len(out) / elapsed:,.0f} filas/s)")
+    print(f"Distribución de riesgo: {out['riesgo'].value_counts().to_dict()}")
+    if monitor is not None:
+        monitor.update(dataset)
+        _report_drift(monitor)
+    print(f"\n✓ Resultados guardados en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,26 @@
 """
-Entrena modelo predictivo de rotura de stock (Stockout14d).
-Genera dataset, entrena Regresión Logística, guarda modelo y métricas.
-Uso: python scripts/train_model.py
+Entrena los modelos predictivos de rotura de stock (Stockout7d, Stockout14d, Stockout30d).
+Genera dataset, entrena una Regresión Logística por horizonte, guarda modelos y métricas.
+Uso: python scripts/train_model.py [--force]
 """
+import argparse
 from pathlib import Path
 import pandas as pd
-from wms_pipeline import load_masters, build_dataset, train_or_load_model, quality_checks
+from wms_pipeline import (
+    HORIZONS, load_masters, build_dataset, train_or_load_models, quality_checks, export_scorer,
+    target_col, model_filename, metrics_filename,
+)
+from wms_artifact import artifact_dirname
 
 DATA_DIR = Path("data")
 MODELS_DIR = Path("models")
 
 def main():
-    """Pipeline: carga maestros, EDA, genera dataset, entrena modelo."""
+    """Pipeline: carga maestros, EDA, genera dataset, entrena modelos."""
+    parser = argparse.ArgumentParser(description="Entrenamiento de los modelos Stockout7d/14d/30d")
+    parser.add_argument("--force", action="store_true", help="Reentrenar aunque exista una versión con la misma huella")
+    args = parser.parse_args()
+
     print("=== CARGANDO MAESTROS ===")
     masters = load_masters(DATA_DIR)
     
@@ -23,13 +32,20 @@ def main():
     print("\n=== GENERANDO DATASET TRANSACCIONAL ===")
     dataset = build_dataset(masters, periods=12)
     print(f"Registros generados: {len(dataset)}")
-    print(f"Distribución target Stockout14d:\n{dataset['Stockout14d'].value_counts().to_dict()}")
+    for h in HORIZONS:
+        print(f"Distribución target {target_col(h)}: {dataset[target_col(h)].value_counts().to_dict()}")
     
-    print("\n=== ENTRENANDO MODELO ===")
-    train_or_load_model(dataset, MODELS_DIR)
-    print("\n✓ Modelo y métricas guardados en /models")
-    print("  - stockout14d_logreg.joblib")
-    print("  - metrics.json")
+    print("\n=== ENTRENANDO MODELOS ===")
+    models, metrics = train_or_load_models(dataset, MODELS_DIR, force_retrain=args.force)
+    for h in HORIZONS:
+        export_scorer(models[h], MODELS_DIR / f"stockout{h}d_scorer.json")
+        print(f"  {h:>2} días: accuracy {metrics[h]['accuracy']:.3f}, ROC-AUC {metrics[h]['roc_auc']:.3f}, recall {metrics[h]['recall_pos']:.3f}")
+    if metrics[14]["cached"]:
+        print(f"Modelos reutilizados del registro (huella {metrics[14]['fingerprint'][:12]}). Usa --force para reentrenar.")
+    print("\n✓ Modelos y métricas guardados en /models")
+    for h in HORIZONS:
+        print(f"  - {model_filename(h)} + {artifact_dirname(h)}/ + {metrics_filename(h)}")
+    print("  - stockout{7,14,30}d_scorer.json (runtime NumPy, ver wms_scorer.py)")
 
 if __name__ == "__main__":
     main()
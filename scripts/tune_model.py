@@ -0,0 +1,143 @@
+"""
+Búsqueda de hiperparámetros y familias de modelo con validación cruzada GroupKFold por ServicioID.
+El preprocesamiento se ajusta una sola vez por fold y se reutiliza para todos los candidatos; los
+ajustes (candidato × fold) se reparten en un pool de procesos (joblib/loky) con todos los núcleos.
+Guarda la mejor configuración y los tiempos en models/best_config.json.
+Uso: python scripts/tune_model.py [--folds 5] [--periods 12] [--n-jobs -1]
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import average_precision_score, roc_auc_score
+from sklearn.model_selection import GroupKFold
+
+from wms_pipeline import FEATURE_COLS, MODEL_PARAMS, load_masters, build_dataset, _build_pipeline
+
+DATA_DIR = Path("data")
+MODELS_DIR = Path("models")
+
+ESTIMATORS = {
+    "LogisticRegression": LogisticRegression,
+    "SGDClassifier": SGDClassifier,
+    "HistGradientBoostingClassifier": HistGradientBoostingClassifier,
+}
+
+def candidate_grid() -> list[dict]:
+    """Grilla de candidatos: {"estimator": nombre, "params": {...}}."""
+    grid = []
+    for C in [0.05, 0.1, 0.5, 1.0, 2.0, 5.0]:
+        for cw in [None, "balanced"]:
+            grid.append({"estimator": "LogisticRegression", "params": {**MODEL_PARAMS, "C": C, "class_weight": cw}})
+    for alpha in [1e-5, 1e-4, 1e-3]:
+        for cw in [None, "balanced"]:
+            grid.append({"estimator": "SGDClassifier", "params": {"loss": "log_loss", "alpha": alpha, "class_weight": cw, "max_iter": 1000, "random_state": 42}})
+    for lr in [0.05, 0.1]:
+        for cw in [None, "balanced"]:
+            grid.append({"estimator": "HistGradientBoostingClassifier", "params": {"learning_rate": lr, "max_iter": 200, "class_weight": cw, "random_state": 42}})
+    return grid
+
+def _prepare_fold(X, y, train_idx, test_idx) -> dict:
+    """Ajusta el preprocesamiento en el train del fold y transforma train/test una sola vez."""
+    preprocess = clone(_build_pipeline(X).named_steps["preprocess"])
+    Xtr = preprocess.fit_transform(X.iloc[train_idx])
+    Xte = preprocess.transform(X.iloc[test_idx])
+    return {"Xtr": Xtr, "ytr": y[train_idx], "Xte": Xte, "yte": y[test_idx]}
+
+def _fit_candidate(cand_id: int, cand: dict, fold_id: int, fold: dict) -> dict:
+    """Entrena un candidato en un fold ya preprocesado y devuelve métricas y tiempo de ajuste."""
+    Xtr, Xte = fold["Xtr"], fold["Xte"]
+    if cand["estimator"] == "HistGradientBoostingClassifier":
+        Xtr, Xte = Xtr.toarray(), Xte.toarray()
+    clf = ESTIMATORS[cand["estimator"]](**cand["params"])
+    t0 = time.perf_counter()
+    clf.fit(Xtr, fold["ytr"])
+    fit_seconds = time.perf_counter() - t0
+    proba = clf.predict_proba(Xte)[:, 1]
+    return {
+        "candidate": cand_id,
+        "fold": fold_id,
+        "fit_seconds": fit_seconds,
+        "roc_auc": float(roc_auc_score(fold["yte"], proba)),
+        "average_precision": float(average_precision_score(fold["yte"], proba)),
+    }
+
+def main():
+    """Pipeline: genera dataset, prepara folds, evalúa la grilla en paralelo y guarda la mejor configuración."""
+    parser = argparse.ArgumentParser(description="Búsqueda de hiperparámetros con GroupKFold por ServicioID")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--periods", type=int, default=12)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--output", type=Path, default=MODELS_DIR / "best_config.json")
+    args = parser.parse_args()
+
+    t_start = time.perf_counter()
+    print("=== GENERANDO DATASET ===")
+    dataset = build_dataset(load_masters(DATA_DIR), periods=args.periods)
+    X = dataset[FEATURE_COLS]
+    y = dataset["Stockout14d"].to_numpy()
+    groups = dataset["ServicioID"].astype(str).to_numpy()
+    print(f"Registros: {len(dataset):,} | Servicios: {len(np.unique(groups)):,}")
+
+    print(f"\n=== PREPROCESANDO {args.folds} FOLDS (una vez por fold) ===")
+    t0 = time.perf_counter()
+    splits = list(GroupKFold(n_splits=args.folds).split(X, y, groups=groups))
+    folds = Parallel(n_jobs=args.n_jobs)(delayed(_prepare_fold)(X, y, tr, te) for tr, te in splits)
+    prep_seconds = time.perf_counter() - t0
+
+    grid = candidate_grid()
+    n_jobs = os.cpu_count() if args.n_jobs == -1 else args.n_jobs
+    print(f"\n=== EVALUANDO {len(grid)} CANDIDATOS × {args.folds} FOLDS ({n_jobs} procesos) ===")
+    t0 = time.perf_counter()
+    results = Parallel(n_jobs=args.n_jobs, backend="loky")(
+        delayed(_fit_candidate)(i, cand, f, fold)
+        for i, cand in enumerate(grid)
+        for f, fold in enumerate(folds)
+    )
+    search_seconds = time.perf_counter() - t0
+
+    summary = []
+    for i, cand in enumerate(grid):
+        rows = [r for r in results if r["candidate"] == i]
+        auc = np.array([r["roc_auc"] for r in rows])
+        summary.append({
+            **cand,
+            "roc_auc_mean": float(auc.mean()),
+            "roc_auc_std": float(auc.std()),
+            "average_precision_mean": float(np.mean([r["average_precision"] for r in rows])),
+            "fit_seconds_total": float(sum(r["fit_seconds"] for r in rows)),
+            "fit_seconds_per_fold": [r["fit_seconds"] for r in sorted(rows, key=lambda r: r["fold"])],
+        })
+    summary.sort(key=lambda r: r["roc_auc_mean"], reverse=True)
+    best = summary[0]
+
+    report = {
+        "best": {"estimator": best["estimator"], "params": best["params"], "roc_auc_mean": best["roc_auc_mean"], "roc_auc_std": best["roc_auc_std"]},
+        "cv": {"splitter": "GroupKFold", "groups": "ServicioID", "n_splits": args.folds, "periods": args.periods, "rows": len(dataset)},
+        "timing": {
+            "wall_seconds": time.perf_counter() - t_start,
+            "preprocess_seconds": prep_seconds,
+            "search_seconds": search_seconds,
+            "n_jobs": n_jobs,
+        },
+        "candidates": summary,
+    }
+    args.output.parent.mkdir(exist_ok=True, parents=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"\n{'estimador':<32} {'params':<48} {'AUC':>7} {'±':>6} {'fit (s)':>8}")
+    for r in summary[:10]:
+        params = {k: v for k, v in r["params"].items() if k in ("C", "alpha", "learning_rate", "class_weight")}
+        print(f"{r['estimator']:<32} {str(params):<48} {r['roc_auc_mean']:>7.4f} {r['roc_auc_std']:>6.4f} {r['fit_seconds_total']:>8.2f}")
+    print(f"\nTiempo total: {report['timing']['wall_seconds']:.1f} s (búsqueda {search_seconds:.1f} s)")
+    print(f"✓ Mejor configuración guardada en {args.output}")
+
+if __name__ == "__main__":
+    main()
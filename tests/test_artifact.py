@@ -0,0 +1,34 @@
+"""Formato de artefacto (wms_artifact): paridad con el .joblib y reemplazo sin tocar modelos ya cargados."""
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from wms_pipeline import FEATURE_COLS, build_dataset, model_filename
+from wms_artifact import copy_artifact, load_artifact, save_artifact
+from benchmarks.synthetic import make_masters
+
+MODELS_DIR = Path(__file__).resolve().parents[1] / "models"
+
+
+def test_paridad_con_joblib(tmp_path):
+    model = joblib.load(MODELS_DIR / model_filename(14))
+    X = build_dataset(make_masters(200, seed=11), periods=3)[FEATURE_COLS]
+    loaded = load_artifact(save_artifact(model, tmp_path / "a"))
+    np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+
+
+def test_reemplazo_no_modifica_modelo_cargado(tmp_path):
+    m14 = joblib.load(MODELS_DIR / model_filename(14))
+    m7 = joblib.load(MODELS_DIR / model_filename(7))
+    loaded = load_artifact(save_artifact(m14, tmp_path / "a"))
+    assert isinstance(loaded.named_steps["clf"].coef_, np.memmap)
+    before = loaded.named_steps["clf"].coef_.copy()
+
+    copy_artifact(save_artifact(m7, tmp_path / "b"), tmp_path / "a")
+    np.testing.assert_array_equal(loaded.named_steps["clf"].coef_, before)
+    save_artifact(m7, tmp_path / "a")
+    np.testing.assert_array_equal(loaded.named_steps["clf"].coef_, before)
+
+    np.testing.assert_array_equal(load_artifact(tmp_path / "a").named_steps["clf"].coef_, m7.named_steps["clf"].coef_)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a", "b"]
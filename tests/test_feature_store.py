@@ -0,0 +1,28 @@
+"""FeatureStore: paridad con el dataset y reconstrucción sin afectar stores ya abiertos."""
+import numpy as np
+import pandas as pd
+
+from wms_pipeline import FEATURE_COLS, build_dataset
+from wms_feature_store import FeatureStore
+from benchmarks.synthetic import make_masters
+
+
+def test_take_coincide_con_dataset(tmp_path):
+    ds = build_dataset(make_masters(100, seed=4), periods=4)
+    store = FeatureStore.write(ds, tmp_path / "store")
+    got = store.frame([("SRV-000007", 3), ("SRV-000001", 1)])
+    exp = ds.set_index(["ServicioID", "Periodo"]).loc[[("SRV-000007", 3), ("SRV-000001", 1)]].reset_index()[FEATURE_COLS]
+    pd.testing.assert_frame_equal(got.astype(object), exp.astype(object), check_dtype=False)
+
+
+def test_reescritura_no_modifica_store_abierto(tmp_path):
+    ds_a = build_dataset(make_masters(100, seed=4), periods=4)
+    ds_b = build_dataset(make_masters(150, seed=9), periods=6)
+    store = FeatureStore.write(ds_a, tmp_path / "store")
+    before = store.take(np.arange(len(store)))
+
+    rebuilt = FeatureStore.write(ds_b, tmp_path / "store")
+    pd.testing.assert_frame_equal(store.take(np.arange(len(store))), before)
+    assert len(store) == len(ds_a) and len(rebuilt) == len(ds_b)
+    assert FeatureStore(tmp_path / "store").periodos == list(range(1, 7))
+    assert [p.name for p in tmp_path.iterdir()] == ["store"]
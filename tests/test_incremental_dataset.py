@@ -0,0 +1,62 @@
+"""build_dataset_incremental debe devolver lo mismo que build_dataset en cada escenario."""
+import pandas as pd
+import pytest
+
+from wms_pipeline import DATASET_STATE_FILE, build_dataset, build_dataset_incremental
+from benchmarks.synthetic import make_masters
+
+
+@pytest.fixture(scope="module")
+def masters():
+    return make_masters(300, seed=3)
+
+
+def _check(masters, periods, state_dir):
+    pd.testing.assert_frame_equal(build_dataset_incremental(masters, periods, state_dir), build_dataset(masters, periods=periods))
+
+
+def test_sin_estado_y_sin_cambios(masters, tmp_path):
+    _check(masters, 12, tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == [DATASET_STATE_FILE]
+    _check(masters, 12, tmp_path)
+
+
+def test_cambio_de_periodos(masters, tmp_path):
+    _check(masters, 12, tmp_path)
+    _check(masters, 13, tmp_path)
+    _check(masters, 6, tmp_path)
+    _check(masters, 9, tmp_path)
+
+
+def test_maestros_modificados(masters, tmp_path):
+    _check(masters, 12, tmp_path)
+
+    srv = masters["servicios"].copy()
+    srv.loc[srv.index[::50], "CantidadPedidoEstandar"] = srv.loc[srv.index[::50], "CantidadPedidoEstandar"] * 2
+    changed = {**masters, "servicios": srv}
+    _check(changed, 12, tmp_path)
+
+    prov = masters["proveedores"].copy()
+    prov.loc[prov.index[:3], "RatingDesempeno"] = 5.0
+    _check({**changed, "proveedores": prov}, 12, tmp_path)
+
+    nuevos = srv.tail(5).copy()
+    nuevos["ServicioID"] = nuevos["ServicioID"].astype(str) + "-N"
+    _check({**changed, "servicios": pd.concat([srv.iloc[10:], nuevos])}, 12, tmp_path)
+
+
+def test_estado_corrupto(masters, tmp_path):
+    _check(masters, 12, tmp_path)
+    (tmp_path / DATASET_STATE_FILE).write_bytes(b"")
+    _check(masters, 12, tmp_path)
+    pd.to_pickle({"version": "otra"}, tmp_path / DATASET_STATE_FILE)
+    _check(masters, 12, tmp_path)
+
+
+def test_estado_de_otros_periodos_no_se_devuelve(masters, tmp_path):
+    _check(masters, 12, tmp_path)
+    state = pd.read_pickle(tmp_path / DATASET_STATE_FILE)
+    state["periods"] = 10
+    pd.to_pickle(state, tmp_path / DATASET_STATE_FILE)
+    _check(masters, 12, tmp_path)
+    _check(masters, 10, tmp_path)
@@ -0,0 +1,29 @@
+"""La cache Parquet de load_masters no debe romper la carga cuando un maestro no se puede escribir."""
+import pandas as pd
+import pytest
+
+import wms_pipeline
+from wms_pipeline import MASTER_FILES, load_masters
+from benchmarks.synthetic import make_masters
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    masters = make_masters(50, seed=1)
+    # Hoja DICCIONARIO con números y textos en la misma columna: pyarrow no la puede escribir.
+    masters["dicc_servicios"] = pd.DataFrame({"Campo": ["ServicioID", 2], "Descripcion": ["id", "n"]})
+    monkeypatch.setattr(wms_pipeline, "_read_masters_excel", lambda _: {k: v.copy() for k, v in masters.items()})
+    for fname in MASTER_FILES.values():
+        (tmp_path / fname).write_bytes(b"xlsx")
+    return tmp_path
+
+
+def test_cache_no_escribible_devuelve_maestros(data_dir):
+    with pytest.warns(RuntimeWarning, match="cache de maestros"):
+        masters = load_masters(data_dir)
+    assert masters["dicc_servicios"]["Campo"].tolist() == ["ServicioID", 2]
+    assert not (data_dir / ".cache" / "manifest.json").exists()
+
+    with pytest.warns(RuntimeWarning):
+        again = load_masters(data_dir)
+    pd.testing.assert_frame_equal(again["servicios"], masters["servicios"])
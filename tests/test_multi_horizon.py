@@ -0,0 +1,17 @@
+"""_fit_and_evaluate_horizons frente al entrenamiento por horizonte."""
+import numpy as np
+
+from wms_pipeline import FEATURE_COLS, _fit_and_evaluate_horizons, build_dataset
+from benchmarks.synthetic import make_masters
+
+
+def test_preprocess_independiente_por_horizonte():
+    ds = build_dataset(make_masters(300, seed=6), periods=12)
+    models = _fit_and_evaluate_horizons(ds, horizons=(7, 14), n_jobs=1)
+    pipe7, pipe14 = models[7][0], models[14][0]
+    assert pipe7.named_steps["preprocess"] is not pipe14.named_steps["preprocess"]
+
+    X = ds[FEATURE_COLS].head(50)
+    before = pipe14.predict_proba(X)
+    pipe7.named_steps["preprocess"].named_transformers_["num"].named_steps["scaler"].mean_ += 1.0
+    np.testing.assert_array_equal(pipe14.predict_proba(X), before)
@@ -0,0 +1,40 @@
+"""Parseo de SLA (horas / %) y del número de ServicioID con _extract_number."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from wms_pipeline import SLA_HOURS_PATTERN, SLA_PCT_PATTERN, FIRST_NUMBER_PATTERN, _extract_number
+
+CASOS_SLA = {
+    "SLA:Tiempo de procesamiento <= 4h": (4.0, np.nan),
+    "SLA:Preparación 48h": (48.0, np.nan),
+    "SLA:Reportes en 24H": (24.0, np.nan),
+    "SLA:Accuracy>=99.5%": (np.nan, 99.5),
+    "SLA:Disponibilidad 98%": (np.nan, 98.0),
+    "SLA:Temp 2-4°C": (np.nan, np.nan),
+    "SLA:Layout optimizado": (np.nan, np.nan),
+}
+CASOS_ID = {"SRV-0001": 1, "SRV-0200": 200, "SRV-123456": 123456, "SIN-NUMERO": np.nan}
+
+
+@pytest.mark.parametrize("dtype", [object, "category"])
+def test_sla(dtype):
+    # Los literales previos ("\\d") nunca hacían match: todo quedaba en NaN.
+    sla = pd.Series(list(CASOS_SLA) + [np.nan], dtype=object).astype(dtype)
+    esperado = np.array(list(CASOS_SLA.values()) + [(np.nan, np.nan)])
+    np.testing.assert_array_equal(_extract_number(sla, SLA_HOURS_PATTERN, lower=True).to_numpy(), esperado[:, 0])
+    np.testing.assert_array_equal(_extract_number(sla, SLA_PCT_PATTERN).to_numpy(), esperado[:, 1])
+
+
+@pytest.mark.parametrize("dtype", [object, "category"])
+def test_servicio_id(dtype):
+    ids = pd.Series(list(CASOS_ID) * 2).astype(dtype)
+    esperado = np.array(list(CASOS_ID.values()) * 2, dtype=float)
+    np.testing.assert_array_equal(_extract_number(ids, FIRST_NUMBER_PATTERN).to_numpy(), esperado)
+
+
+def test_conserva_indice():
+    sla = pd.Series(["SLA:Preparación 48h", "SLA:Accuracy>=99.5%"], index=[10, 3])
+    out = _extract_number(sla, SLA_HOURS_PATTERN, lower=True)
+    assert out.index.tolist() == [10, 3]
+    assert out.loc[10] == 48.0 and np.isnan(out.loc[3])
@@ -0,0 +1,29 @@
+"""Validación de formularios de ScoringModel.parse."""
+import pytest
+
+from wms_pipeline import build_dataset
+from wms_feature_store import FeatureStore
+from wms_service import ScoringModel
+from benchmarks.synthetic import make_masters
+
+FORM = {"ServicioID": "SRV-000001", "stock": 50, "demanda": 3.2, "dias_rec": 10, "rec_pend": 0, "periodo": 3}
+
+
+@pytest.fixture(scope="module")
+def scoring(tmp_path_factory):
+    ds = build_dataset(make_masters(20, seed=4), periods=4)
+    return ScoringModel({14: None}, FeatureStore.write(ds, tmp_path_factory.mktemp("store") / "store"))
+
+
+def test_enteros_exactos(scoring):
+    parsed = scoring.parse({**FORM, "stock": 12.0, "dias_rec": "7", "periodo": 3.0})
+    assert (parsed["StockActual"], parsed["DiasHastaRecepcion"]) == (12, 7)
+    assert parsed["_pos"] == scoring.parse(FORM)["_pos"]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("stock", 12.9), ("dias_rec", "3.5"), ("rec_pend", True), ("stock", 2**40), ("periodo", 3.7), ("periodo", "2.5"),
+])
+def test_rechaza_no_enteros(scoring, field, value):
+    with pytest.raises(ValueError):
+        scoring.parse({**FORM, field: value})
@@ -0,0 +1,51 @@
+"""Estadísticas de train_streaming frente al ajuste en memoria de scikit-learn."""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from wms_pipeline import (
+    FEATURE_COLS, _StreamStats, _build_pipeline, _median_from_counts, build_dataset, iter_dataset_partitions,
+    stream_model_filenames, write_dataset_partitions,
+)
+from benchmarks.synthetic import make_masters
+
+
+def test_median_from_counts():
+    assert _median_from_counts(pd.Series({1.0: 2, 5.0: 1})) == 1.0
+    assert _median_from_counts(pd.Series({1.0: 1, 5.0: 1})) == 3.0
+    assert np.isnan(_median_from_counts(pd.Series(dtype=float)))
+
+
+def test_preprocess_con_columna_sin_valores():
+    X = build_dataset(make_masters(200, seed=5), periods=6)[FEATURE_COLS].copy()
+    X["LeadTimeMinDias"] = np.nan
+    stats = _StreamStats()
+    for start in range(0, len(X), 250):
+        stats.update(X.iloc[start:start + 250])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        expected = _build_pipeline(X).named_steps["preprocess"].fit(X).transform(X)
+        got = stats.preprocess().transform(X)
+    assert got.shape == expected.shape
+    assert np.abs(got.toarray() - expected.toarray()).max() < 1e-9
+
+
+def test_stream_model_filenames():
+    assert stream_model_filenames("Stockout14d") == ("stockout14d_sgd_stream.joblib", "metrics_stream.json")
+    assert stream_model_filenames("Stockout7d") == ("stockout7d_sgd_stream.joblib", "metrics_stream_stockout7d.json")
+
+
+def test_particiones_mezclan_periodos(tmp_path):
+    masters = make_masters(100, seed=2)
+    write_dataset_partitions(masters, tmp_path, periods=12, chunk_rows=300)
+    chunks = list(iter_dataset_partitions(tmp_path))
+    assert len(chunks) == 4
+    assert all(sorted(c["Periodo"].unique()) == list(range(1, 13)) for c in chunks)
+
+    key = ["ServicioID", "Periodo"]
+    expected = build_dataset(masters, periods=12).sort_values(key).reset_index(drop=True)
+    rng = np.random.default_rng(0)
+    for _ in range(2):
+        got = pd.concat(iter_dataset_partitions(tmp_path, shuffle=rng), ignore_index=True)
+        pd.testing.assert_frame_equal(got.sort_values(key).reset_index(drop=True), expected, check_dtype=False, check_categorical=False)
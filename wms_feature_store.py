@@ -0,0 +1,157 @@
+"""
+Feature store persistente y memory-mapped para predicciones de formulario.
+Guarda las FEATURE_COLS de cada (ServicioID, Periodo) del dataset en matrices .npy (numéricas en
+float64, categóricas como códigos int32 + vocabulario JSON), con un índice denso servicio × periodo
+para acceso O(1). Así una predicción solo necesita los cuatro inputs operativos.
+Cada build se escribe en una carpeta temporal y se instala con wms_artifact.install_dir: los stores ya
+abiertos (app, servicio HTTP) conservan sus mmaps sobre los archivos anteriores en lugar de leer los
+arrays nuevos con el manifest viejo.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from wms_pipeline import (
+    FEATURE_COLS, MASTERS_CACHE_VERSION, DATASET_STATE_VERSION,
+    load_masters, masters_signature, build_dataset,
+)
+from wms_artifact import install_dir
+
+FEATURE_STORE_VERSION = 1
+
+
+class FeatureStore:
+    """Lectura de features por (ServicioID, Periodo) sobre arrays memory-mapped."""
+
+    def __init__(self, store_dir: Path):
+        manifest = json.loads((store_dir / "manifest.json").read_text(encoding="utf-8"))
+        self.store_dir = store_dir
+        self.manifest = manifest
+        self.numeric_cols: list[str] = manifest["numeric_cols"]
+        self.numeric_dtypes: list[str] = manifest["numeric_dtypes"]
+        self.categorical_cols: list[str] = manifest["categorical_cols"]
+        self.categories: list[list[str]] = manifest["categories"]
+        self.servicios: list[str] = manifest["servicios"]
+        self.periodos: list[int] = manifest["periodos"]
+
+        self._numeric = np.load(store_dir / "numeric.npy", mmap_mode="r")
+        self._codes = np.load(store_dir / "codes.npy", mmap_mode="r")
+        self._row_index = np.load(store_dir / "row_index.npy", mmap_mode="r")
+        self._srv_pos = {sid: i for i, sid in enumerate(self.servicios)}
+        self._per_pos = {p: j for j, p in enumerate(self.periodos)}
+        self._cat_values = [np.asarray(cats + [np.nan], dtype=object) for cats in self.categories]
+
+    @staticmethod
+    def write(dataset: pd.DataFrame, store_dir: Path, signature: str = "") -> "FeatureStore":
+        """Persiste las FEATURE_COLS de dataset en store_dir (reemplazo completo de la carpeta) y devuelve el store abierto."""
+        store_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp = store_dir.with_name(f".{store_dir.name}.tmp-{os.getpid()}-{time.time_ns()}")
+        tmp.mkdir()
+        X = dataset[FEATURE_COLS]
+        numeric_cols = X.select_dtypes(include=["number"]).columns.tolist()
+        categorical_cols = [c for c in FEATURE_COLS if c not in numeric_cols]
+
+        numeric = np.empty((len(X), len(numeric_cols)), dtype=np.float64)
+        for j, col in enumerate(numeric_cols):
+            numeric[:, j] = X[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = np.empty((len(X), len(categorical_cols)), dtype=np.int32)
+        categories = []
+        for j, col in enumerate(categorical_cols):
+            cat = X[col].astype(object).astype("category").cat
+            codes[:, j] = cat.codes
+            categories.append([str(c) for c in cat.categories])
+
+        srv_cat = dataset["ServicioID"].astype(str).astype("category").cat
+        per_codes, periodos = pd.factorize(dataset["Periodo"].astype(int), sort=True)
+        row_index = np.full((len(srv_cat.categories), len(periodos)), -1, dtype=np.int64)
+        row_index[srv_cat.codes, per_codes] = np.arange(len(dataset))
+
+        np.save(tmp / "numeric.npy", numeric)
+        np.save(tmp / "codes.npy", codes)
+        np.save(tmp / "row_index.npy", row_index)
+        manifest = {
+            "version": FEATURE_STORE_VERSION,
+            "pipeline": [MASTERS_CACHE_VERSION, DATASET_STATE_VERSION],
+            "signature": signature,
+            "numeric_cols": numeric_cols,
+            "numeric_dtypes": [str(X[c].dtype) for c in numeric_cols],
+            "categorical_cols": categorical_cols,
+            "categories": categories,
+            "servicios": [str(s) for s in srv_cat.categories],
+            "periodos": [int(p) for p in periodos],
+        }
+        (tmp / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        return FeatureStore(install_dir(tmp, store_dir))
+
+    def __len__(self) -> int:
+        return len(self._numeric)
+
+    def __contains__(self, servicio_id: str) -> bool:
+        return str(servicio_id) in self._srv_pos
+
+    def row_position(self, servicio_id: str, periodo: int) -> int:
+        """Posición de la fila (ServicioID, Periodo); KeyError si no existe."""
+        try:
+            pos = int(self._row_index[self._srv_pos[str(servicio_id)], self._per_pos[int(periodo)]])
+        except KeyError:
+            pos = -1
+        if pos < 0:
+            raise KeyError(f"No hay features para ({servicio_id}, {periodo})")
+        return pos
+
+    def get(self, servicio_id: str, periodo: int) -> dict:
+        """Features de un (ServicioID, Periodo) como dict {columna: valor}, listo para predict_from_form."""
+        pos = self.row_position(servicio_id, periodo)
+        row = {}
+        for col, dtype, value in zip(self.numeric_cols, self.numeric_dtypes, self._numeric[pos].tolist()):
+            row[col] = int(value) if dtype.startswith("int") else value
+        for col, values, code in zip(self.categorical_cols, self._cat_values, self._codes[pos].tolist()):
+            row[col] = values[code]
+        return row
+
+    def frame(self, keys: list[tuple[str, int]]) -> pd.DataFrame:
+        """Features de varios (ServicioID, Periodo) como DataFrame en orden FEATURE_COLS."""
+        return self.take(np.fromiter((self.row_position(s, p) for s, p in keys), dtype=np.int64, count=len(keys)))
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """Features de las filas en positions (ver row_position) con un solo gather por matriz."""
+        numeric = self._numeric[positions]
+        codes = self._codes[positions]
+        cols = {}
+        for j, (col, dtype) in enumerate(zip(self.numeric_cols, self.numeric_dtypes)):
+            cols[col] = numeric[:, j].astype(dtype)
+        for j, (col, cats) in enumerate(zip(self.categorical_cols, self.categories)):
+            cols[col] = pd.Categorical.from_codes(codes[:, j], categories=cats)
+        return pd.DataFrame(cols)[FEATURE_COLS]
+
+
+def _is_current(store_dir: Path, signature: str) -> bool:
+    try:
+        manifest = json.loads((store_dir / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return (
+        manifest.get("version") == FEATURE_STORE_VERSION
+        and manifest.get("pipeline") == [MASTERS_CACHE_VERSION, DATASET_STATE_VERSION]
+        and manifest.get("signature") == signature
+        and all((store_dir / f).exists() for f in ("numeric.npy", "codes.npy", "row_index.npy"))
+    )
+
+def ensure_feature_store(data_dir: Path, periods: int = 12, store_dir: Path | None = None, dataset: pd.DataFrame | None = None) -> FeatureStore:
+    """Abre el feature store de data_dir/periods; lo (re)construye si los Excel o la versión del pipeline cambiaron.
+
+    Si se pasa dataset (ya generado con esos maestros y periods) se usa para construir sin recalcularlo.
+    """
+    store_dir = store_dir or (data_dir / ".cache" / f"features_p{periods}")
+    signature = f"{masters_signature(data_dir)}|periods={periods}"
+    if not _is_current(store_dir, signature):
+        if dataset is None:
+            dataset = build_dataset(load_masters(data_dir), periods=periods)
+        return FeatureStore.write(dataset, store_dir, signature)
+    return FeatureStore(store_dir)
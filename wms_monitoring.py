@@ -0,0 +1,264 @@
+"""
+Monitoreo de drift de las features del modelo sobre las filas que se van puntuando.
+build_reference resume el dataset de entrenamiento: para cada FEATURE_COL numérica, un histograma con
+cortes en sus cuantiles (deciles por defecto) más un bin de nulos; para cada categórica, las frecuencias
+de sus categorías más frecuentes, un bucket "otros" (categorías no vistas o poco frecuentes) y uno de nulos.
+train_or_load_models la guarda como drift_reference.json junto a los modelos.
+
+DriftMonitor acumula, por cada batch puntuado, los conteos en esos mismos bins dentro de un anillo de
+window_slots bloques de slot_rows filas: la ventana cubre las últimas ~window_slots × slot_rows filas y
+la memoria es fija (window_slots × total de bins), sin guardar ni releer filas. status() compara la
+ventana con la referencia por feature con PSI (numéricas y categóricas) y KS sobre los bins (numéricas;
+es una cota inferior del KS exacto) y marca drift para reentrenar.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from wms_pipeline import FEATURE_COLS
+
+REFERENCE_FORMAT = "wms-drift-reference"
+REFERENCE_VERSION = 1
+REFERENCE_FILENAME = "drift_reference.json"
+
+NUM_BINS = 10
+MAX_CATEGORIES = 50
+# Periodo es un índice temporal: en producción siempre "deriva" respecto del entrenamiento.
+EXCLUDED_COLS = ("Periodo",)
+
+PSI_WARN = 0.10
+PSI_ALERT = 0.25
+KS_ALERT = 0.10
+MIN_WINDOW_ROWS = 1_000
+DEFAULT_WINDOW_SLOTS = 10
+DEFAULT_SLOT_ROWS = 100_000
+_EPS = 1e-4
+
+
+def _numeric_values(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+def _numeric_codes(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Bin de cada valor: i si edges[i-1] < x <= edges[i]; len(edges) + 1 para nulos."""
+    codes = np.searchsorted(edges, values, side="left")
+    codes[np.isnan(values)] = len(edges) + 1
+    return codes
+
+def _category_codes(series: pd.Series, categories: list[str]) -> np.ndarray:
+    """Índice de la categoría en categories; len(categories) = otros, len(categories) + 1 = nulo."""
+    n_cat = len(categories)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Se traduce solo el diccionario de la columna y luego los códigos enteros.
+        lut = pd.Index(categories).get_indexer(series.cat.categories.astype(str))
+        lut = np.append(np.where(lut < 0, n_cat, lut), n_cat + 1)
+        return lut[series.cat.codes.to_numpy()]
+    missing = series.isna().to_numpy()
+    codes = pd.Index(categories).get_indexer(series.astype(str))
+    codes = np.where(codes < 0, n_cat, codes)
+    codes[missing] = n_cat + 1
+    return codes
+
+
+def build_reference(df: pd.DataFrame, num_bins: int = NUM_BINS, max_categories: int = MAX_CATEGORIES) -> dict:
+    """Estadísticas de referencia (entrenamiento) de las FEATURE_COLS de df, serializables a JSON."""
+    numeric, categorical = {}, {}
+    for col in FEATURE_COLS:
+        if col in EXCLUDED_COLS:
+            continue
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            values = _numeric_values(series)
+            finite = values[~np.isnan(values)]
+            if len(finite) == 0:
+                continue
+            edges = np.unique(np.quantile(finite, np.linspace(0, 1, num_bins + 1)[1:-1]))
+            counts = np.bincount(_numeric_codes(values, edges), minlength=len(edges) + 2)
+            numeric[col] = {
+                "edges": edges.tolist(),
+                "counts": counts.tolist(),
+                "min": float(finite.min()),
+                "max": float(finite.max()),
+                "p50": float(np.median(finite)),
+            }
+        else:
+            freq = series.dropna().astype(str).value_counts()
+            categories = freq.index[:max_categories].tolist()
+            counts = np.bincount(_category_codes(series, categories), minlength=len(categories) + 2)
+            categorical[col] = {"categories": categories, "counts": counts.tolist()}
+    return {
+        "format": REFERENCE_FORMAT,
+        "version": REFERENCE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "rows": int(len(df)),
+        "numeric": numeric,
+        "categorical": categorical,
+    }
+
+def save_reference(reference: dict, path: Path) -> Path:
+    path.write_text(json.dumps(reference, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+def load_reference(path: Path) -> dict:
+    """Lee una referencia guardada con save_reference y valida formato y versión."""
+    reference = json.loads(Path(path).read_text(encoding="utf-8"))
+    if reference.get("format") != REFERENCE_FORMAT or reference.get("version") != REFERENCE_VERSION:
+        raise ValueError(f"Referencia de drift no soportada en {path}: {reference.get('format')} v{reference.get('version')}")
+    return reference
+
+
+def psi(ref: np.ndarray, cur: np.ndarray) -> float:
+    """Population Stability Index entre dos vectores de conteos sobre los mismos bins."""
+    p = np.clip(ref / max(ref.sum(), 1), _EPS, None)
+    q = np.clip(cur / max(cur.sum(), 1), _EPS, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+def ks_binned(ref: np.ndarray, cur: np.ndarray) -> float:
+    """Máxima distancia entre las CDF acumuladas por bins (sin el bin de nulos)."""
+    if ref.sum() == 0 or cur.sum() == 0:
+        return float("nan")
+    return float(np.max(np.abs(np.cumsum(ref) / ref.sum() - np.cumsum(cur) / cur.sum())))
+
+def _hist_quantile(counts: np.ndarray, edges: np.ndarray, hi: float, q: float) -> float:
+    """Cuantil por bins: límite superior del bin donde la frecuencia acumulada alcanza q (hi para el último)."""
+    total = counts.sum()
+    if total == 0:
+        return float("nan")
+    i = int(np.searchsorted(np.cumsum(counts), q * total, side="left"))
+    return float(edges[i]) if i < len(edges) else hi
+
+
+class DriftMonitor:
+    """Ventana móvil de conteos por bin, de memoria fija, comparada contra la referencia de entrenamiento."""
+
+    def __init__(self, reference: dict, window_slots: int = DEFAULT_WINDOW_SLOTS, slot_rows: int = DEFAULT_SLOT_ROWS):
+        if window_slots < 1 or slot_rows < 1:
+            raise ValueError("window_slots y slot_rows deben ser positivos")
+        self.reference = reference
+        self.window_slots = window_slots
+        self.slot_rows = slot_rows
+
+        # Todas las features comparten un vector plano de bins; cada una ocupa [start, stop).
+        self._features: list[tuple[str, str, slice, np.ndarray | list[str]]] = []
+        ref_counts, start = [], 0
+        for col, spec in reference["numeric"].items():
+            stop = start + len(spec["counts"])
+            self._features.append((col, "numérica", slice(start, stop), np.asarray(spec["edges"], dtype=np.float64)))
+            ref_counts.append(spec["counts"])
+            start = stop
+        for col, spec in reference["categorical"].items():
+            stop = start + len(spec["counts"])
+            self._features.append((col, "categórica", slice(start, stop), spec["categories"]))
+            ref_counts.append(spec["counts"])
+            start = stop
+        self.n_bins = start
+        self._ref = np.concatenate(ref_counts).astype(np.int64) if ref_counts else np.zeros(0, dtype=np.int64)
+
+        self._ring = np.zeros((window_slots, self.n_bins), dtype=np.int64)
+        self._ring_rows = np.zeros(window_slots, dtype=np.int64)
+        self._window = np.zeros(self.n_bins, dtype=np.int64)
+        self._slot = 0
+        self.rows_seen = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_path(cls, path: Path, **kwargs) -> "DriftMonitor":
+        return cls(load_reference(path), **kwargs)
+
+    @property
+    def window_rows(self) -> int:
+        return int(self._ring_rows.sum())
+
+    def _counts(self, df: pd.DataFrame) -> np.ndarray:
+        counts = np.zeros(self.n_bins, dtype=np.int64)
+        for col, kind, sl, vocab in self._features:
+            if col not in df:
+                continue
+            if kind == "numérica":
+                codes = _numeric_codes(_numeric_values(df[col]), vocab)
+            else:
+                codes = _category_codes(df[col], vocab)
+            counts[sl] += np.bincount(codes, minlength=sl.stop - sl.start)
+        return counts
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Agrega las filas puntuadas de df a la ventana (se parte en bloques de slot_rows si hace falta)."""
+        with self._lock:
+            start = 0
+            while start < len(df):
+                room = self.slot_rows - self._ring_rows[self._slot]
+                if room == 0:
+                    # Bloque lleno: avanza el anillo y descuenta el bloque más antiguo de la ventana.
+                    self._slot = (self._slot + 1) % self.window_slots
+                    self._window -= self._ring[self._slot]
+                    self._ring[self._slot] = 0
+                    self._ring_rows[self._slot] = 0
+                    continue
+                piece = df.iloc[start:start + room]
+                counts = self._counts(piece)
+                self._ring[self._slot] += counts
+                self._window += counts
+                self._ring_rows[self._slot] += len(piece)
+                start += len(piece)
+            self.rows_seen += len(df)
+            self.batches += 1
+
+    def status(self) -> pd.DataFrame:
+        """Por feature: PSI, KS (numéricas), % de nulos/otros, mediana aproximada y nivel (estable/moderado/drift)."""
+        with self._lock:
+            window, window_rows = self._window.copy(), self.window_rows
+        rows = []
+        for col, kind, sl, vocab in self._features:
+            ref, cur = self._ref[sl], window[sl]
+            row = {"feature": col, "tipo": kind, "psi": psi(ref, cur), "ks": np.nan}
+            if kind == "numérica":
+                spec = self.reference["numeric"][col]
+                row["ks"] = ks_binned(ref[:-1], cur[:-1])
+                row["nulos_ref"] = ref[-1] / max(ref.sum(), 1)
+                row["nulos_ventana"] = cur[-1] / max(cur.sum(), 1)
+                # Mediana por bins en ambos lados para que sean comparables (spec["p50"] es la exacta).
+                row["p50_ref"] = _hist_quantile(ref[:-1], vocab, spec["max"], 0.5)
+                row["p50_ventana"] = _hist_quantile(cur[:-1], vocab, spec["max"], 0.5)
+            else:
+                row["nulos_ref"] = ref[-1] / max(ref.sum(), 1)
+                row["nulos_ventana"] = cur[-1] / max(cur.sum(), 1)
+                row["otros_ventana"] = cur[-2] / max(cur.sum(), 1)
+            if window_rows < MIN_WINDOW_ROWS:
+                row["nivel"] = "sin datos"
+            elif row["psi"] >= PSI_ALERT or (kind == "numérica" and row["ks"] >= KS_ALERT):
+                row["nivel"] = "drift"
+            elif row["psi"] >= PSI_WARN:
+                row["nivel"] = "moderado"
+            else:
+                row["nivel"] = "estable"
+            rows.append(row)
+        out = pd.DataFrame(rows)
+        if not out.empty:
+            out = out.sort_values("psi", ascending=False, ignore_index=True)
+        out.attrs["filas_ventana"] = window_rows
+        return out
+
+    def drifted(self) -> list[str]:
+        """Features con nivel drift en la ventana actual."""
+        status = self.status()
+        return status.loc[status["nivel"] == "drift", "feature"].tolist() if not status.empty else []
+
+    def needs_retrain(self) -> bool:
+        return bool(self.drifted())
+
+    def summary(self) -> dict:
+        """Resumen serializable a JSON (para /drift del servicio HTTP)."""
+        status = self.status()
+        return {
+            "filas_vistas": self.rows_seen,
+            "batches": self.batches,
+            "filas_ventana": status.attrs["filas_ventana"],
+            "reentrenar": bool((status["nivel"] == "drift").any()) if not status.empty else False,
+            "features": json.loads(status.to_json(orient="records")),
+        }
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
-import re
+import os
+import copy
 import json
+import time
+import pickle
+import shutil
+import hashlib
+import warnings
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Mapping
 import pandas as pd
 import numpy as np
 import joblib
+import sklearn
+from joblib import Parallel, delayed
+
+from wms_quality import DEFAULT_CHUNK_ROWS, quality_report
+from wms_profiling import profiled, stage
 
 from sklearn.model_selection import GroupShuffleSplit
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import confusion_matrix, roc_auc_score, classification_report, accuracy_score, precision_recall_fscore_support
 
 
@@ -31,27 +43,80 @@ def _normalize_strings(df: pd.DataFrame) -> pd.DataFrame:
 
 def _dedupe_best(df: pd.DataFrame, id_col: str) -> pd.DataFrame:
     """Elimina duplicados por ID, manteniendo el registro con más datos completos."""
-    df = df.copy()
-    df["_nonnull"] = df.notna().sum(axis=1)
-    df = df.sort_values([id_col, "_nonnull"], ascending=[True, False])
-    df = df.drop_duplicates(subset=[id_col], keep="first").drop(columns=["_nonnull"])
+    keys = pd.DataFrame({id_col: df[id_col], "_nonnull": df.notna().sum(axis=1)})
+    keys = keys.sort_values([id_col, "_nonnull"], ascending=[True, False])
+    keys = keys[~keys[id_col].duplicated(keep="first")]
+    return df.loc[keys.index]
+
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Reduce memoria: texto a category, enteros a int32 si caben y float a float32 si no pierde precisión."""
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object:
+            df[col] = s.astype("category")
+        elif pd.api.types.is_integer_dtype(s.dtype) and s.dtype.itemsize > 4:
+            if s.empty or (s.min() >= np.iinfo(np.int32).min and s.max() <= np.iinfo(np.int32).max):
+                df[col] = s.astype(np.int32)
+        elif pd.api.types.is_float_dtype(s.dtype) and s.dtype.itemsize > 4:
+            as32 = s.astype(np.float32)
+            if ((as32.astype(np.float64) == s) | s.isna()).all():
+                df[col] = as32
     return df
 
-def load_masters(data_dir: Path) -> dict[str, pd.DataFrame]:
-    """Carga y normaliza maestros desde Excel."""
-    cli_path = data_dir / "maestro_clientes.xlsx"
-    prov_path = data_dir / "maestro_proveedores.xlsx"
-    srv_path = data_dir / "maestro_servicios.xlsx"
+def memory_report(stages: dict[str, object]) -> pd.DataFrame:
+    """Huella en memoria por etapa (DataFrame, ndarray o matriz dispersa scipy) en MB."""
+    rows = []
+    for name, obj in stages.items():
+        if isinstance(obj, pd.DataFrame):
+            nbytes, shape = int(obj.memory_usage(index=True, deep=True).sum()), obj.shape
+        elif hasattr(obj, "indptr"):
+            nbytes, shape = int(obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes), obj.shape
+        else:
+            nbytes, shape = int(np.asarray(obj).nbytes), np.shape(obj)
+        rows.append({"Etapa": name, "Filas": shape[0], "Columnas": shape[1] if len(shape) > 1 else 1, "MB": round(nbytes / 2**20, 2)})
+    return pd.DataFrame(rows)
 
-    if not (cli_path.exists() and prov_path.exists() and srv_path.exists()):
-        raise FileNotFoundError(
-            "Faltan archivos en /data. Se esperan: maestro_clientes.xlsx, maestro_proveedores.xlsx, maestro_servicios.xlsx"
-        )
+
+MASTER_FILES = {
+    "clientes": "maestro_clientes.xlsx",
+    "proveedores": "maestro_proveedores.xlsx",
+    "servicios": "maestro_servicios.xlsx",
+}
+
+# Subir cuando cambie la normalización de maestros para invalidar caches existentes.
+MASTERS_CACHE_VERSION = 3
+
+SLA_HOURS_PATTERN = r"(\d+(?:\.\d+)?)\s*h"
+SLA_PCT_PATTERN = r"(\d+(?:\.\d+)?)\s*%"
+FIRST_NUMBER_PATTERN = r"(\d+)"
+
+
+def _extract_number(series: pd.Series, pattern: str, lower: bool = False) -> pd.Series:
+    """Primer grupo de pattern convertido a número (NaN si no hay match), con str.extract una vez por valor distinto."""
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(np.asarray(uniques, dtype=object), dtype=object).astype(str)
+    if lower:
+        text = text.str.lower()
+    values = pd.to_numeric(text.str.extract(pattern, expand=False), errors="coerce").to_numpy(dtype=float)
+    out = np.full(len(series), np.nan)
+    matched = codes >= 0
+    out[matched] = values[codes[matched]]
+    return pd.Series(out, index=series.index)
+
+@profiled("load_masters.excel")
+def _read_masters_excel(data_dir: Path) -> dict[str, pd.DataFrame]:
+    """Lee los Excel de maestros y aplica normalización, deduplicación y tipado."""
+    cli_path = data_dir / MASTER_FILES["clientes"]
+    prov_path = data_dir / MASTER_FILES["proveedores"]
+    srv_path = data_dir / MASTER_FILES["servicios"]
 
     cli_sheets = pd.read_excel(cli_path, sheet_name=None)
     prov_sheets = pd.read_excel(prov_path, sheet_name=None)
     srv_sheets = pd.read_excel(srv_path, sheet_name=None)
+    return _prepare_masters(cli_sheets, prov_sheets, srv_sheets)
 
+def _prepare_masters(cli_sheets: dict[str, pd.DataFrame], prov_sheets: dict[str, pd.DataFrame], srv_sheets: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Normaliza, deduplica y tipa las hojas crudas de los tres maestros."""
     cli_raw = cli_sheets["Maestro de Clientes"]
     prov_raw = prov_sheets["Proveedores_data"]
     srv_raw = srv_sheets["Servicios_data"]
@@ -72,79 +137,124 @@ def load_masters(data_dir: Path) -> dict[str, pd.DataFrame]:
         if c in srv.columns:
             srv[c] = pd.to_numeric(srv[c], errors="coerce")
 
-    def parse_sla_hours(s):
-        if pd.isna(s): return np.nan
-        m = re.search(r"(\\d+)\\s*h", str(s).lower())
-        return float(m.group(1)) if m else np.nan
-
-    def parse_sla_pct(s):
-        if pd.isna(s): return np.nan
-        m = re.search(r"(\\d+)\\s*%", str(s))
-        return float(m.group(1)) if m else np.nan
-
     if "SLA" in srv.columns:
-        srv["SLA_horas"] = srv["SLA"].apply(parse_sla_hours).fillna(0)
-        srv["SLA_pct"] = srv["SLA"].apply(parse_sla_pct).fillna(0)
+        srv["SLA_horas"] = _extract_number(srv["SLA"], SLA_HOURS_PATTERN, lower=True).fillna(0)
+        srv["SLA_pct"] = _extract_number(srv["SLA"], SLA_PCT_PATTERN).fillna(0)
     else:
         srv["SLA_horas"] = 0
         srv["SLA_pct"] = 0
 
     return {
-        "clientes": cli,
-        "proveedores": prov,
-        "servicios": srv,
+        "clientes": _compact_dtypes(cli),
+        "proveedores": _compact_dtypes(prov),
+        "servicios": _compact_dtypes(srv),
         "dicc_clientes": cli_sheets.get("DICCIONARIO", pd.DataFrame()),
         "dicc_proveedores": prov_sheets.get("DICCIONARIO", pd.DataFrame()),
         "dicc_servicios": srv_sheets.get("DICCIONARIO", pd.DataFrame()),
     }
 
 
-def _top_missing(df: pd.DataFrame, topn: int = 10) -> pd.DataFrame:
-    miss = df.isna().mean().sort_values(ascending=False)
-    miss = miss[miss > 0].head(topn)
-    return pd.DataFrame({"Campo": miss.index, "% Nulos": (miss.values * 100).round(2)})
+def _file_fingerprint(path: Path, previous: dict | None = None) -> dict:
+    """Huella de un archivo (mtime, tamaño y SHA-256). Reutiliza el hash si mtime y tamaño no cambiaron."""
+    stat = path.stat()
+    if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+        return previous
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest.hexdigest()}
 
-def _invalid_ruc_count(series: pd.Series) -> int:
-    """Cuenta cuántos RUC no tienen exactamente 11 dígitos."""
-    s = series.astype(str).str.strip().replace({"nan": np.nan, "None": np.nan, "": np.nan})
-    s = s.dropna()
-    return int((~s.str.fullmatch(r"\\d{11}")).sum())
+def _restore_nulls(df: pd.DataFrame) -> pd.DataFrame:
+    """Parquet devuelve None en columnas de texto; se restituye np.nan como en la carga desde Excel."""
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
 
-def quality_checks(masters: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
-    """EDA: registros, nulos, RUC inválidos."""
-    cli = masters["clientes"]
-    prov = masters["proveedores"]
-    srv = masters["servicios"]
+@profiled("load_masters")
+def load_masters(data_dir: Path, cache_dir: Path | None = None, use_cache: bool = True) -> dict[str, pd.DataFrame]:
+    """Carga y normaliza maestros desde Excel, usando una cache Parquet invalidada por huella de archivo.
 
-    resumen = pd.DataFrame([
-        {
-            "Maestro": "Clientes",
-            "Registros": len(cli),
-            "IDs únicos": cli["ClienteID"].nunique(dropna=True),
-            "Duplicados por ID (raw deducido)": 0,
-            "Nulos totales": int(cli.isna().sum().sum()),
-        },
-        {
-            "Maestro": "Proveedores",
-            "Registros": len(prov),
-            "IDs únicos": prov["ProveedorID"].nunique(dropna=True),
-            "Nulos totales": int(prov.isna().sum().sum()),
-            "RUC inválidos (≠11 dígitos)": _invalid_ruc_count(prov["RUC"]) if "RUC" in prov.columns else 0,
-        },
-        {
-            "Maestro": "Servicios",
-            "Registros": len(srv),
-            "IDs únicos": srv["ServicioID"].nunique(dropna=True),
-            "Nulos totales": int(srv.isna().sum().sum()),
-        }
-    ])
+    La cache (por defecto ``data_dir/.cache``) guarda los maestros ya normalizados junto a un
+    manifest.json con mtime, tamaño y SHA-256 de cada Excel. Si algún archivo cambia de contenido
+    se vuelve a leer el Excel y se regenera la cache. Si la cache no se puede escribir se emite un
+    RuntimeWarning y se devuelven los maestros leídos del Excel.
+    """
+    paths = {name: data_dir / fname for name, fname in MASTER_FILES.items()}
+    if not all(p.exists() for p in paths.values()):
+        raise FileNotFoundError(
+            "Faltan archivos en /data. Se esperan: maestro_clientes.xlsx, maestro_proveedores.xlsx, maestro_servicios.xlsx"
+        )
 
-    return {
-        "resumen": resumen,
-        "top_nulos_clientes": _top_missing(cli),
-        "top_nulos_proveedores": _top_missing(prov),
-        "top_nulos_servicios": _top_missing(srv),
-    }
+    if not use_cache:
+        return _read_masters_excel(data_dir)
+
+    cache_dir = cache_dir or (data_dir / ".cache")
+    manifest_path = cache_dir / "manifest.json"
+    manifest = {}
+    if manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}
+
+    previous = manifest.get("files", {}) if manifest.get("version") == MASTERS_CACHE_VERSION else {}
+    files = {name: _file_fingerprint(p, previous.get(name)) for name, p in paths.items()}
+    frames = manifest.get("frames", [])
+
+    valid = (
+        manifest.get("version") == MASTERS_CACHE_VERSION
+        and bool(frames)
+        and all(previous.get(name, {}).get("sha256") == fp["sha256"] for name, fp in files.items())
+        and all((cache_dir / f"{key}.parquet").exists() for key in frames)
+    )
+    if valid:
+        try:
+            with stage("load_masters.cache_parquet"):
+                masters = {key: _restore_nulls(pd.read_parquet(cache_dir / f"{key}.parquet")) for key in frames}
+        except (OSError, ValueError):
+            valid = False
+        else:
+            if files != previous:
+                # Mismo contenido con otro mtime (p.ej. copia o checkout): solo se actualiza el manifest.
+                manifest["files"] = files
+                manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+            return masters
+
+    masters = _read_masters_excel(data_dir)
+    try:
+        cache_dir.mkdir(exist_ok=True, parents=True)
+        manifest_path.unlink(missing_ok=True)
+        for key, df in masters.items():
+            df.to_parquet(cache_dir / f"{key}.parquet")
+    except (OSError, ValueError, TypeError, ImportError) as exc:
+        # p.ej. una hoja DICCIONARIO con números y textos en la misma columna (ArrowTypeError):
+        # se devuelven los maestros recién leídos y la próxima carga vuelve a leer el Excel.
+        warnings.warn(f"No se pudo escribir la cache de maestros en {cache_dir}: {exc}", RuntimeWarning, stacklevel=2)
+        return masters
+    manifest = {"version": MASTERS_CACHE_VERSION, "files": files, "frames": list(masters)}
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return masters
+
+def masters_signature(data_dir: Path) -> str:
+    """Firma barata (mtime + tamaño) de los Excel de maestros, para usar como clave de cache en memoria."""
+    parts = []
+    for name, fname in MASTER_FILES.items():
+        stat = (data_dir / fname).stat()
+        parts.append(f"{name}:{stat.st_mtime_ns}:{stat.st_size}")
+    return "|".join(parts)
+
+
+@profiled("quality_checks")
+def quality_checks(masters: dict[str, pd.DataFrame], chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int | None = None) -> dict[str, pd.DataFrame]:
+    """EDA: registros, nulos, IDs únicos, RUC inválidos y tipo/rango de columnas numéricas.
+
+    Se calcula por chunks de chunk_rows filas con agregados combinables (ver wms_quality); si algún
+    maestro ocupa más de un chunk, los chunks se reparten en un pool de workers procesos.
+    """
+    sources = {name: masters[name] for name in ("clientes", "proveedores", "servicios")}
+    return quality_report(sources, chunk_rows=chunk_rows, workers=workers)
 
 
 def _map_supplier_category(service_cat: str) -> str:
@@ -158,100 +268,280 @@ def _map_supplier_category(service_cat: str) -> str:
         return "SERVICIOS"
     return "SERVICIOS"
 
-def _extract_num(x: str) -> int:
-    """Extrae primer número encontrado en un string."""
-    m = re.search(r"(\\d+)", str(x))
-    return int(m.group(1)) if m else 0
+def _supplier_ranking(prov: pd.DataFrame) -> pd.DataFrame:
+    """Ordena proveedores por rating (desc), lead time (asc) y ProveedorID (asc), imputando medianas."""
+    rank = pd.DataFrame({"ProveedorID": prov["ProveedorID"]})
+    rank["_cat"] = prov["Categoria"].astype(object).str.upper() if "Categoria" in prov.columns else np.nan
+    rank["Departamento"] = prov["Departamento"].astype(object) if "Departamento" in prov.columns else np.nan
+    rank["RatingDesempeno_fill"] = prov["RatingDesempeno"].fillna(prov["RatingDesempeno"].median())
+    rank["LeadTimePromedioDias_fill"] = prov["LeadTimePromedioDias"].fillna(prov["LeadTimePromedioDias"].median())
+    return rank.sort_values(
+        ["RatingDesempeno_fill", "LeadTimePromedioDias_fill", "ProveedorID"],
+        ascending=[False, True, True],
+    )
 
-def build_dataset(masters: dict[str, pd.DataFrame], periods: int = 12) -> pd.DataFrame:
-    """Genera dataset transaccional con variables derivadas y target Stockout14d."""
+@profiled("build_dataset.supplier_pick")
+def _assign_suppliers(base: pd.DataFrame, prov: pd.DataFrame) -> pd.Series:
+    """Asigna el mejor proveedor a cada servicio en una sola pasada vectorizada.
+
+    Regla: entre los proveedores de la categoría objetivo gana el mejor rankeado del mismo
+    departamento del cliente; si no hay, el mejor de la categoría. Si la categoría no tiene
+    candidatos se aplica la misma regla sobre todos los proveedores.
+    """
+    rank = _supplier_ranking(prov)
+    best_cat_dept = (
+        rank.dropna(subset=["_cat", "Departamento"])
+        .drop_duplicates(subset=["_cat", "Departamento"])
+        .set_index(["_cat", "Departamento"])["ProveedorID"]
+    )
+    best_cat = rank.dropna(subset=["_cat"]).drop_duplicates(subset=["_cat"]).set_index("_cat")["ProveedorID"]
+    best_dept = rank.dropna(subset=["Departamento"]).drop_duplicates(subset=["Departamento"]).set_index("Departamento")["ProveedorID"]
+    best_any = rank["ProveedorID"].iloc[0]
+
+    cat = base["ProveedorCategoriaObjetivo"].astype(object)
+    dept = base["Departamento"].astype(object) if "Departamento" in base.columns else pd.Series(np.nan, index=base.index)
+
+    keys = pd.MultiIndex.from_arrays([cat, dept])
+    picked = pd.Series(best_cat_dept.reindex(keys).to_numpy(), index=base.index)
+    picked = picked.fillna(cat.map(best_cat)).fillna(dept.map(best_dept)).fillna(best_any)
+    return picked.astype(str)
+
+# Horizontes (días) con target propio Stockout{h}d.
+HORIZONS = (7, 14, 30)
+
+def target_col(horizonte: int) -> str:
+    return f"Stockout{horizonte}d"
+
+DATASET_KEEP_COLS = [
+    "ServicioID", "NombreServicio", "Categoria", "Subcategoria",
+    "UnidadTarifa", "TipoUnidad", "TarifaBase", "Moneda",
+    "RequiereCertificacion", "Temperatura", "LeadTimeMinDias", "LeadTimeMaxDias",
+    "TiempoEjecucionHoras", "ModalidadContrato", "Estado",
+    "CantidadPedidoEstandar", "CostoEstandar", "TarifaImpuesto",
+    "TemperaturaControlada", "CaducidadControlada", "SLA_horas", "SLA_pct",
+    "ClientePropietario", "Segmento", "CanalPreferido", "ZonaDespacho", "Departamento",
+    "ProveedorID", "Categoria_prov", "LeadTimePromedioDias", "ToleranciaEntregaDias", "RatingDesempeno",
+    "CertificadoCalidad", "Estado_prov",
+    "Periodo", "StockActual", "DemandaDiariaEst", "DiasHastaRecepcion", "RecepcionPendiente",
+    "Stockout7d", "Stockout14d", "Stockout30d",
+]
+
+@profiled("build_dataset.base")
+def _build_base(masters: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Una fila por servicio con atributos de cliente/proveedor y variables que no dependen del periodo.
+
+    Las medianas de imputación se calculan sobre los servicios; como cada servicio se repite el mismo
+    número de periodos, coinciden con las medianas sobre el dataset expandido.
+    """
     cli = masters["clientes"]
     prov = masters["proveedores"]
     srv = masters["servicios"]
 
+    with stage("build_dataset.merge_clientes", len(srv)) as rec:
+        base = srv.merge(
+            cli[["ClienteID", "Segmento", "CanalPreferido", "ZonaDespacho", "Departamento"]],
+            how="left",
+            left_on="ClientePropietario",
+            right_on="ClienteID",
+            suffixes=("", "_cli"),
+        )
+        rec.rows_out = len(base)
 
-    base = srv.merge(
-        cli[["ClienteID", "Segmento", "CanalPreferido", "ZonaDespacho", "Departamento"]],
-        how="left",
-        left_on="ClientePropietario",
-        right_on="ClienteID",
-        suffixes=("", "_cli"),
-    )
+    base["ProveedorCategoriaObjetivo"] = base["Categoria"].astype(object).apply(_map_supplier_category)
+    base["ProveedorID"] = _assign_suppliers(base, prov)
 
-    base["ProveedorCategoriaObjetivo"] = base["Categoria"].apply(_map_supplier_category)
-    prov_rank = prov.copy()
-    prov_rank["RatingDesempeno_fill"] = prov_rank["RatingDesempeno"].fillna(prov_rank["RatingDesempeno"].median())
-    prov_rank["LeadTimePromedioDias_fill"] = prov_rank["LeadTimePromedioDias"].fillna(prov_rank["LeadTimePromedioDias"].median())
-
-    def pick_supplier(row) -> str:
-        cat = row["ProveedorCategoriaObjetivo"]
-        dept = row.get("Departamento", None)
-        candidates = prov_rank[prov_rank["Categoria"].str.upper() == cat] if "Categoria" in prov_rank.columns else prov_rank
-        if candidates.empty:
-            candidates = prov_rank
-        candidates = candidates.copy()
-        candidates["dept_match"] = (candidates["Departamento"] == dept).astype(int) if "Departamento" in candidates.columns else 0
-        candidates = candidates.sort_values(
-            ["dept_match", "RatingDesempeno_fill", "LeadTimePromedioDias_fill", "ProveedorID"],
-            ascending=[False, False, True, True],
+    with stage("build_dataset.merge_proveedores", len(base)) as rec:
+        base = base.merge(
+            prov[["ProveedorID", "Categoria", "LeadTimePromedioDias", "ToleranciaEntregaDias", "RatingDesempeno", "CertificadoCalidad", "Estado"]],
+            on="ProveedorID",
+            how="left",
+            suffixes=("", "_prov"),
         )
-        return str(candidates.iloc[0]["ProveedorID"])
+        rec.rows_out = len(base)
 
-    base["ProveedorID"] = base.apply(pick_supplier, axis=1)
+    seg_factor = {"BASICO": 0.8, "ESTANDAR": 1.0, "PREFERENTE": 1.2}
+    base["Segmento"] = base["Segmento"].astype(object).fillna("SIN_DATO").astype(str).str.upper()
+    base["FactorSegmento"] = base["Segmento"].map(seg_factor).fillna(1.0)
 
-    base = base.merge(
-        prov[["ProveedorID", "Categoria", "LeadTimePromedioDias", "ToleranciaEntregaDias", "RatingDesempeno", "CertificadoCalidad", "Estado"]],
-        on="ProveedorID",
-        how="left",
-        suffixes=("", "_prov"),
-    )
+    base["CantidadPedidoEstandar"] = base["CantidadPedidoEstandar"].fillna(base["CantidadPedidoEstandar"].median())
+    base["DemandaDiariaEst"] = (base["CantidadPedidoEstandar"] / 14.0) * base["FactorSegmento"]
 
-    periods_df = pd.DataFrame({"Periodo": list(range(1, periods + 1))})
-    base["key"] = 1
-    periods_df["key"] = 1
-    ds = base.merge(periods_df, on="key").drop(columns=["key"])
+    base["ServicioNum"] = _extract_number(base["ServicioID"], FIRST_NUMBER_PATTERN).fillna(0).astype(np.int64)
+    lead = base["LeadTimeMaxDias"].fillna(base["LeadTimeMaxDias"].median())
+    base["FactorLead"] = (1.0 + (lead / 60.0)).clip(0.8, 2.0)
 
-    seg_factor = {"BASICO": 0.8, "ESTANDAR": 1.0, "PREFERENTE": 1.2}
-    ds["Segmento"] = ds["Segmento"].fillna("SIN_DATO").astype(str).str.upper()
-    ds["FactorSegmento"] = ds["Segmento"].map(seg_factor).fillna(1.0)
-
-    ds["CantidadPedidoEstandar"] = ds["CantidadPedidoEstandar"].fillna(ds["CantidadPedidoEstandar"].median())
-    ds["DemandaDiariaEst"] = (ds["CantidadPedidoEstandar"] / 14.0) * ds["FactorSegmento"]
-
-    ds["ServicioNum"] = ds["ServicioID"].apply(_extract_num)
-    lead = ds["LeadTimeMaxDias"].fillna(ds["LeadTimeMaxDias"].median())
-    ds["FactorLead"] = (1.0 + (lead / 60.0)).clip(0.8, 2.0)
-
-    ds["Ciclo"] = (ds["Periodo"] + (ds["ServicioNum"] % 4)) % 4
-    ds["Dip"] = np.where(ds["Ciclo"] == 0, 0.55, 1.0)
-
-    ds["StockActual"] = np.round(
-        ds["CantidadPedidoEstandar"] * (1 + (ds["Periodo"] % 3)) * ds["FactorLead"] * ds["Dip"]
-    ).astype(int)
-
-    prov_lead = ds["LeadTimePromedioDias"].fillna(ds["LeadTimePromedioDias"].median())
-    tol = ds["ToleranciaEntregaDias"].fillna(0)
-    ds["DiasHastaRecepcion"] = np.round(np.minimum(prov_lead + (ds["Periodo"] % 2) * tol, 45)).astype(int)
-    ds["RecepcionPendiente"] = np.where(ds["StockActual"] < (ds["DemandaDiariaEst"] * 10), ds["CantidadPedidoEstandar"], 0).astype(int)
-
-    dias_cobertura = ds["StockActual"] / ds["DemandaDiariaEst"].replace(0, np.nan)
-    ds["Stockout14d"] = ((dias_cobertura < 14) & (ds["DiasHastaRecepcion"] > dias_cobertura)).astype(int)
-
-    keep = [
-        "ServicioID", "NombreServicio", "Categoria", "Subcategoria",
-        "UnidadTarifa", "TipoUnidad", "TarifaBase", "Moneda",
-        "RequiereCertificacion", "Temperatura", "LeadTimeMinDias", "LeadTimeMaxDias",
-        "TiempoEjecucionHoras", "ModalidadContrato", "Estado",
-        "CantidadPedidoEstandar", "CostoEstandar", "TarifaImpuesto",
-        "TemperaturaControlada", "CaducidadControlada", "SLA_horas", "SLA_pct",
-        "ClientePropietario", "Segmento", "CanalPreferido", "ZonaDespacho", "Departamento",
-        "ProveedorID", "Categoria_prov", "LeadTimePromedioDias", "ToleranciaEntregaDias", "RatingDesempeno",
-        "CertificadoCalidad", "Estado_prov",
-        "Periodo", "StockActual", "DemandaDiariaEst", "DiasHastaRecepcion", "RecepcionPendiente",
-        "Stockout14d",
-    ]
-    return ds[keep].copy()
+    base["_prov_lead"] = base["LeadTimePromedioDias"].fillna(base["LeadTimePromedioDias"].median())
+    base["_tol"] = base["ToleranciaEntregaDias"].fillna(0)
+    return _compact_dtypes(base)
+
+@profiled("build_dataset.targets")
+def _period_values(base: pd.DataFrame, rows: np.ndarray, periodo: np.ndarray) -> dict[str, np.ndarray]:
+    """Stock, recepción y target para cada par (posición en base, periodo)."""
+    qty = base["CantidadPedidoEstandar"].to_numpy()[rows]
+    demanda = base["DemandaDiariaEst"].to_numpy()[rows]
+
+    ciclo = (periodo + (base["ServicioNum"].to_numpy()[rows] % 4)) % 4
+    dip = np.where(ciclo == 0, 0.55, 1.0)
+
+    stock = np.round(qty * (1 + (periodo % 3)) * base["FactorLead"].to_numpy()[rows] * dip).astype(np.int32)
+
+    prov_lead = base["_prov_lead"].to_numpy()[rows]
+    tol = base["_tol"].to_numpy()[rows]
+    dias_rec = np.round(np.minimum(prov_lead + (periodo % 2) * tol, 45)).astype(np.int32)
+    rec_pend = np.where(stock < (demanda * 10), qty, 0).astype(np.int32)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dias_cobertura = stock / np.where(demanda == 0, np.nan, demanda)
+    llega_tarde = dias_rec > dias_cobertura
+
+    values = {
+        "StockActual": stock,
+        "DiasHastaRecepcion": dias_rec,
+        "RecepcionPendiente": rec_pend,
+    }
+    for h in HORIZONS:
+        values[target_col(h)] = ((dias_cobertura < h) & llega_tarde).astype(np.int32)
+    return values
+
+@profiled("build_dataset.expand_periods")
+def _assemble_dataset(base: pd.DataFrame, rows: np.ndarray, periodo: np.ndarray, values: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Arma el dataset final repitiendo las columnas estáticas de base en el orden de rows."""
+    static = [c for c in DATASET_KEEP_COLS if c != "Periodo" and c not in values]
+    ds = base[static].take(rows)
+    ds.index = pd.RangeIndex(len(ds))
+    ds["Periodo"] = periodo.astype(np.int32)
+    for col, arr in values.items():
+        ds[col] = arr
+    return ds[DATASET_KEEP_COLS]
+
+def _expand_periods(base: pd.DataFrame, periodos) -> pd.DataFrame:
+    """Expande cada servicio de base a los periodos indicados (orden servicio → periodo)."""
+    periodos = np.asarray(periodos, dtype=np.int64)
+    rows = np.repeat(np.arange(len(base)), len(periodos))
+    periodo = np.tile(periodos, len(base))
+    return _assemble_dataset(base, rows, periodo, _period_values(base, rows, periodo))
+
+@profiled("build_dataset")
+def build_dataset(masters: dict[str, pd.DataFrame], periods: int = 12) -> pd.DataFrame:
+    """Genera dataset transaccional con variables derivadas y targets Stockout7d/14d/30d."""
+    return _expand_periods(_build_base(masters), range(1, periods + 1))
+
+
+# Subir cuando cambie la lógica de _build_base/_expand_periods para invalidar builds incrementales.
+DATASET_STATE_VERSION = 3
+# Maestros que lee _build_base; el resto (diccionarios) no afecta al dataset.
+DATASET_MASTERS = ("clientes", "proveedores", "servicios")
+
+def _masters_fingerprint(masters: dict[str, pd.DataFrame]) -> str:
+    """Huella SHA-256 del contenido, columnas y dtypes de los maestros que usa _build_base."""
+    digest = hashlib.sha256()
+    for key in DATASET_MASTERS:
+        df = masters[key]
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        digest.update(json.dumps({key: [[str(c), str(t)] for c, t in df.dtypes.items()]}).encode("utf-8"))
+    digest.update(str(DATASET_STATE_VERSION).encode("utf-8"))
+    return digest.hexdigest()
 
+# Columnas de la base de las que dependen los valores por periodo (_period_values).
+PERIOD_VALUE_INPUTS = ["CantidadPedidoEstandar", "DemandaDiariaEst", "ServicioNum", "FactorLead", "_prov_lead", "_tol"]
+DATASET_STATE_FILE = "dataset_state.pkl"
+
+def _period_value_hashes(base: pd.DataFrame) -> pd.Series:
+    """Hash por ServicioID de las entradas de _period_values: mismo hash, mismos valores en cada periodo."""
+    hashes = pd.util.hash_pandas_object(base[PERIOD_VALUE_INPUTS], index=False).to_numpy()
+    return pd.Series(hashes, index=base["ServicioID"].astype(str).to_numpy())
+
+def _read_dataset_state(path: Path) -> dict | None:
+    """Estado de build_dataset_incremental, o None si falta, está corrupto o es de otra versión."""
+    try:
+        state = pd.read_pickle(path)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    keys = {"version", "masters", "periods", "base", "hashes", "dataset"}
+    if not isinstance(state, dict) or not keys <= state.keys() or state["version"] != DATASET_STATE_VERSION:
+        return None
+    if len(state["dataset"]) != len(state["base"]) * state["periods"] or len(state["hashes"]) != len(state["base"]):
+        return None
+    return state
+
+def _write_dataset_state(path: Path, state: dict) -> None:
+    """Escribe el estado en un archivo temporal y lo instala con os.replace (nunca queda a medio escribir)."""
+    path.parent.mkdir(exist_ok=True, parents=True)
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}-{time.time_ns()}")
+    pd.to_pickle(state, tmp)
+    os.replace(tmp, path)
+
+def _rebuild_with_state(base: pd.DataFrame, hashes: pd.Series, periods: int, state: dict | None) -> pd.DataFrame:
+    """Dataset sobre una base nueva reutilizando los valores por periodo de servicios sin cambios.
+
+    Las columnas estáticas se toman siempre de la base nueva: imputaciones, asignación de proveedores y
+    categorías dependen de todos los servicios. Los valores de _period_values de cada servicio cuyo hash
+    no cambió se copian del dataset anterior para los periodos que ya tenía; el resto se calcula.
+    """
+    periodos = np.arange(1, periods + 1, dtype=np.int64)
+    rows = np.repeat(np.arange(len(base)), periods)
+    periodo = np.tile(periodos, len(base))
+    if state is None:
+        return _assemble_dataset(base, rows, periodo, _period_values(base, rows, periodo))
+
+    prev_hashes, prev_ds, prev_periods = state["hashes"], state["dataset"], state["periods"]
+    if not (hashes.index.is_unique and prev_hashes.index.is_unique):
+        return _assemble_dataset(base, rows, periodo, _period_values(base, rows, periodo))
+    src_srv = prev_hashes.index.get_indexer(hashes.index)
+    reusable = src_srv >= 0
+    reusable[reusable] = prev_hashes.to_numpy()[src_srv[reusable]] == hashes.to_numpy()[reusable]
+
+    reuse = reusable[rows] & (periodo <= prev_periods)
+    src = src_srv[rows[reuse]].astype(np.int64) * prev_periods + periodo[reuse] - 1
+    fresh = ~reuse
+    computed = _period_values(base, rows[fresh], periodo[fresh])
+    values = {}
+    for col, arr in computed.items():
+        out = np.empty(len(rows), dtype=arr.dtype)
+        out[fresh] = arr
+        out[reuse] = prev_ds[col].to_numpy()[src]
+        values[col] = out
+    return _assemble_dataset(base, rows, periodo, values)
+
+@profiled("build_dataset_incremental")
+def build_dataset_incremental(masters: dict[str, pd.DataFrame], periods: int, state_dir: Path) -> pd.DataFrame:
+    """Como build_dataset, pero reutiliza el build anterior persistido en state_dir.
+
+    El estado (un único archivo, escrito con os.replace) guarda la huella de los maestros, los periodos,
+    la base por servicio, un hash por servicio de las entradas de _period_values y el dataset armado;
+    huella y periodos se validan al leer. Con los mismos maestros y periodos devuelve el dataset
+    guardado; con otros periodos reutiliza la base y solo calcula los periodos nuevos. Si cambian
+    los maestros se rearma la base (sus imputaciones dependen de todos los servicios) y se reutilizan
+    los valores por periodo de los servicios sin cambios. El resultado es idéntico a
+    build_dataset(masters, periods).
+
+    Costo medido con 20k servicios: leer/escribir el estado y la huella suman ~0,15 s, así que solo
+    "sin cambios" (~0,06 s vs ~0,2 s) y "menos periodos" salen claramente por debajo del build completo;
+    en el resto domina armar las columnas estáticas, que se repite siempre.
+    """
+    state_path = state_dir / DATASET_STATE_FILE
+    fingerprint = _masters_fingerprint(masters)
+    state = _read_dataset_state(state_path)
+
+    if state is not None and state["masters"] == fingerprint:
+        if state["periods"] == periods:
+            return state["dataset"]
+        base, hashes = state["base"], state["hashes"]
+    else:
+        base = _build_base(masters)
+        hashes = _period_value_hashes(base)
+    ds = _rebuild_with_state(base, hashes, periods, state)
+
+    _write_dataset_state(state_path, {
+        "version": DATASET_STATE_VERSION, "masters": fingerprint, "periods": periods,
+        "base": base, "hashes": hashes, "dataset": ds,
+    })
+    return ds
+
+
+MODEL_PARAMS = {"max_iter": 2000, "class_weight": "balanced", "C": 0.5, "solver": "liblinear"}
+SPLIT_PARAMS = {"test_size": 0.25, "random_state": 42}
+MAX_MODEL_VERSIONS = 5
 
 FEATURE_COLS = [
     "Categoria", "Subcategoria", "UnidadTarifa", "TipoUnidad", "Moneda", "RequiereCertificacion", "Temperatura",
@@ -266,7 +556,10 @@ def _build_pipeline(X: pd.DataFrame) -> Pipeline:
     """Construye pipeline de preprocesamiento + LogisticRegression."""
     numeric_features = X.select_dtypes(include=["number"]).columns.tolist()
     categorical_features = [c for c in X.columns if c not in numeric_features]
+    return _make_pipeline(numeric_features, categorical_features)
 
+def _make_pipeline(numeric_features: list[str], categorical_features: list[str]) -> Pipeline:
+    """Pipeline sin entrenar para las columnas numéricas y categóricas dadas (ver _build_pipeline)."""
     preprocess = ColumnTransformer(
         transformers=[
             ("num", Pipeline(steps=[
@@ -277,23 +570,52 @@ def _build_pipeline(X: pd.DataFrame) -> Pipeline:
                 ("imputer", SimpleImputer(strategy="most_frequent")),
                 ("onehot", OneHotEncoder(handle_unknown="ignore")),
             ]), categorical_features),
-        ]
+        ],
+        # Salida CSR siempre: el one-hot domina la matriz y liblinear/SGD aceptan dispersas.
+        sparse_threshold=1.0,
     )
 
-    clf = LogisticRegression(max_iter=2000, class_weight="balanced", C=0.5, solver="liblinear")
+    clf = LogisticRegression(**MODEL_PARAMS)
     return Pipeline(steps=[("preprocess", preprocess), ("clf", clf)])
 
-def train_or_load_model(dataset: pd.DataFrame, models_dir: Path):
-    """Entrena modelo con GroupShuffleSplit y guarda .joblib + metrics.json."""
-    models_dir.mkdir(exist_ok=True, parents=True)
-    model_path = models_dir / "stockout14d_logreg.joblib"
-    metrics_path = models_dir / "metrics.json"
+def _dataset_fingerprint(dataset: pd.DataFrame, targets: Iterable[str] = ("Stockout14d",)) -> str:
+    """Huella SHA-256 de los datos de entrenamiento, FEATURE_COLS, targets e hiperparámetros."""
+    targets = list(targets)
+    cols = FEATURE_COLS + targets + ["ServicioID"]
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(dataset[cols], index=False).to_numpy().tobytes())
+    digest.update(json.dumps({
+        "features": FEATURE_COLS,
+        "targets": targets,
+        "dtypes": [str(dataset[c].dtype) for c in cols],
+        "model": MODEL_PARAMS,
+        "split": SPLIT_PARAMS,
+        "sklearn": sklearn.__version__,
+    }, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+def _metrics_result(metrics_obj: dict) -> dict:
+    """Convierte el contenido de metrics.json en el dict de métricas que consume la app."""
+    rep = metrics_obj["classification_report"]
+    cm_df = pd.DataFrame(metrics_obj["confusion_matrix"], index=["Real_0", "Real_1"], columns=["Pred_0", "Pred_1"])
+    report_df = pd.DataFrame(rep).T[["precision", "recall", "f1-score", "support"]].round(3)
+    return {
+        "accuracy": metrics_obj["accuracy"],
+        "roc_auc": metrics_obj["roc_auc"],
+        "precision_pos": metrics_obj["precision_pos"],
+        "recall_pos": metrics_obj["recall_pos"],
+        "f1_pos": metrics_obj["f1_pos"],
+        "confusion_matrix_df": cm_df,
+        "report_df": report_df,
+    }
 
-    X = dataset[FEATURE_COLS].copy()
-    y = dataset["Stockout14d"].copy()
-    groups = dataset["ServicioID"].copy()
+def _fit_and_evaluate(dataset: pd.DataFrame, target: str = "Stockout14d") -> tuple[Pipeline, dict]:
+    """Entrena con GroupShuffleSplit por ServicioID y devuelve (pipeline, métricas serializables)."""
+    X = dataset[FEATURE_COLS]
+    y = dataset[target]
+    groups = dataset["ServicioID"]
 
-    gss = GroupShuffleSplit(n_splits=1, test_size=0.25, random_state=42)
+    gss = GroupShuffleSplit(n_splits=1, **SPLIT_PARAMS)
     train_idx, test_idx = next(gss.split(X, y, groups=groups))
 
     X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
@@ -303,6 +625,51 @@ def train_or_load_model(dataset: pd.DataFrame, models_dir: Path):
     pipe.fit(X_train, y_train)
 
     proba = pipe.predict_proba(X_test)[:, 1]
+    return pipe, _evaluation_metrics(y_test, proba)
+
+def _fit_horizon(Xt_train, y_train, Xt_test, y_test) -> tuple[LogisticRegression, dict]:
+    clf = LogisticRegression(**MODEL_PARAMS).fit(Xt_train, y_train)
+    return clf, _evaluation_metrics(y_test, clf.predict_proba(Xt_test)[:, 1])
+
+@profiled("train.fit_and_evaluate")
+def _fit_and_evaluate_horizons(dataset: pd.DataFrame, horizons: Iterable[int] = HORIZONS, n_jobs: int | None = None) -> dict[int, tuple[Pipeline, dict]]:
+    """Entrena un modelo por horizonte sobre una única matriz de diseño compartida.
+
+    El split por ServicioID y el preprocesamiento (imputación, escalado, one-hot) se calculan una sola
+    vez; luego cada horizonte ajusta su LogisticRegression en paralelo (hilos: liblinear libera el GIL).
+    Cada Pipeline resultante es equivalente al de _fit_and_evaluate(dataset, target_col(h)).
+    Devuelve {horizonte: (pipeline, métricas serializables)}.
+    """
+    horizons = list(horizons)
+    X = dataset[FEATURE_COLS]
+    groups = dataset["ServicioID"]
+
+    gss = GroupShuffleSplit(n_splits=1, **SPLIT_PARAMS)
+    train_idx, test_idx = next(gss.split(X, groups=groups))
+
+    preprocess = _build_pipeline(X).named_steps["preprocess"]
+    with stage("train.preprocess", len(X)):
+        Xt_train = preprocess.fit_transform(X.iloc[train_idx])
+        Xt_test = preprocess.transform(X.iloc[test_idx])
+
+    n_jobs = n_jobs or min(len(horizons), os.cpu_count() or 1)
+    with stage("train.fit_classifiers", Xt_train.shape[0]):
+        fitted = Parallel(n_jobs=n_jobs, prefer="threads")(
+            delayed(_fit_horizon)(
+                Xt_train, dataset[target_col(h)].iloc[train_idx],
+                Xt_test, dataset[target_col(h)].iloc[test_idx],
+            )
+            for h in horizons
+        )
+    # Cada Pipeline lleva su propia copia del preprocess ajustado: modificar o reajustar uno no debe
+    # cambiar los demás horizontes.
+    return {
+        h: (Pipeline(steps=[("preprocess", copy.deepcopy(preprocess)), ("clf", clf)]), metrics_obj)
+        for h, (clf, metrics_obj) in zip(horizons, fitted)
+    }
+
+def _evaluation_metrics(y_test, proba: np.ndarray) -> dict:
+    """Métricas de test (umbral 0.5) en el formato serializable de metrics.json."""
     pred = (proba >= 0.5).astype(int)
 
     acc = float(accuracy_score(y_test, pred))
@@ -312,8 +679,7 @@ def train_or_load_model(dataset: pd.DataFrame, models_dir: Path):
 
     precision_pos, recall_pos, f1_pos, _ = precision_recall_fscore_support(y_test, pred, average="binary", zero_division=0)
 
-    joblib.dump(pipe, model_path)
-    metrics_obj = {
+    return {
         "accuracy": acc,
         "roc_auc": auc,
         "precision_pos": float(precision_pos),
@@ -322,44 +688,499 @@ def train_or_load_model(dataset: pd.DataFrame, models_dir: Path):
         "confusion_matrix": cm.tolist(),
         "classification_report": rep,
     }
-    metrics_path.write_text(json.dumps(metrics_obj, indent=2), encoding="utf-8")
 
-    cm_df = pd.DataFrame(cm, index=["Real_0", "Real_1"], columns=["Pred_0", "Pred_1"])
-    report_df = pd.DataFrame(rep).T[["precision", "recall", "f1-score", "support"]].round(3)
+def _read_registry_index(registry_dir: Path) -> dict:
+    index_path = registry_dir / "index.json"
+    if index_path.exists():
+        try:
+            return json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+    return {"current": None, "entries": {}}
 
-    return pipe, {
-        "accuracy": acc,
-        "roc_auc": auc,
-        "precision_pos": float(precision_pos),
-        "recall_pos": float(recall_pos),
-        "f1_pos": float(f1_pos),
-        "confusion_matrix_df": cm_df,
-        "report_df": report_df,
+def _evict_old_models(registry_dir: Path, index: dict, max_versions: int) -> None:
+    """Elimina las versiones menos usadas recientemente (LRU) por encima de max_versions."""
+    entries = index["entries"]
+    by_use = sorted(entries, key=lambda fp: entries[fp]["last_used"], reverse=True)
+    for fp in by_use[max_versions:]:
+        shutil.rmtree(registry_dir / fp, ignore_errors=True)
+        del entries[fp]
+
+def model_filename(horizonte: int) -> str:
+    return f"stockout{horizonte}d_logreg.joblib"
+
+def metrics_filename(horizonte: int) -> str:
+    # metrics.json sigue siendo el del horizonte principal (14 días).
+    return "metrics.json" if horizonte == 14 else f"metrics_{horizonte}d.json"
+
+@profiled("train_or_load_models")
+def train_or_load_models(dataset: pd.DataFrame, models_dir: Path, horizons: Iterable[int] = HORIZONS, force_retrain: bool = False, max_versions: int = MAX_MODEL_VERSIONS):
+    """Carga la familia de modelos (uno por horizonte) del registro si ya se entrenó con los mismos datos y parámetros; si no, entrena.
+
+    El registro (models_dir/registry) guarda cada versión en una carpeta con nombre igual a la huella
+    de dataset + FEATURE_COLS + targets + hiperparámetros, y conserva las max_versions usadas más recientemente.
+    La versión resuelta se copia además a models_dir como stockout{h}d_logreg.joblib, la carpeta de artefacto
+    stockout{h}d_logreg/ (ver wms_artifact), las métricas por horizonte y drift_reference.json (ver wms_monitoring).
+    Devuelve ({horizonte: pipeline}, {horizonte: métricas}).
+    """
+    horizons = sorted(set(horizons))
+    models_dir.mkdir(exist_ok=True, parents=True)
+    registry_dir = models_dir / "registry"
+    registry_dir.mkdir(exist_ok=True)
+
+    fingerprint = _dataset_fingerprint(dataset, [target_col(h) for h in horizons])
+    entry_dir = registry_dir / fingerprint
+    files = [name for h in horizons for name in (model_filename(h), metrics_filename(h))]
+    index = _read_registry_index(registry_dir)
+
+    from wms_artifact import artifact_dirname, copy_artifact, read_manifest, save_artifact
+    from wms_monitoring import REFERENCE_FILENAME, build_reference, save_reference
+
+    models, metrics_objs = {}, {}
+    cached = not force_retrain and all((entry_dir / name).exists() for name in files)
+    if cached:
+        try:
+            for h in horizons:
+                # joblib.load es la carga más rápida de un Pipeline en proceso (load_artifact rearma el
+                # ColumnTransformer); el artefacto queda para el servicio y despliegues sin pickle.
+                models[h] = joblib.load(entry_dir / model_filename(h))
+                metrics_objs[h] = json.loads((entry_dir / metrics_filename(h)).read_text(encoding="utf-8"))
+                artifact = entry_dir / artifact_dirname(h)
+                if not (artifact / "manifest.json").exists() or read_manifest(artifact)["fingerprint"] != fingerprint:
+                    # Versión guardada antes del formato de artefacto: se completa a partir del .joblib.
+                    save_artifact(models[h], artifact, fingerprint, target_col(h), metrics_objs[h])
+        except (OSError, ValueError, KeyError, EOFError):
+            models.clear()
+            cached = False
+
+    if not cached:
+        entry_dir.mkdir(exist_ok=True)
+        for h, (pipe, metrics_obj) in _fit_and_evaluate_horizons(dataset, horizons).items():
+            models[h], metrics_objs[h] = pipe, metrics_obj
+            joblib.dump(pipe, entry_dir / model_filename(h))
+            save_artifact(pipe, entry_dir / artifact_dirname(h), fingerprint, target_col(h), metrics_obj)
+            (entry_dir / metrics_filename(h)).write_text(json.dumps(metrics_obj, indent=2), encoding="utf-8")
+
+    # Estadísticas de entrenamiento para wms_monitoring.DriftMonitor (se completan en versiones anteriores).
+    if not (entry_dir / REFERENCE_FILENAME).exists():
+        save_reference(build_reference(dataset), entry_dir / REFERENCE_FILENAME)
+    files.append(REFERENCE_FILENAME)
+
+    artifacts = [f"{artifact_dirname(h)}/manifest.json" for h in horizons]
+    if not cached or index.get("current") != fingerprint or not all((models_dir / name).exists() for name in files + artifacts):
+        for name in files:
+            shutil.copyfile(entry_dir / name, models_dir / name)
+        for h in horizons:
+            if (entry_dir / artifact_dirname(h)).is_dir():
+                # Copia completa y reemplazo: nunca se sobrescriben en el lugar archivos de un modelo en uso.
+                copy_artifact(entry_dir / artifact_dirname(h), models_dir / artifact_dirname(h))
+
+    now = time.time()
+    entry = index["entries"].setdefault(fingerprint, {"created": now})
+    entry["last_used"] = now
+    index["current"] = fingerprint
+    _evict_old_models(registry_dir, index, max_versions)
+    (registry_dir / "index.json").write_text(json.dumps(index, indent=2), encoding="utf-8")
+
+    metrics = {}
+    for h in horizons:
+        metrics[h] = _metrics_result(metrics_objs[h])
+        metrics[h]["fingerprint"] = fingerprint
+        metrics[h]["cached"] = cached
+    return models, metrics
+
+@profiled("train_or_load_model")
+def train_or_load_model(dataset: pd.DataFrame, models_dir: Path, force_retrain: bool = False, max_versions: int = MAX_MODEL_VERSIONS):
+    """Como train_or_load_models, pero devuelve solo (pipeline, métricas) del horizonte de 14 días."""
+    models, metrics = train_or_load_models(dataset, models_dir, force_retrain=force_retrain, max_versions=max_versions)
+    return models[14], metrics[14]
+
+
+STREAMING_PARAMS = {"loss": "log_loss", "alpha": 1e-4, "random_state": 42}
+
+def iter_dataset_chunks(
+    masters: dict[str, pd.DataFrame] | None,
+    periods: int = 12,
+    chunk_services: int | None = None,
+    chunk_periods: int | None = None,
+    base: pd.DataFrame | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Genera las filas de build_dataset por bloques de chunk_services servicios × chunk_periods periodos.
+
+    La base por servicio se calcula una sola vez (o se recibe ya armada en base, y entonces masters no
+    se usa); cada bloque se expande por separado, así que la memoria queda acotada por el tamaño del
+    bloque y no por servicios × periodos.
+    """
+    if base is None:
+        base = _build_base(masters)
+    chunk_services = chunk_services or len(base) or 1
+    chunk_periods = chunk_periods or periods
+    for s_start in range(0, len(base), chunk_services):
+        block = base.iloc[s_start:s_start + chunk_services]
+        for p_start in range(1, periods + 1, chunk_periods):
+            yield _expand_periods(block, range(p_start, min(p_start + chunk_periods, periods + 1)))
+
+def iter_parquet_chunks(source: Path | list[Path], batch_rows: int = 250_000, columns: list[str] | None = None) -> Iterator[pd.DataFrame]:
+    """Lee uno o varios Parquet (o todos los de un directorio) por lotes de batch_rows filas."""
+    import pyarrow.parquet as pq
+
+    if isinstance(source, Path):
+        paths = sorted(source.rglob("*.parquet")) if source.is_dir() else [source]
+    else:
+        paths = list(source)
+    for path in paths:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+
+DATASET_PARTITION_ROWS = 1_000_000
+
+@profiled("write_dataset_partitions")
+def write_dataset_partitions(masters: dict[str, pd.DataFrame], out_dir: Path, periods: int, chunk_rows: int = DATASET_PARTITION_ROWS) -> Path:
+    """Escribe el dataset de build_dataset en out_dir como Parquet particionado, sin armarlo completo en memoria.
+
+    Cada archivo part-NNNNN.parquet es un bloque de servicios × periodos de a lo sumo chunk_rows filas,
+    con todos los periodos de cada servicio mientras quepan. Así cada parte (y cada lote que lee
+    train_streaming) mezcla periodos: con partes de un solo periodo el SGD terminaba ajustado a los
+    últimos periodos leídos. manifest.json, escrito al final, lista los archivos con su rango de
+    periodos. La memoria queda acotada por chunk_rows y la base por servicio, no por la cantidad de periodos.
+    """
+    base = _build_base(masters)
+    chunk_periods = max(1, min(periods, chunk_rows))
+    chunk_services = max(1, chunk_rows // chunk_periods)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "manifest.json").unlink(missing_ok=True)
+    for old in out_dir.glob("part-*.parquet"):
+        old.unlink()
+
+    parts, rows = [], 0
+    for i, chunk in enumerate(iter_dataset_chunks(None, periods, chunk_services=chunk_services, chunk_periods=chunk_periods, base=base)):
+        name = f"part-{i:05d}.parquet"
+        chunk.to_parquet(out_dir / name, index=False)
+        parts.append({"file": name, "periodos": [int(chunk["Periodo"].min()), int(chunk["Periodo"].max())], "rows": len(chunk)})
+        rows += len(chunk)
+
+    manifest = {"version": DATASET_STATE_VERSION, "periods": periods, "rows": rows, "columns": DATASET_KEEP_COLS, "parts": parts}
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return out_dir
+
+def iter_dataset_partitions(
+    dataset_dir: Path,
+    columns: list[str] | None = None,
+    periodos: tuple[int, int] | None = None,
+    batch_rows: int = 250_000,
+    shuffle: np.random.Generator | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Lee perezosamente las particiones de write_dataset_partitions, por lotes de batch_rows filas.
+
+    periodos=(desde, hasta) omite los archivos sin periodos en ese rango (los lotes pueden traer periodos
+    vecinos del mismo archivo). Con shuffle los archivos se leen en un orden aleatorio distinto en cada
+    llamada. Cada llamada devuelve un iterador nuevo, así que sirve como chunks de train_streaming.
+    """
+    manifest_path = dataset_dir / "manifest.json"
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"No existe {manifest_path}; genera las particiones con write_dataset_partitions")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("version") != DATASET_STATE_VERSION:
+        raise ValueError(f"Particiones de {dataset_dir} generadas con otra versión del dataset; vuelve a generarlas")
+    parts = manifest["parts"]
+    if periodos is not None:
+        parts = [p for p in parts if p["periodos"][0] <= periodos[1] and p["periodos"][1] >= periodos[0]]
+    if shuffle is not None:
+        parts = [parts[i] for i in shuffle.permutation(len(parts))]
+    return iter_parquet_chunks([dataset_dir / p["file"] for p in parts], batch_rows=batch_rows, columns=columns)
+
+def _median_from_counts(counts: pd.Series) -> float:
+    """Mediana exacta a partir de conteos {valor: frecuencia} (promedio de los centrales si n es par)."""
+    if counts.empty:
+        # Columna sin valores no nulos: SimpleImputer también devuelve NaN.
+        return np.nan
+    counts = counts.sort_index()
+    cum = counts.cumsum().to_numpy()
+    n = cum[-1]
+    lo = counts.index[np.searchsorted(cum, (n - 1) // 2, side="right")]
+    hi = counts.index[np.searchsorted(cum, n // 2, side="right")]
+    return (lo + hi) / 2.0
+
+def _mode_from_counts(counts: pd.Series):
+    """Valor más frecuente; ante empates el menor (mismo criterio que SimpleImputer)."""
+    return min(counts.index[counts.to_numpy() == counts.max()])
+
+class _StreamStats:
+    """Conteos exactos por valor (numéricos y categóricos) acumulados chunk a chunk."""
+
+    def __init__(self):
+        self.counts: dict[str, pd.Series] = {}
+        self.n_rows = 0
+        self.numeric: list[str] | None = None
+
+    def update(self, X: pd.DataFrame) -> None:
+        if self.numeric is None:
+            self.numeric = X.select_dtypes(include=["number"]).columns.tolist()
+        self.n_rows += len(X)
+        for col in X.columns:
+            vc = X[col].value_counts(dropna=True)
+            vc = vc[vc > 0]
+            prev = self.counts.get(col)
+            self.counts[col] = vc if prev is None else prev.add(vc, fill_value=0)
+
+    def preprocess(self) -> ColumnTransformer:
+        """ColumnTransformer ya ajustado con medianas, modas, media/varianza y vocabularios acumulados."""
+        categorical = [c for c in FEATURE_COLS if c not in self.numeric]
+        vocab = {c: sorted(self.counts[c].index) for c in categorical}
+        size = max([len(v) for v in vocab.values()] + [1])
+        prototype = pd.DataFrame({c: np.zeros(size) for c in self.numeric})
+        for c, values in vocab.items():
+            prototype[c] = np.resize(np.asarray(values, dtype=object), size)
+        preprocess = _build_pipeline(prototype[FEATURE_COLS]).named_steps["preprocess"].fit(prototype[FEATURE_COLS])
+
+        num = preprocess.named_transformers_["num"]
+        medians, means, variances = [], [], []
+        for c in self.numeric:
+            counts = self.counts[c]
+            median = _median_from_counts(counts)
+            missing = self.n_rows - counts.sum()
+            values = np.append(counts.index.to_numpy(dtype=float), median)
+            weights = np.append(counts.to_numpy(dtype=float), missing)
+            mean = np.average(values, weights=weights)
+            medians.append(median)
+            means.append(mean)
+            variances.append(np.average((values - mean) ** 2, weights=weights))
+        num.named_steps["imputer"].statistics_ = np.asarray(medians, dtype=float)
+        # SimpleImputer descarta las columnas sin ningún valor (mediana NaN): el scaler no las ve.
+        kept = ~np.isnan(num.named_steps["imputer"].statistics_)
+        scaler = num.named_steps["scaler"]
+        scaler.mean_ = np.asarray(means)[kept]
+        scaler.var_ = np.asarray(variances)[kept]
+        scaler.n_features_in_ = int(kept.sum())
+        scaler.scale_ = np.where(scaler.var_ > 0, np.sqrt(scaler.var_), 1.0)
+        scaler.n_samples_seen_ = self.n_rows
+
+        cat = preprocess.named_transformers_["cat"]
+        cat.named_steps["imputer"].statistics_ = np.asarray([_mode_from_counts(self.counts[c]) for c in categorical], dtype=object)
+        return preprocess
+
+def stream_model_filenames(target: str) -> tuple[str, str]:
+    """(modelo, métricas) de train_streaming; Stockout14d conserva metrics_stream.json."""
+    suffix = "" if target == "Stockout14d" else f"_{target.lower()}"
+    return f"{target.lower()}_sgd_stream.joblib", f"metrics_stream{suffix}.json"
+
+def train_streaming(chunks: Callable[[], Iterable[pd.DataFrame]], models_dir: Path, epochs: int = 3, target: str = "Stockout14d"):
+    """Entrena fuera de memoria con SGD (log_loss) sobre un iterable de chunks que puede recorrerse varias veces.
+
+    chunks es una función que devuelve un iterable nuevo en cada llamada (p.ej. iter_parquet_chunks o
+    iter_dataset_chunks). Pasadas: (1) ServicioID para el GroupShuffleSplit, con la misma semántica que
+    train_or_load_model; (2) estadísticas de imputación/escalado/vocabularios sobre el train; (3) epochs
+    de partial_fit; (4) evaluación sobre el test. Guarda los archivos de stream_model_filenames(target)
+    (stockout14d_sgd_stream.joblib + metrics_stream.json para el target por defecto).
+
+    partial_fit solo baraja filas dentro de cada chunk: los chunks deben mezclar periodos y servicios
+    (write_dataset_partitions ya lo hace; iter_dataset_partitions(..., shuffle=rng) además cambia el orden
+    de las partes en cada época).
+    """
+    models_dir.mkdir(exist_ok=True, parents=True)
+
+    groups, pos = {}, {}
+    for chunk in chunks():
+        sid = chunk["ServicioID"].astype(str)
+        y = chunk[target].astype(int)
+        for key, n in sid.value_counts().items():
+            groups[key] = groups.get(key, 0) + int(n)
+        for key, n in sid[y == 1].value_counts().items():
+            pos[key] = pos.get(key, 0) + int(n)
+
+    ids = np.array(sorted(groups))
+    gss = GroupShuffleSplit(n_splits=1, **SPLIT_PARAMS)
+    _, test_idx = next(gss.split(ids, groups=ids))
+    test_ids = set(ids[test_idx])
+
+    n_train = sum(n for k, n in groups.items() if k not in test_ids)
+    n_pos = sum(n for k, n in pos.items() if k not in test_ids)
+    class_weight = {0: n_train / (2.0 * max(n_train - n_pos, 1)), 1: n_train / (2.0 * max(n_pos, 1))}
+
+    def train_test(chunk: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        is_test = chunk["ServicioID"].astype(str).isin(test_ids).to_numpy()
+        return chunk[~is_test], chunk[is_test]
+
+    stats = _StreamStats()
+    for chunk in chunks():
+        stats.update(train_test(chunk)[0][FEATURE_COLS])
+    preprocess = stats.preprocess()
+
+    clf = SGDClassifier(class_weight=class_weight, **STREAMING_PARAMS)
+    rng = np.random.default_rng(STREAMING_PARAMS["random_state"])
+    for _ in range(epochs):
+        for chunk in chunks():
+            train = train_test(chunk)[0]
+            if train.empty:
+                continue
+            order = rng.permutation(len(train))
+            Xt = preprocess.transform(train[FEATURE_COLS])[order]
+            clf.partial_fit(Xt, train[target].to_numpy(dtype=int)[order], classes=np.array([0, 1]))
+
+    pipe = Pipeline(steps=[("preprocess", preprocess), ("clf", clf)])
+    y_parts, proba_parts = [], []
+    for chunk in chunks():
+        test = train_test(chunk)[1]
+        if not test.empty:
+            y_parts.append(test[target].to_numpy(dtype=int))
+            proba_parts.append(pipe.predict_proba(test[FEATURE_COLS])[:, 1])
+    metrics_obj = _evaluation_metrics(np.concatenate(y_parts), np.concatenate(proba_parts))
+
+    model_name, metrics_name = stream_model_filenames(target)
+    joblib.dump(pipe, models_dir / model_name)
+    (models_dir / metrics_name).write_text(json.dumps(metrics_obj, indent=2), encoding="utf-8")
+    return pipe, _metrics_result(metrics_obj)
+
+
+def export_scorer(model: Pipeline, path: Path) -> Path:
+    """Compila el Pipeline entrenado a un artefacto JSON para wms_scorer.StockoutScorer (solo NumPy).
+
+    Guarda medianas/modas de imputación, media y escala del StandardScaler, los vocabularios one-hot
+    como diccionarios {categoría: coeficiente} y los coeficientes numéricos de la regresión.
+    """
+    from wms_scorer import SCORER_FORMAT, SCORER_VERSION
+
+    preprocess = model.named_steps["preprocess"]
+    clf = model.named_steps["clf"]
+    coef = clf.coef_.ravel()
+    transformers = {name: (pipe, cols) for name, pipe, cols in preprocess.transformers_ if name in ("num", "cat")}
+
+    num_pipe, num_cols = transformers["num"]
+    num_fill = num_pipe.named_steps["imputer"].statistics_
+    num_kept = [c for c, v in zip(num_cols, num_fill) if not pd.isna(v)]
+    scaler = num_pipe.named_steps["scaler"]
+    n_num = len(num_kept)
+
+    cat_pipe, cat_cols = transformers["cat"]
+    cat_fill = cat_pipe.named_steps["imputer"].statistics_
+    cat_kept = [c for c, v in zip(cat_cols, cat_fill) if not pd.isna(v)]
+    onehot = cat_pipe.named_steps["onehot"]
+    weights, offset = [], n_num
+    for cats in onehot.categories_:
+        weights.append({str(v): float(w) for v, w in zip(cats, coef[offset:offset + len(cats)])})
+        offset += len(cats)
+    if offset != len(coef):
+        raise ValueError("El Pipeline no tiene la estructura esperada (num + cat one-hot)")
+
+    spec = {
+        "format": SCORER_FORMAT,
+        "version": SCORER_VERSION,
+        "feature_cols": list(FEATURE_COLS),
+        "numeric": {
+            "columns": num_kept,
+            "fill": [float(v) for v in num_fill if not pd.isna(v)],
+            "mean": scaler.mean_.tolist(),
+            "scale": scaler.scale_.tolist(),
+            "coef": coef[:n_num].tolist(),
+        },
+        "categorical": {
+            "columns": cat_kept,
+            "fill": [str(v) for v in cat_fill if not pd.isna(v)],
+            "weights": weights,
+        },
+        "intercept": float(clf.intercept_[0]),
     }
+    path.parent.mkdir(exist_ok=True, parents=True)
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return path
 
 
+RISK_ALTO = 0.70
+RISK_MEDIO = 0.40
+
 def _risk_message(prob: float, horizonte: int) -> str:
     """Genera mensaje de riesgo según probabilidad (>=0.7 ALTO, >=0.4 MEDIO, <0.4 BAJO)."""
-    if prob >= 0.70:
+    if prob >= RISK_ALTO:
         return f"Riesgo ALTO de rotura en {horizonte} días. Acción sugerida: generar reabastecimiento inmediato y priorizar recepción."
-    if prob >= 0.40:
+    if prob >= RISK_MEDIO:
         return f"Riesgo MEDIO de rotura en {horizonte} días. Acción sugerida: monitoreo diario y validar recepción pendiente."
     return f"Riesgo BAJO de rotura en {horizonte} días. Acción sugerida: operación normal y revisión periódica."
 
-def predict_from_dataset_row(model: Pipeline, row: pd.Series) -> dict:
+def select_model(model: Pipeline | Mapping[int, Pipeline], horizonte: int) -> Pipeline:
+    """Devuelve el modelo del horizonte pedido si model es la familia {horizonte: pipeline} de train_or_load_models."""
+    if not isinstance(model, Mapping):
+        return model
+    try:
+        return model[int(horizonte)]
+    except KeyError:
+        raise ValueError(f"No hay modelo para horizonte {horizonte}; disponibles: {sorted(model)}") from None
+
+@profiled("predict_from_dataset_row")
+def predict_from_dataset_row(model: Pipeline | Mapping[int, Pipeline], row: pd.Series, horizonte: int = 14) -> dict:
     """Predice probabilidad de stockout desde una fila del dataset."""
     X = pd.DataFrame([row[FEATURE_COLS].to_dict()])
-    prob = float(model.predict_proba(X)[:, 1][0])
-    return {"prob": prob, "mensaje": _risk_message(prob, 14)}
+    prob = float(select_model(model, horizonte).predict_proba(X)[:, 1][0])
+    return {"prob": prob, "mensaje": _risk_message(prob, horizonte)}
 
-def predict_from_form(model: Pipeline, base_row: pd.Series, stock: int, demanda: float, dias_rec: int, rec_pend: int, horizonte: int) -> dict:
-    """Predice probabilidad de stockout desde inputs de formulario (operador WMS)."""
-    payload = base_row[FEATURE_COLS].to_dict()
+@profiled("predict_from_form")
+def predict_from_form(model: Pipeline | Mapping[int, Pipeline], base_row: pd.Series | Mapping, stock: int, demanda: float, dias_rec: int, rec_pend: int, horizonte: int) -> dict:
+    """Predice probabilidad de stockout desde inputs de formulario (operador WMS).
+
+    base_row puede ser una fila del dataset o el dict de FeatureStore.get(ServicioID, Periodo).
+    Si model es la familia {horizonte: pipeline}, se usa el modelo entrenado para horizonte.
+    """
+    payload = {col: base_row[col] for col in FEATURE_COLS}
     payload["StockActual"] = int(stock)
     payload["DemandaDiariaEst"] = float(demanda)
     payload["DiasHastaRecepcion"] = int(dias_rec)
     payload["RecepcionPendiente"] = int(rec_pend)
 
     X = pd.DataFrame([payload])
-    prob = float(model.predict_proba(X)[:, 1][0])
+    prob = float(select_model(model, horizonte).predict_proba(X)[:, 1][0])
     return {"prob": prob, "mensaje": _risk_message(prob, horizonte)}
+
+def _risk_level(prob: np.ndarray) -> np.ndarray:
+    """Nivel de riesgo vectorizado con los mismos umbrales que _risk_message."""
+    return np.select([prob >= RISK_ALTO, prob >= RISK_MEDIO], ["ALTO", "MEDIO"], default="BAJO")
+
+@profiled("predict_batch", rows_arg=1)
+def predict_batch(model: Pipeline, df: pd.DataFrame, chunk_size: int = 100_000) -> pd.DataFrame:
+    """Predice probabilidad de stockout para todas las filas de df, por bloques de chunk_size.
+
+    Devuelve un DataFrame con el mismo índice que df y columnas prob y riesgo (ALTO/MEDIO/BAJO).
+    """
+    prob = np.empty(len(df), dtype=float)
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        prob[start:start + len(chunk)] = model.predict_proba(chunk[FEATURE_COLS])[:, 1]
+    riesgo = pd.Categorical(_risk_level(prob), categories=["BAJO", "MEDIO", "ALTO"], ordered=True)
+    return pd.DataFrame({"prob": prob, "riesgo": riesgo}, index=df.index)
+
+@profiled("score_chunks")
+def score_chunks(model: Pipeline, chunks: Iterable[pd.DataFrame], output: Path, monitor=None) -> dict[str, int]:
+    """Puntúa chunks (p.ej. iter_dataset_partitions) y los agrega a output (.parquet o .csv) sin juntarlos en memoria.
+
+    Escribe ServicioID, Periodo, prob y riesgo por fila; devuelve el conteo de filas por nivel de riesgo.
+    Si monitor es un wms_monitoring.DriftMonitor, cada chunk puntuado se agrega a su ventana.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    suffix = output.suffix.lower()
+    if suffix not in (".parquet", ".csv"):
+        raise ValueError("output debe terminar en .parquet o .csv")
+    output.parent.mkdir(exist_ok=True, parents=True)
+    output.unlink(missing_ok=True)
+
+    counts = {"BAJO": 0, "MEDIO": 0, "ALTO": 0}
+    writer = None
+    try:
+        for chunk in chunks:
+            out = chunk[["ServicioID", "Periodo"]].join(predict_batch(model, chunk))
+            if monitor is not None:
+                monitor.update(chunk)
+            for level, n in out["riesgo"].value_counts().items():
+                counts[level] += int(n)
+            if suffix == ".csv":
+                out.to_csv(output, mode="a", header=writer is None, index=False)
+                writer = True
+                continue
+            table = pa.Table.from_pandas(out, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema)
+            writer.write_table(table.replace_schema_metadata(writer.schema.metadata))
+    finally:
+        if isinstance(writer, pq.ParquetWriter):
+            writer.close()
+    return counts
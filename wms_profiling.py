@@ -0,0 +1,208 @@
+"""
+Instrumentación opcional del pipeline: tiempo de pared, filas de entrada/salida y pico de memoria por etapa.
+Desactivada por defecto; con WMS_PROFILE=<ruta.jsonl> (o enable()) cada etapa terminada se agrega como
+una línea JSON al log y queda en memoria para summary(). Desactivada, @profiled llama directo a la
+función y stage() devuelve un contexto vacío compartido.
+
+El pico de memoria se mide con tracemalloc (memoria de Python/NumPy asignada por encima del inicio de
+la etapa, incluyendo sub-etapas). tracemalloc hace más lentas las asignaciones: con WMS_PROFILE_MEMORY=0
+(o enable(memory=False)) solo se registran tiempos y filas.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MAX_RECORDS = 10_000
+
+_enabled = False
+_memory = False
+_log_path: Path | None = None
+_records: deque = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class _NoopStage:
+    """Etapa vacía compartida cuando la instrumentación está desactivada; ignora rows_in/rows_out."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopStage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def __setattr__(self, name, value) -> None:
+        pass
+
+_NOOP = _NoopStage()
+
+
+def enable(log_path: Path | str | None = None, memory: bool = True) -> None:
+    """Activa la instrumentación; si log_path no es None, cada etapa se agrega como línea JSON."""
+    global _enabled, _memory, _log_path
+    _log_path = Path(log_path) if log_path else None
+    if _log_path is not None:
+        _log_path.parent.mkdir(parents=True, exist_ok=True)
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+def log_path() -> Path | None:
+    return _log_path
+
+
+def count_rows(obj) -> int | None:
+    """Filas de un DataFrame/Series/array/lista, suma de un dict de DataFrames o largo de un dict de columnas."""
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray, list)):
+        return len(obj)
+    if isinstance(obj, dict) and obj:
+        values = list(obj.values())
+        if all(isinstance(v, pd.DataFrame) for v in values):
+            return sum(len(v) for v in values)
+        if isinstance(values[0], np.ndarray):
+            return len(values[0])
+    if isinstance(obj, tuple) and obj:
+        return count_rows(obj[0])
+    return None
+
+
+class _Stage:
+    """Etapa en curso; rows_in/rows_out pueden asignarse dentro del bloque with."""
+
+    __slots__ = ("name", "rows_in", "rows_out", "parent", "_t0", "_mem0", "_child_peak")
+
+    def __init__(self, name: str, rows_in: int | None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self) -> "_Stage":
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        if _memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                # El pico acumulado hasta aquí pertenece al padre; se reinicia para medir esta etapa.
+                self.parent._child_peak = max(self.parent._child_peak, peak)
+            tracemalloc.reset_peak()
+            self._mem0 = current
+        else:
+            self._mem0 = None
+        self._child_peak = 0
+        stack.append(self)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        wall_ms = (time.perf_counter() - self._t0) * 1000
+        _stack().pop()
+        peak_mb = None
+        if self._mem0 is not None and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], self._child_peak)
+            if self.parent is not None:
+                self.parent._child_peak = max(self.parent._child_peak, peak)
+            peak_mb = round(max(peak - self._mem0, 0) / 2**20, 3)
+        _emit({
+            "ts": round(time.time(), 3),
+            "pid": os.getpid(),
+            "stage": self.name,
+            "parent": self.parent.name if self.parent is not None else None,
+            "wall_ms": round(wall_ms, 3),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "peak_mb": peak_mb,
+            "error": exc_type.__name__ if exc_type is not None else None,
+        })
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def _emit(record: dict) -> None:
+    with _lock:
+        _records.append(record)
+        if _log_path is not None:
+            with _log_path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def stage(name: str, rows_in: int | None = None):
+    """Context manager que mide un bloque como etapa name (no hace nada si la instrumentación está desactivada)."""
+    if not _enabled:
+        return _NOOP
+    return _Stage(name, rows_in)
+
+def profiled(name: str, rows_arg: int = 0):
+    """Decorador: mide cada llamada como etapa name; rows_in del argumento posicional rows_arg y rows_out del resultado."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Stage(name, count_rows(args[rows_arg]) if len(args) > rows_arg else None) as rec:
+                result = fn(*args, **kwargs)
+                rec.rows_out = count_rows(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def records() -> list[dict]:
+    """Etapas registradas en este proceso (las últimas MAX_RECORDS)."""
+    with _lock:
+        return list(_records)
+
+def read_log(path: Path | str) -> pd.DataFrame:
+    """Lee un log JSON-lines de etapas; ignora líneas truncadas."""
+    rows = []
+    with Path(path).open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                continue
+    return pd.DataFrame(rows)
+
+def summary(data: pd.DataFrame | list[dict] | None = None) -> pd.DataFrame:
+    """Resumen por etapa: llamadas, tiempo total/medio/p95/máximo, filas y pico de memoria máximo."""
+    df = pd.DataFrame(records() if data is None else data)
+    if df.empty:
+        return pd.DataFrame(columns=["etapa", "llamadas", "total_ms", "media_ms", "p95_ms", "max_ms", "filas_in", "filas_out", "pico_mb"])
+    out = df.groupby("stage", sort=False).agg(
+        llamadas=("wall_ms", "size"),
+        total_ms=("wall_ms", "sum"),
+        media_ms=("wall_ms", "mean"),
+        p95_ms=("wall_ms", lambda s: s.quantile(0.95)),
+        max_ms=("wall_ms", "max"),
+        filas_in=("rows_in", "max"),
+        filas_out=("rows_out", "max"),
+        pico_mb=("peak_mb", "max"),
+    )
+    out = out.sort_values("total_ms", ascending=False).round(3).reset_index().rename(columns={"stage": "etapa"})
+    return out
+
+
+if os.environ.get("WMS_PROFILE"):
+    enable(os.environ["WMS_PROFILE"], memory=os.environ.get("WMS_PROFILE_MEMORY", "1") != "0")
@@ -0,0 +1,304 @@
+"""
+Motor de calidad de datos por chunks para maestros grandes.
+Cada chunk produce agregados parciales combinables (nulos por columna, sketch de IDs distintos,
+RUC inválidos y chequeos de tipo/rango de las columnas numéricas); los chunks se procesan en un
+pool de procesos y se combinan al final. Las fuentes pueden ser DataFrames en memoria o archivos
+Parquet (p.ej. la cache de load_masters), que se leen por row group dentro de cada proceso.
+"""
+from __future__ import annotations
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Columna ID por maestro.
+ID_COLS = {"clientes": "ClienteID", "proveedores": "ProveedorID", "servicios": "ServicioID"}
+
+# Reglas para las columnas que load_masters convierte a número: (mínimo, máximo, debe ser entero).
+NUMERIC_RULES = {
+    "clientes": {
+        "LimiteCredito": (0, None, False),
+    },
+    "proveedores": {
+        "LeadTimePromedioDias": (0, 365, True),
+        "ToleranciaEntregaDias": (0, 60, True),
+        "RatingDesempeno": (0, 5, False),
+        "DiasPago": (0, 365, True),
+        "LimiteCredito": (0, None, False),
+    },
+    "servicios": {
+        "TarifaBase": (0, None, False),
+        "LeadTimeMinDias": (0, 365, True),
+        "LeadTimeMaxDias": (0, 365, True),
+        "TiempoEjecucionHoras": (0, None, True),
+        "CantidadPedidoEstandar": (0, None, True),
+        "CostoEstandar": (0, None, False),
+        "TarifaImpuesto": (0, 100, False),
+    },
+}
+
+RUC_PATTERN = r"\d{11}"
+DEFAULT_CHUNK_ROWS = 250_000
+
+
+class DistinctSketch:
+    """Conteo de valores distintos combinable: exacto hasta exact_limit hashes, luego HyperLogLog (2^p registros)."""
+
+    def __init__(self, p: int = 14, exact_limit: int = 1_000_000):
+        self.p = p
+        self.exact_limit = exact_limit
+        self._hashes: np.ndarray | None = np.empty(0, dtype=np.uint64)
+        self._registers: np.ndarray | None = None
+
+    @staticmethod
+    def hash_values(values: pd.Series) -> np.ndarray:
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Se hashea una vez cada categoría presente en el chunk (no todas las del dtype).
+            codes = values.cat.codes.to_numpy()
+            used = np.unique(codes[codes >= 0])
+            return pd.util.hash_array(np.asarray(values.cat.categories[used].astype(str), dtype=object))
+        values = values.dropna()
+        return pd.util.hash_array(np.asarray(values.astype(str), dtype=object))
+
+    def add(self, values: pd.Series) -> "DistinctSketch":
+        hashes = self.hash_values(values)
+        if self._registers is None:
+            self._hashes = np.union1d(self._hashes, hashes)
+            if len(self._hashes) > self.exact_limit:
+                self._to_hll()
+        else:
+            self._add_hll(hashes)
+        return self
+
+    def _to_hll(self) -> None:
+        self._registers = np.zeros(1 << self.p, dtype=np.uint8)
+        self._add_hll(self._hashes)
+        self._hashes = None
+
+    def _add_hll(self, hashes: np.ndarray) -> None:
+        bucket = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # Con p >= 12 rest < 2^52 cabe exacto en float64, así frexp da su bit_length sin error.
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = (64 - self.p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self._registers, bucket, rank)
+
+    def merge(self, other: "DistinctSketch") -> "DistinctSketch":
+        if self._registers is None and other._registers is None:
+            self._hashes = np.union1d(self._hashes, other._hashes)
+            if len(self._hashes) > self.exact_limit:
+                self._to_hll()
+            return self
+        if self._registers is None:
+            self._to_hll()
+        if other._registers is None:
+            self._add_hll(other._hashes)
+        else:
+            np.maximum(self._registers, other._registers, out=self._registers)
+        return self
+
+    @property
+    def exact(self) -> bool:
+        return self._registers is None
+
+    def estimate(self) -> int:
+        if self._registers is None:
+            return int(len(self._hashes))
+        m = float(len(self._registers))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self._registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self._registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+def _numeric_partial(s: pd.Series, rule: tuple) -> dict:
+    """Tipo y rango de una columna numérica en un chunk."""
+    lo, hi, integer = rule
+    present = s.notna()
+    values = pd.to_numeric(s, errors="coerce")
+    no_numericos = int((present & values.isna()).sum())
+    v = values.dropna().to_numpy(dtype=np.float64)
+    fuera = np.zeros(len(v), dtype=bool)
+    if lo is not None:
+        fuera |= v < lo
+    if hi is not None:
+        fuera |= v > hi
+    return {
+        "dtype": str(s.dtype),
+        "no_nulos": len(v),
+        "min": float(v.min()) if len(v) else np.nan,
+        "max": float(v.max()) if len(v) else np.nan,
+        "no_numericos": no_numericos,
+        "no_enteros": int((v != np.round(v)).sum()) if integer else 0,
+        "fuera_rango": int(fuera.sum()),
+    }
+
+def _invalid_ruc_count(series: pd.Series) -> int:
+    """Cuenta cuántos RUC no tienen exactamente 11 dígitos."""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        v = series.to_numpy()
+        return int(((v < 10**10) | (v >= 10**11)).sum())
+    s = series.astype(str).str.strip().replace({"nan": np.nan, "None": np.nan, "": np.nan}).dropna()
+    return int((~s.str.fullmatch(RUC_PATTERN)).sum())
+
+def _chunk_stats(master: str, df: pd.DataFrame, p: int = 14, exact_limit: int = 1_000_000) -> dict:
+    """Agregados parciales de un chunk de un maestro."""
+    id_col = ID_COLS.get(master)
+    sketch = DistinctSketch(p, exact_limit)
+    if id_col in df.columns:
+        sketch.add(df[id_col])
+    ruc_invalidos = None
+    if master == "proveedores" and "RUC" in df.columns:
+        ruc_invalidos = _invalid_ruc_count(df["RUC"])
+    rules = NUMERIC_RULES.get(master, {})
+    return {
+        "rows": len(df),
+        "columns": list(df.columns),
+        "nulls": df.isna().sum().to_numpy(dtype=np.int64),
+        "sketch": sketch,
+        "ruc_invalidos": ruc_invalidos,
+        "numeric": {col: _numeric_partial(df[col], rule) for col, rule in rules.items() if col in df.columns},
+    }
+
+def _parquet_chunk_stats(master: str, path: str, row_group: int, p: int, exact_limit: int) -> dict:
+    import pyarrow.parquet as pq
+    df = pq.ParquetFile(path).read_row_group(row_group).to_pandas()
+    return _chunk_stats(master, df, p, exact_limit)
+
+# DataFrames compartidos con los procesos hijos vía fork (sin serializar cada chunk).
+_SHARED_SOURCES: dict[str, pd.DataFrame] = {}
+
+def _shared_chunk_stats(master: str, start: int, stop: int, p: int, exact_limit: int) -> dict:
+    return _chunk_stats(master, _SHARED_SOURCES[master].iloc[start:stop], p, exact_limit)
+
+def _merge_numeric(a: dict, b: dict) -> dict:
+    return {
+        "dtype": a["dtype"],
+        "no_nulos": a["no_nulos"] + b["no_nulos"],
+        "min": np.fmin(a["min"], b["min"]),
+        "max": np.fmax(a["max"], b["max"]),
+        "no_numericos": a["no_numericos"] + b["no_numericos"],
+        "no_enteros": a["no_enteros"] + b["no_enteros"],
+        "fuera_rango": a["fuera_rango"] + b["fuera_rango"],
+    }
+
+def merge_stats(a: dict, b: dict) -> dict:
+    """Combina dos agregados parciales del mismo maestro (mismas columnas)."""
+    ruc = None if a["ruc_invalidos"] is None and b["ruc_invalidos"] is None else (a["ruc_invalidos"] or 0) + (b["ruc_invalidos"] or 0)
+    numeric = dict(a["numeric"])
+    for col, stats in b["numeric"].items():
+        numeric[col] = _merge_numeric(numeric[col], stats) if col in numeric else stats
+    return {
+        "rows": a["rows"] + b["rows"],
+        "columns": a["columns"],
+        "nulls": a["nulls"] + b["nulls"],
+        "sketch": a["sketch"].merge(b["sketch"]),
+        "ruc_invalidos": ruc,
+        "numeric": numeric,
+    }
+
+
+def _tasks(master: str, source: pd.DataFrame | Path, chunk_rows: int, shared: bool) -> list[tuple]:
+    """(función, args) por chunk: rangos de filas del DataFrame o row groups del Parquet."""
+    if isinstance(source, pd.DataFrame):
+        starts = range(0, max(len(source), 1), chunk_rows)
+        if shared:
+            return [(_shared_chunk_stats, (master, start, start + chunk_rows)) for start in starts]
+        return [(_chunk_stats, (master, source.iloc[start:start + chunk_rows])) for start in starts]
+    import pyarrow.parquet as pq
+    n_groups = pq.ParquetFile(source).metadata.num_row_groups
+    return [(_parquet_chunk_stats, (master, str(source), i)) for i in range(max(n_groups, 1))]
+
+def collect_stats(sources: dict[str, pd.DataFrame | Path], chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int | None = None, p: int = 14, exact_limit: int = 1_000_000) -> dict[str, dict]:
+    """Agregados combinados por maestro. Si cada maestro cabe en un chunk (o workers=1) no se abre el pool."""
+    workers = workers or os.cpu_count() or 1
+    # Con fork los hijos heredan los DataFrames y solo reciben (maestro, inicio, fin).
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    tasks = [(master, fn, args) for master, source in sources.items() for fn, args in _tasks(master, source, chunk_rows, fork)]
+    if workers == 1 or len(tasks) <= len(sources):
+        _SHARED_SOURCES.update({k: v for k, v in sources.items() if isinstance(v, pd.DataFrame)})
+        try:
+            partials = [(master, fn(*args, p, exact_limit)) for master, fn, args in tasks]
+        finally:
+            _SHARED_SOURCES.clear()
+    else:
+        _SHARED_SOURCES.update({k: v for k, v in sources.items() if isinstance(v, pd.DataFrame)})
+        try:
+            context = multiprocessing.get_context("fork") if fork else None
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as pool:
+                futures = [(master, pool.submit(fn, *args, p, exact_limit)) for master, fn, args in tasks]
+                partials = [(master, f.result()) for master, f in futures]
+        finally:
+            _SHARED_SOURCES.clear()
+
+    merged: dict[str, dict] = {}
+    for master, stats in partials:
+        merged[master] = merge_stats(merged[master], stats) if master in merged else stats
+    return merged
+
+
+def _top_missing(stats: dict, topn: int = 10) -> pd.DataFrame:
+    miss = pd.Series(stats["nulls"] / max(stats["rows"], 1), index=stats["columns"]).sort_values(ascending=False)
+    miss = miss[miss > 0].head(topn)
+    return pd.DataFrame({"Campo": miss.index, "% Nulos": (miss.values * 100).round(2)})
+
+def _range_report(all_stats: dict[str, dict]) -> pd.DataFrame:
+    rows = []
+    for master, stats in all_stats.items():
+        for col, n in stats["numeric"].items():
+            lo, hi, integer = NUMERIC_RULES[master][col]
+            rows.append({
+                "Maestro": master.capitalize(),
+                "Campo": col,
+                "Tipo": n["dtype"],
+                "Rango esperado": f"[{lo if lo is not None else '-∞'}, {hi if hi is not None else '∞'}]" + (" entero" if integer else ""),
+                "No nulos": n["no_nulos"],
+                "Mín": n["min"],
+                "Máx": n["max"],
+                "No numéricos": n["no_numericos"],
+                "No enteros": n["no_enteros"],
+                "Fuera de rango": n["fuera_rango"],
+            })
+    return pd.DataFrame(rows)
+
+def quality_report(sources: dict[str, pd.DataFrame | Path], chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int | None = None) -> dict[str, pd.DataFrame]:
+    """resumen, top_nulos_* y rangos de los maestros clientes/proveedores/servicios."""
+    stats = collect_stats(sources, chunk_rows=chunk_rows, workers=workers)
+    cli, prov, srv = stats["clientes"], stats["proveedores"], stats["servicios"]
+
+    resumen = pd.DataFrame([
+        {
+            "Maestro": "Clientes",
+            "Registros": cli["rows"],
+            "IDs únicos": cli["sketch"].estimate(),
+            "Duplicados por ID (raw deducido)": 0,
+            "Nulos totales": int(cli["nulls"].sum()),
+        },
+        {
+            "Maestro": "Proveedores",
+            "Registros": prov["rows"],
+            "IDs únicos": prov["sketch"].estimate(),
+            "Nulos totales": int(prov["nulls"].sum()),
+            "RUC inválidos (≠11 dígitos)": prov["ruc_invalidos"] or 0,
+        },
+        {
+            "Maestro": "Servicios",
+            "Registros": srv["rows"],
+            "IDs únicos": srv["sketch"].estimate(),
+            "Nulos totales": int(srv["nulls"].sum()),
+        }
+    ])
+
+    return {
+        "resumen": resumen,
+        "top_nulos_clientes": _top_missing(cli),
+        "top_nulos_proveedores": _top_missing(prov),
+        "top_nulos_servicios": _top_missing(srv),
+        "rangos": _range_report(stats),
+    }
@@ -0,0 +1,124 @@
+"""
+Escenarios "what-if" para planificación: evalúa una grilla de StockActual × DiasHastaRecepcion ×
+DemandaDiariaEst × RecepcionPendiente para uno o más servicios con una sola llamada a predict_batch,
+en lugar de repetir predict_from_form combinación por combinación.
+
+El resto de las features de cada servicio se toma de su fila base (del dataset o de FeatureStore.get).
+Por defecto el stock recorre 0..2 × CantidadPedidoEstandar de cada servicio, los días hasta la
+recepción 0..45 y la demanda y la recepción pendiente quedan en los valores actuales del servicio.
+Además de la superficie de riesgo, stock_minimo devuelve el menor stock de la grilla desde el cual la
+probabilidad queda bajo los umbrales ALTO y MEDIO para cada combinación de las demás variables.
+"""
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from wms_pipeline import FEATURE_COLS, RISK_ALTO, RISK_MEDIO, predict_batch, select_model, target_col
+from wms_profiling import profiled
+
+SCENARIO_COLS = ["DiasHastaRecepcion", "DemandaDiariaEst", "RecepcionPendiente", "StockActual"]
+DEFAULT_DIAS_REC = range(0, 46)
+DEFAULT_STOCK_POINTS = 21
+DEFAULT_STOCK_FACTOR = 2.0
+
+
+def _base_frame(base_rows: pd.DataFrame | Sequence[Mapping]) -> pd.DataFrame:
+    base = base_rows if isinstance(base_rows, pd.DataFrame) else pd.DataFrame(list(base_rows))
+    missing = [c for c in FEATURE_COLS + ["ServicioID"] if c not in base.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas en las filas base: {missing}")
+    if base.empty:
+        raise ValueError("Se necesita al menos una fila base")
+    return base.reset_index(drop=True)
+
+def _axis(values, current: np.ndarray) -> np.ndarray:
+    """Eje de la grilla por servicio (servicios × k): los valores dados para todos, o el valor actual de cada uno."""
+    if values is None:
+        return current.astype(np.float64)[:, None]
+    values = np.unique(np.asarray(values, dtype=np.float64))
+    if values.ndim != 1 or len(values) == 0:
+        raise ValueError("Cada eje de la grilla debe ser una secuencia no vacía de números")
+    return np.broadcast_to(values, (len(current), len(values)))
+
+def stock_axis(base: pd.DataFrame, points: int = DEFAULT_STOCK_POINTS, factor: float = DEFAULT_STOCK_FACTOR) -> np.ndarray:
+    """Stock de 0 a factor × CantidadPedidoEstandar de cada servicio en points pasos enteros (servicios × points)."""
+    qty = pd.to_numeric(base["CantidadPedidoEstandar"], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    top = np.maximum(np.round(factor * qty), points - 1)
+    return np.round(np.linspace(0.0, 1.0, points)[None, :] * top[:, None])
+
+@profiled("scenario_grid", rows_arg=1)
+def scenario_grid(
+    model: Pipeline | Mapping[int, Pipeline],
+    base_rows: pd.DataFrame | Sequence[Mapping],
+    horizonte: int = 14,
+    stock=None,
+    dias_rec=DEFAULT_DIAS_REC,
+    demanda=None,
+    rec_pend=None,
+    stock_points: int = DEFAULT_STOCK_POINTS,
+    stock_factor: float = DEFAULT_STOCK_FACTOR,
+    simulacion: bool = False,
+) -> pd.DataFrame:
+    """Superficie de riesgo: una fila por servicio × combinación de la grilla, con prob y riesgo.
+
+    stock, dias_rec, demanda y rec_pend son secuencias de valores (comunes a todos los servicios);
+    None usa el valor actual de cada servicio, salvo stock, que por defecto es
+    stock_axis(base, stock_points, stock_factor).
+    Toda la grilla se puntúa con una sola llamada a predict_batch. Con simulacion=True agrega ProbSim,
+    la probabilidad Monte Carlo de wms_simulation para las mismas combinaciones (números aleatorios
+    comunes, así las diferencias entre escenarios no dependen del ruido).
+    """
+    base = _base_frame(base_rows)
+    n = len(base)
+    axes = {
+        "DiasHastaRecepcion": _axis(dias_rec, base["DiasHastaRecepcion"].to_numpy()),
+        "DemandaDiariaEst": _axis(demanda, base["DemandaDiariaEst"].to_numpy()),
+        "RecepcionPendiente": _axis(rec_pend, base["RecepcionPendiente"].to_numpy()),
+        "StockActual": stock_axis(base, stock_points, stock_factor) if stock is None else _axis(stock, base["StockActual"].to_numpy()),
+    }
+    # Orden de la grilla: servicio, luego los ejes de SCENARIO_COLS; StockActual varía más rápido.
+    shape = (n,) + tuple(axes[c].shape[1] for c in SCENARIO_COLS)
+    idx = np.indices(shape).reshape(len(shape), -1)
+    srv = idx[0]
+
+    grid = base[["ServicioID"] + FEATURE_COLS].iloc[srv].reset_index(drop=True)
+    for k, col in enumerate(SCENARIO_COLS, start=1):
+        # Enteros como en predict_from_form, salvo la demanda.
+        values = axes[col][srv, idx[k]]
+        grid[col] = values if col == "DemandaDiariaEst" else np.round(values).astype(np.int64)
+
+    scores = predict_batch(select_model(model, horizonte), grid)
+    out = grid[["ServicioID"] + SCENARIO_COLS].join(scores)
+    if simulacion:
+        from wms_simulation import simulate_stockout
+
+        out["ProbSim"] = simulate_stockout(
+            grid["StockActual"].to_numpy(), grid["DemandaDiariaEst"].to_numpy(),
+            grid["DiasHastaRecepcion"].to_numpy(), grid["RecepcionPendiente"].to_numpy(), horizons=(horizonte,),
+        )[:, 0]
+    out.attrs.update({"horizonte": horizonte, "shape": shape, "target": target_col(horizonte)})
+    return out
+
+def stock_minimo(surface: pd.DataFrame) -> pd.DataFrame:
+    """Menor StockActual de la grilla desde el cual prob queda bajo RISK_ALTO (sale de ALTO) y bajo RISK_MEDIO (BAJO).
+
+    Se exige que la probabilidad quede bajo el umbral para ese stock y todos los mayores de la grilla;
+    NaN si ningún stock de la grilla alcanza. Una fila por servicio × combinación de las demás variables.
+    """
+    shape = surface.attrs.get("shape")
+    if shape is None or int(np.prod(shape)) != len(surface):
+        raise ValueError("surface debe ser el resultado de scenario_grid")
+    n_stock = shape[-1]
+    prob = surface["prob"].to_numpy().reshape(-1, n_stock)
+    stock = surface["StockActual"].to_numpy(dtype=np.float64).reshape(-1, n_stock)
+    keys = surface.iloc[::n_stock][["ServicioID"] + SCENARIO_COLS[:-1]].reset_index(drop=True)
+    for name, threshold in (("StockMin_sin_ALTO", RISK_ALTO), ("StockMin_BAJO", RISK_MEDIO)):
+        # Bajo el umbral desde cada posición hasta el final del eje de stock.
+        safe = np.logical_and.accumulate((prob < threshold)[:, ::-1], axis=1)[:, ::-1]
+        first = safe.argmax(axis=1)
+        keys[name] = np.where(safe.any(axis=1), stock[np.arange(len(stock)), first], np.nan)
+    return keys
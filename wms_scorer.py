@@ -0,0 +1,142 @@
+"""
+Runtime de inferencia liviano para el modelo de rotura de stock.
+Solo depende de NumPy y json: no importa pandas ni scikit-learn. El artefacto se genera con
+wms_pipeline.export_scorer a partir del Pipeline entrenado.
+"""
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Mapping, Sequence
+
+import numpy as np
+
+SCORER_FORMAT = "wms-stockout-scorer"
+SCORER_VERSION = 1
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+class StockoutScorer:
+    """Regresión logística compilada: imputación, escalado, one-hot como diccionarios de pesos y coeficientes."""
+
+    def __init__(self, spec: dict):
+        if spec.get("format") != SCORER_FORMAT or spec.get("version") != SCORER_VERSION:
+            raise ValueError(f"Artefacto no soportado: {spec.get('format')} v{spec.get('version')}")
+        num = spec["numeric"]
+        cat = spec["categorical"]
+        self.feature_cols: list[str] = spec["feature_cols"]
+        self.numeric_cols: list[str] = num["columns"]
+        self.categorical_cols: list[str] = cat["columns"]
+        self.intercept = float(spec["intercept"])
+
+        self._num_fill = np.asarray(num["fill"], dtype=float)
+        self._num_mean = np.asarray(num["mean"], dtype=float)
+        self._num_scale = np.asarray(num["scale"], dtype=float)
+        self._num_coef = np.asarray(num["coef"], dtype=float)
+        self._cat_fill: list[str] = cat["fill"]
+        self._cat_weights: list[dict[str, float]] = cat["weights"]
+        # Parámetros como floats de Python para el camino de una sola fila (evita escalares NumPy).
+        self._num_params = list(zip(self.numeric_cols, num["fill"], num["mean"], num["scale"], num["coef"]))
+
+    @classmethod
+    def load(cls, path: Path | str) -> "StockoutScorer":
+        """Carga el artefacto JSON generado por wms_pipeline.export_scorer."""
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    @classmethod
+    def from_artifact(cls, path: Path | str) -> "StockoutScorer":
+        """Compila la carpeta manifest.json + .npy de wms_artifact.save_artifact sin importar scikit-learn."""
+        path = Path(path)
+        manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+        if manifest.get("format") != "wms-stockout-pipeline":
+            raise ValueError(f"{path} no es un artefacto de wms_artifact")
+        arrays = {name: np.load(path / f"{name}.npy", allow_pickle=False) for name in manifest["arrays"]}
+        coef = arrays["coef"].ravel()
+
+        num_fill = arrays["num_fill"]
+        num_kept = [c for c, v in zip(manifest["numeric"]["columns"], num_fill) if not math.isnan(v)]
+        n_num = len(num_kept)
+        cat = manifest["categorical"]
+        weights, offset = [], n_num
+        for cats in cat["categories"]:
+            weights.append({v: float(w) for v, w in zip(cats, coef[offset:offset + len(cats)])})
+            offset += len(cats)
+        if offset != len(coef):
+            raise ValueError(f"Los coeficientes de {path} no coinciden con el manifest")
+        return cls({
+            "format": SCORER_FORMAT,
+            "version": SCORER_VERSION,
+            "feature_cols": manifest["feature_cols"],
+            "numeric": {
+                "columns": num_kept,
+                "fill": [float(v) for v in num_fill if not math.isnan(v)],
+                "mean": arrays["scaler_mean"].tolist(),
+                "scale": arrays["scaler_scale"].tolist(),
+                "coef": coef[:n_num].tolist(),
+            },
+            "categorical": {
+                "columns": [c for c, v in zip(cat["columns"], cat["fill"]) if v is not None],
+                "fill": [v for v in cat["fill"] if v is not None],
+                "weights": weights,
+            },
+            "intercept": float(arrays["intercept"].ravel()[0]),
+        })
+
+    def _cat_weight(self, j: int, value) -> float:
+        if _is_missing(value):
+            value = self._cat_fill[j]
+        elif not isinstance(value, str):
+            value = str(value)
+        return self._cat_weights[j].get(value, 0.0)
+
+    def predict_one(self, row: Mapping) -> float:
+        """Probabilidad de stockout para un registro {columna: valor}."""
+        z = self.intercept
+        for col, fill, mean, scale, coef in self._num_params:
+            v = row.get(col)
+            x = fill if _is_missing(v) else float(v)
+            z += coef * ((x - mean) / scale)
+        for j, col in enumerate(self.categorical_cols):
+            z += self._cat_weight(j, row.get(col))
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def _columns(self, rows) -> dict[str, Sequence]:
+        """Normaliza la entrada a formato columnar {columna: secuencia}."""
+        if isinstance(rows, np.ndarray):
+            if rows.ndim != 2 or rows.shape[1] != len(self.feature_cols):
+                raise ValueError(f"Se espera un arreglo (n, {len(self.feature_cols)}) en el orden de feature_cols")
+            return {c: rows[:, i] for i, c in enumerate(self.feature_cols)}
+        if isinstance(rows, Mapping):
+            return rows
+        return {c: [r.get(c) for r in rows] for c in self.numeric_cols + self.categorical_cols}
+
+    def predict_proba(self, rows) -> np.ndarray:
+        """Probabilidades de stockout para varios registros.
+
+        rows puede ser una lista de dicts, un dict columnar {columna: secuencia} o un arreglo 2D
+        con las columnas en el orden de feature_cols.
+        """
+        cols = self._columns(rows)
+        n = len(cols[self.feature_cols[0]])
+        z = np.full(n, self.intercept)
+        if self.numeric_cols:
+            X = np.empty((n, len(self.numeric_cols)))
+            for j, col in enumerate(self.numeric_cols):
+                values = cols[col]
+                if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+                    X[:, j] = values
+                else:
+                    X[:, j] = np.asarray([np.nan if _is_missing(v) else v for v in values], dtype=float)
+            X = np.where(np.isnan(X), self._num_fill, X)
+            z += ((X - self._num_mean) / self._num_scale) @ self._num_coef
+        for j, col in enumerate(self.categorical_cols):
+            values = np.asarray(cols[col], dtype=object)
+            uniques, inverse = np.unique(values.astype(str), return_inverse=True)
+            weights = np.array([self._cat_weight(j, v) for v in uniques])
+            # NaN != NaN; None solo se detecta por igualdad.
+            missing = (values != values) | np.equal(values, None)
+            z += np.where(missing, self._cat_weight(j, None), weights[inverse.reshape(-1)])
+        return 1.0 / (1.0 + np.exp(-z))
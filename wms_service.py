@@ -0,0 +1,376 @@
+"""
+Servicio HTTP asíncrono (asyncio, solo librería estándar) para puntuar rotura de stock.
+Envuelve la familia de modelos entrenados, uno por horizonte (features estáticas desde wms_feature_store), y agrupa las solicitudes concurrentes en micro-batches, de modo que
+cada batch se resuelve con una llamada vectorizada a predict_proba por horizonte presente. Cada modelo se
+carga con wms_scorer.StockoutScorer.from_artifact (NumPy, sin rearmar el Pipeline) o, si no hay
+artefacto, desde el .joblib.
+
+Endpoints (JSON):
+  GET  /health          estado del servicio y estadísticas de batching
+  GET  /drift           drift de las features puntuadas vs entrenamiento (wms_monitoring), si hay referencia
+  POST /predict         {"ServicioID", "stock", "demanda", "dias_rec", "rec_pend", "horizonte"[, "periodo"]}
+  POST /predict/bulk    {"items": [<mismo formato>, ...]}
+
+Uso: python wms_service.py [--host 127.0.0.1] [--port 8080] [--max-batch 256] [--max-wait-ms 2]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from wms_pipeline import HORIZONS, model_filename, _risk_level, _risk_message
+from wms_artifact import artifact_dirname
+from wms_scorer import StockoutScorer
+from wms_feature_store import FeatureStore, ensure_feature_store
+from wms_monitoring import REFERENCE_FILENAME, DriftMonitor
+from wms_profiling import profiled
+
+DATA_DIR = Path("data")
+MODELS_DIR = Path("models")
+DEFAULT_PERIODO = 12
+
+INT32_MIN, INT32_MAX = int(np.iinfo(np.int32).min), int(np.iinfo(np.int32).max)
+
+def _integral(value) -> int:
+    """Entero exacto desde JSON: acepta 12, 12.0 o "12"; rechaza 3.7, booleanos y valores fuera de int32."""
+    if isinstance(value, bool):
+        raise TypeError("booleano")
+    if not isinstance(value, int):
+        number = float(value)
+        if not number.is_integer():
+            # int() truncaría 12.9 a 12 sin avisar.
+            raise ValueError("no entero")
+        value = int(number)
+    if not INT32_MIN <= value <= INT32_MAX:
+        raise OverflowError("fuera de rango")
+    return value
+
+FORM_FIELDS = {
+    "stock": ("StockActual", _integral),
+    "demanda": ("DemandaDiariaEst", float),
+    "dias_rec": ("DiasHastaRecepcion", _integral),
+    "rec_pend": ("RecepcionPendiente", _integral),
+}
+HORIZONTES = HORIZONS
+# Bloques del anillo de DriftMonitor: ventana de ~10 × 10.000 solicitudes puntuadas.
+DRIFT_SLOT_ROWS = 10_000
+MAX_BODY_BYTES = 16 * 2**20
+
+
+def load_service_model(models_dir: Path, horizonte: int):
+    """StockoutScorer desde el artefacto del horizonte si existe, si no el Pipeline .joblib; None si no hay modelo."""
+    artifact = models_dir / artifact_dirname(horizonte)
+    if (artifact / "manifest.json").exists():
+        return StockoutScorer.from_artifact(artifact)
+    path = models_dir / model_filename(horizonte)
+    return joblib.load(path) if path.exists() else None
+
+def positive_proba(model, X) -> np.ndarray:
+    """Probabilidad de la clase 1 para un StockoutScorer o un Pipeline de scikit-learn."""
+    if isinstance(model, StockoutScorer):
+        return model.predict_proba({c: X[c].to_numpy() for c in model.feature_cols})
+    return model.predict_proba(X)[:, 1]
+
+
+class ScoringModel:
+    """Modelos entrenados {horizonte: modelo} + feature store por (ServicioID, Periodo); puntúa listas de formularios en batch."""
+
+    def __init__(self, models: dict, store: FeatureStore, monitor: DriftMonitor | None = None):
+        self.models = models
+        self.store = store
+        self.monitor = monitor
+
+    @classmethod
+    def from_paths(cls, data_dir: Path = DATA_DIR, models_dir: Path = MODELS_DIR, periods: int = DEFAULT_PERIODO) -> "ScoringModel":
+        """Carga los modelos de models_dir presentes para cada horizonte de HORIZONTES (artefacto .npy o .joblib)."""
+        models = {h: model for h in HORIZONTES if (model := load_service_model(models_dir, h)) is not None}
+        if not models:
+            raise FileNotFoundError(f"No hay modelos entrenados en {models_dir}; ejecuta scripts/train_model.py")
+        reference = models_dir / REFERENCE_FILENAME
+        monitor = DriftMonitor.from_path(reference, slot_rows=DRIFT_SLOT_ROWS) if reference.exists() else None
+        return cls(models, ensure_feature_store(data_dir, periods), monitor)
+
+    @property
+    def n_services(self) -> int:
+        return len(self.store.servicios)
+
+    def parse(self, item: dict) -> dict:
+        """Valida un formulario y devuelve los valores tipados; lanza ValueError con el motivo."""
+        if not isinstance(item, dict):
+            raise ValueError("cada solicitud debe ser un objeto JSON")
+        servicio_id = str(item.get("ServicioID"))
+        if servicio_id not in self.store:
+            raise ValueError(f"ServicioID desconocido: {servicio_id!r}")
+        parsed = {"ServicioID": servicio_id}
+        for field, (col, cast) in FORM_FIELDS.items():
+            if field not in item:
+                raise ValueError(f"falta el campo {field!r}")
+            try:
+                value = cast(item[field])
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"valor inválido para {field!r}: {item[field]!r}") from None
+            if not math.isfinite(value):
+                # 1e400 en JSON se lee como inf y "nan" pasa el cast; predict_proba fallaría con todo el batch.
+                raise ValueError(f"valor inválido para {field!r}: {item[field]!r}")
+            if value < 0:
+                raise ValueError(f"{field!r} no puede ser negativo")
+            parsed[col] = value
+        horizonte = item.get("horizonte", 14)
+        # Se valida el tipo antes de buscar en el dict: una lista no es hasheable y true == 1.
+        if isinstance(horizonte, bool) or not isinstance(horizonte, int) or horizonte not in self.models:
+            raise ValueError(f"horizonte debe ser uno de {tuple(sorted(self.models))}")
+        parsed["horizonte"] = horizonte
+        try:
+            parsed["_pos"] = self.store.row_position(servicio_id, _integral(item.get("periodo", DEFAULT_PERIODO)))
+        except (TypeError, ValueError, OverflowError, KeyError):
+            raise ValueError(f"periodo inválido: {item.get('periodo')!r} (disponibles {self.store.periodos[0]}-{self.store.periodos[-1]})") from None
+        return parsed
+
+    @profiled("service.score", rows_arg=1)
+    def score(self, parsed: list[dict]) -> list[dict]:
+        """Puntúa formularios ya validados con un predict_proba por horizonte presente en el batch."""
+        X = self.store.take(np.array([p["_pos"] for p in parsed], dtype=np.int64))
+        for col, cast in FORM_FIELDS.values():
+            X[col] = np.array([p[col] for p in parsed], dtype=np.float64 if cast is float else np.int32)
+        horizonte = np.array([p["horizonte"] for p in parsed])
+        prob = np.empty(len(parsed), dtype=np.float64)
+        for h in np.unique(horizonte).tolist():
+            mask = horizonte == h
+            prob[mask] = positive_proba(self.models[h], X[mask] if not mask.all() else X)
+        riesgo = _risk_level(prob)
+        if self.monitor is not None:
+            self.monitor.update(X)
+        return [
+            {"ServicioID": p["ServicioID"], "prob": float(pr), "riesgo": str(r), "mensaje": _risk_message(float(pr), p["horizonte"])}
+            for p, pr, r in zip(parsed, prob, riesgo)
+        ]
+
+
+class MicroBatcher:
+    """Acumula solicitudes concurrentes y las puntúa juntas (hasta max_batch o max_wait_ms de espera)."""
+
+    def __init__(self, scoring: ScoringModel, max_batch: int = 256, max_wait_ms: float = 2.0):
+        self.scoring = scoring
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, parsed: dict) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((parsed, future))
+        return await future
+
+    def _drain(self, batch: list) -> None:
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            self._drain(batch)
+            if len(batch) < self.max_batch and self.max_wait > 0:
+                await asyncio.sleep(self.max_wait)
+                self._drain(batch)
+            try:
+                # predict_proba corre en un hilo: el event loop sigue aceptando solicitudes para el próximo batch.
+                results = await loop.run_in_executor(None, self.scoring.score, [p for p, _ in batch])
+            except Exception:  # noqa: BLE001 - se reintenta de a una para aislar la solicitud que falla
+                await self._score_each(batch)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _score_each(self, batch: list) -> None:
+        """Puntúa cada solicitud por separado: un error solo le llega a la solicitud que lo causa."""
+        loop = asyncio.get_running_loop()
+        for parsed, future in batch:
+            try:
+                result = (await loop.run_in_executor(None, self.scoring.score, [parsed]))[0]
+            except Exception as exc:  # noqa: BLE001 - se propaga a la solicitud (ScoringService responde 500)
+                if not future.done():
+                    future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.items += 1
+            if not future.done():
+                future.set_result(result)
+
+
+class ScoringService:
+    """Servidor HTTP/1.1 mínimo con keep-alive sobre asyncio.start_server."""
+
+    def __init__(self, scoring: ScoringModel, max_batch: int = 256, max_wait_ms: float = 2.0):
+        self.scoring = scoring
+        self.batcher = MicroBatcher(scoring, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.started = time.time()
+
+    async def _predict(self, body) -> tuple[int, dict]:
+        try:
+            parsed = self.scoring.parse(body)
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+        return 200, await self.batcher.submit(parsed)
+
+    async def _predict_bulk(self, body) -> tuple[int, dict]:
+        items = body.get("items") if isinstance(body, dict) else None
+        if not isinstance(items, list) or not items:
+            return 400, {"error": "se espera {\"items\": [...]} con al menos un elemento"}
+        parsed = []
+        for i, item in enumerate(items):
+            try:
+                parsed.append(self.scoring.parse(item))
+            except ValueError as exc:
+                return 400, {"error": f"items[{i}]: {exc}"}
+        # Un bulk ya es un batch: se puntúa directo, sin pasar por la cola.
+        results = await asyncio.get_running_loop().run_in_executor(None, self.scoring.score, parsed)
+        return 200, {"results": results}
+
+    def _health(self) -> dict:
+        b = self.batcher
+        return {
+            "status": "ok",
+            "servicios": self.scoring.n_services,
+            "horizontes": sorted(self.scoring.models),
+            "uptime_s": round(time.time() - self.started, 1),
+            "batches": b.batches,
+            "solicitudes": b.items,
+            "batch_promedio": round(b.items / b.batches, 2) if b.batches else 0.0,
+        }
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        if path == "/health" and method == "GET":
+            return 200, self._health()
+        if path == "/drift" and method == "GET":
+            if self.scoring.monitor is None:
+                return 404, {"error": f"sin referencia de drift ({REFERENCE_FILENAME}); reentrena con scripts/train_model.py"}
+            return 200, self.scoring.monitor.summary()
+        if path in ("/predict", "/predict/bulk"):
+            if method != "POST":
+                return 405, {"error": "método no permitido"}
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError:
+                return 400, {"error": "JSON inválido"}
+            if path == "/predict":
+                return await self._predict(payload)
+            return await self._predict_bulk(payload)
+        return 404, {"error": f"ruta no encontrada: {path}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "solicitud mal formada"}, keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Content-Length inválido"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "cuerpo demasiado grande"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    status, payload = await self.dispatch(method, target.split("?", 1)[0], body)
+                except Exception as exc:  # noqa: BLE001 - un error inesperado responde 500 sin cortar la conexión
+                    status, payload = 500, {"error": f"error interno: {type(exc).__name__}: {exc}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+        reason = {
+            200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error",
+        }.get(status, "Error")
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        print(f"Servicio de scoring escuchando en http://{host}:{port} ({self.scoring.n_services} servicios)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def main():
+    """Carga maestros y modelo, y levanta el servicio HTTP."""
+    parser = argparse.ArgumentParser(description="Servicio HTTP de scoring de rotura de stock")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--models-dir", type=Path, default=MODELS_DIR, help="Carpeta con stockout{h}d_logreg/ (o .joblib) por horizonte")
+    parser.add_argument("--periods", type=int, default=DEFAULT_PERIODO, help="Periodos del feature store")
+    parser.add_argument("--max-batch", type=int, default=256, help="Tamaño máximo de micro-batch (1 = sin batching)")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Espera máxima para completar un micro-batch")
+    args = parser.parse_args()
+
+    scoring = ScoringModel.from_paths(args.data_dir, args.models_dir, args.periods)
+    service = ScoringService(scoring, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()